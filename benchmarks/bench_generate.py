@@ -0,0 +1,69 @@
+#! python3  # noqa: E265
+
+"""Benchmarks of the plugin generation, with synthetic models."""
+
+# standard
+from itertools import count
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.generator import build_context, generate
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+MODELS_COUNTS: tuple[int, ...] = (1, 100, 1000)
+
+# ############################################################################
+# ########## Benchmarks ############
+# ##################################
+
+
+@pytest.mark.benchmark(group="generate full")
+@pytest.mark.parametrize("models_count", MODELS_COUNTS)
+def bench_generate_full(benchmark, qgis_app, make_models, tmp_path, models_count):
+    """Generation into a new directory. Caches of the process (template bundle, \
+    model descriptions) are warm after the first round."""
+    models = make_models(models_count)
+    context = build_context("Benchmark plugin")
+    runs = count()
+
+    def setup():
+        return (tmp_path / f"run_{next(runs)}", context), {"models_to_include": models}
+
+    report = benchmark.pedantic(
+        generate, setup=setup, rounds=3 if models_count >= 1000 else 5
+    )
+    assert len(report.written) >= models_count
+
+
+@pytest.mark.benchmark(group="generate incremental")
+@pytest.mark.parametrize("models_count", MODELS_COUNTS)
+def bench_generate_unchanged(benchmark, qgis_app, make_models, tmp_path, models_count):
+    """Generation into a directory already up to date."""
+    models = make_models(models_count)
+    context = build_context("Benchmark plugin")
+    generate(tmp_path, context, models_to_include=models)
+
+    report = benchmark(generate, tmp_path, context, models_to_include=models)
+    assert not report.written
+
+
+@pytest.mark.benchmark(group="generate zip")
+@pytest.mark.parametrize("models_count", MODELS_COUNTS)
+def bench_generate_zip(benchmark, qgis_app, make_models, tmp_path, models_count):
+    """Generation streamed into a zip archive."""
+    models = make_models(models_count)
+    context = build_context("Benchmark plugin")
+    runs = count()
+
+    def setup():
+        return (tmp_path / f"run_{next(runs)}.zip", context), {
+            "models_to_include": models,
+            "output_mode": "zip",
+        }
+
+    benchmark.pedantic(generate, setup=setup, rounds=3 if models_count >= 1000 else 5)
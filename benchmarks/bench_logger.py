@@ -0,0 +1,82 @@
+#! python3  # noqa: E265
+
+"""Benchmarks of the plugin logger."""
+
+# standard
+import logging
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.toolbelt import PlgLogger, PlgOptionsManager
+from models2plugin.toolbelt.preferences import PREFIX_ENV_VARIABLE
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+BATCH_SIZE: int = 1000
+
+# ############################################################################
+# ########## Fixtures ##############
+# ##################################
+
+
+@pytest.fixture
+def debug_mode(qgis_app, monkeypatch):
+    """Enable the debug mode, out of which info messages are dropped before \
+    reaching QgsMessageLog."""
+    monkeypatch.setenv(f"{PREFIX_ENV_VARIABLE}DEBUG_MODE", "true")
+    PlgOptionsManager.invalidate_cache()
+    assert PlgOptionsManager.get_debug_mode()
+    yield
+    monkeypatch.delenv(f"{PREFIX_ENV_VARIABLE}DEBUG_MODE")
+    PlgOptionsManager.invalidate_cache()
+
+
+# ############################################################################
+# ########## Benchmarks ############
+# ##################################
+
+
+@pytest.mark.benchmark(group="PlgLogger.log")
+def bench_log_info(benchmark, debug_mode):
+    benchmark(PlgLogger.log, "Benchmark message", log_level=0)
+
+
+@pytest.mark.benchmark(group="PlgLogger.log")
+def bench_log_filtered_debug(benchmark, qgis_app):
+    """Debug messages are dropped out of debug mode."""
+    assert not PlgOptionsManager.get_debug_mode()
+    benchmark(PlgLogger.log, "Benchmark debug message", log_level=4)
+
+
+@pytest.mark.benchmark(group="PlgLogger.log batch")
+@pytest.mark.parametrize("buffered", (False, True))
+def bench_log_batch(benchmark, debug_mode, buffered: bool):
+    """BATCH_SIZE messages, repeated ones being coalesced in buffered mode."""
+
+    def log_batch():
+        for i in range(BATCH_SIZE):
+            PlgLogger.log(f"Benchmark message {i % 10}", log_level=0)
+
+    def run():
+        if buffered:
+            with PlgLogger.buffered():
+                log_batch()
+        else:
+            log_batch()
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark(group="PlgLogger.log")
+def bench_logging_handler(benchmark, debug_mode):
+    """Records of the standard logging module routed to QGIS."""
+    PlgLogger.attach_to_logger()
+    logger = logging.getLogger("models2plugin.benchmarks")
+    try:
+        benchmark(logger.info, "Benchmark message")
+    finally:
+        PlgLogger.detach_from_logger()
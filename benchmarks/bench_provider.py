@@ -0,0 +1,51 @@
+#! python3  # noqa: E265
+
+"""Benchmarks of the provider of a generated plugin."""
+
+# standard
+import importlib
+import sys
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.generator import build_context, generate
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+MODELS_COUNTS: tuple[int, ...] = (1, 100, 1000)
+
+# ############################################################################
+# ########## Benchmarks ############
+# ##################################
+
+
+@pytest.mark.benchmark(group="provider loadAlgorithms")
+@pytest.mark.parametrize("models_count", MODELS_COUNTS)
+def bench_provider_load_algorithms(
+    benchmark, qgis_app, make_models, tmp_path_factory, models_count
+):
+    """Listing of the algorithms of a generated plugin, as done at QGIS startup."""
+    plugins_dir = tmp_path_factory.mktemp("plugins")
+    context = build_context(f"Benchmark provider {models_count}")
+    generate(
+        plugins_dir / context["plugin_folder_name"],
+        context,
+        models_to_include=make_models(models_count),
+    )
+
+    sys.path.insert(0, str(plugins_dir))
+    try:
+        provider_module = importlib.import_module(
+            f"{context['plugin_folder_name']}.provider"
+        )
+    finally:
+        sys.path.remove(str(plugins_dir))
+    provider = provider_module.Provider()
+
+    # refreshAlgorithms removes the algorithms and calls loadAlgorithms
+    benchmark(provider.refreshAlgorithms)
+    assert len(provider.algorithms()) == models_count
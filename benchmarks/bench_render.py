@@ -0,0 +1,85 @@
+#! python3  # noqa: E265
+
+"""Benchmarks of the template rendering."""
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.generator import render_template
+from models2plugin.toolbelt.template_engine import CompiledTemplate
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+CONTEXT_SIZES: tuple[int, ...] = (10, 100, 1000)
+
+SMALL_TEMPLATE: str = (
+    "[general]\n"
+    "name={{ plugin_name }}\n"
+    "about={{ about }}\n"
+    "version={{ plugin_version }}\n"
+    "author={{ author }}\n"
+    "email={{ author_email }}\n"
+)
+
+# lines of the large template, about 300 KB
+LARGE_TEMPLATE_LINES: int = 10_000
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def make_context(size: int) -> dict:
+    """Context of the given size, including the variables of the small template."""
+    context = {f"var_{i}": f"value {i}" for i in range(size)}
+    context.update(
+        plugin_name="Benchmark plugin",
+        about="Plugin generated for benchmarks",
+        plugin_version="1.0.0",
+        author="Author Name",
+        author_email="author@example.org",
+    )
+    return context
+
+
+def make_large_template(variables_count: int) -> str:
+    """Template using variables_count distinct variables, on LARGE_TEMPLATE_LINES \
+    lines."""
+    return "".join(
+        f"line {i}: {{{{ var_{i % variables_count} }}}} and some static text\n"
+        for i in range(LARGE_TEMPLATE_LINES)
+    )
+
+
+# ############################################################################
+# ########## Benchmarks ############
+# ##################################
+
+
+@pytest.mark.benchmark(group="render_template small")
+@pytest.mark.parametrize("context_size", CONTEXT_SIZES)
+def bench_render_small_template(benchmark, context_size: int):
+    context = make_context(context_size)
+    result = benchmark(render_template, SMALL_TEMPLATE, context)
+    assert "Benchmark plugin" in result
+
+
+@pytest.mark.benchmark(group="render_template large")
+@pytest.mark.parametrize("context_size", CONTEXT_SIZES)
+def bench_render_large_template(benchmark, context_size: int):
+    context = make_context(context_size)
+    template = make_large_template(context_size)
+    result = benchmark(render_template, template, context)
+    assert "{{" not in result
+
+
+@pytest.mark.benchmark(group="compile large template")
+@pytest.mark.parametrize("context_size", CONTEXT_SIZES)
+def bench_compile_large_template(benchmark, context_size: int):
+    # not cached: CompiledTemplate is what compile_template caches
+    template = make_large_template(context_size)
+    compiled = benchmark(CompiledTemplate, template)
+    assert len(compiled.variables) == context_size
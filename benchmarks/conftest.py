@@ -0,0 +1,94 @@
+#! python3  # noqa: E265
+
+"""
+Fixtures of the benchmarks: a QGIS application without GUI, using a temporary profile,
+and synthetic processing models.
+"""
+
+# standard
+import os
+from pathlib import Path
+
+# 3rd party
+import pytest
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+SYNTHETIC_MODEL_NAME: str = "Synthetic model"
+
+# ############################################################################
+# ########## Fixtures ##############
+# ##################################
+
+
+@pytest.fixture(scope="session")
+def qgis_app(tmp_path_factory):
+    """QGIS application running offscreen, with a profile in a temporary directory \
+    so that the benchmarks don't touch the user one."""
+    os.environ["QGIS_CUSTOM_CONFIG_PATH"] = str(tmp_path_factory.mktemp("profile"))
+
+    from models2plugin.batch import start_qgis
+
+    qgs_app = start_qgis()
+    yield qgs_app
+    qgs_app.exitQgis()
+
+
+@pytest.fixture(scope="session")
+def synthetic_model(qgis_app, tmp_path_factory) -> bytes:
+    """Content of a small model: an input layer buffered by a native algorithm."""
+    from qgis.core import (
+        QgsProcessingModelAlgorithm,
+        QgsProcessingModelChildAlgorithm,
+        QgsProcessingModelChildParameterSource,
+        QgsProcessingModelParameter,
+        QgsProcessingParameterFeatureSource,
+    )
+
+    model = QgsProcessingModelAlgorithm(SYNTHETIC_MODEL_NAME, "Benchmarks")
+    model.addModelParameter(
+        QgsProcessingParameterFeatureSource("input", "Input layer"),
+        QgsProcessingModelParameter("input"),
+    )
+    child = QgsProcessingModelChildAlgorithm("native:buffer")
+    child.setChildId("buffer")
+    child.addParameterSources(
+        "INPUT", [QgsProcessingModelChildParameterSource.fromModelParameter("input")]
+    )
+    child.addParameterSources(
+        "DISTANCE", [QgsProcessingModelChildParameterSource.fromStaticValue(10)]
+    )
+    model.addChildAlgorithm(child)
+
+    model_path = tmp_path_factory.mktemp("model") / "synthetic.model3"
+    assert model.toFile(str(model_path))
+    return model_path.read_bytes()
+
+
+@pytest.fixture(scope="session")
+def make_models(synthetic_model, tmp_path_factory):
+    """Factory writing N distinct synthetic models, cached by N.
+
+    :return: function taking the number of models and returning their paths
+    """
+    created: dict[int, list[str]] = {}
+
+    def make(count: int) -> list[str]:
+        if count not in created:
+            models_dir = tmp_path_factory.mktemp(f"models_{count}")
+            paths = []
+            for i in range(count):
+                model_path = Path(models_dir, f"synthetic_{i:04d}.model3")
+                model_path.write_bytes(
+                    synthetic_model.replace(
+                        SYNTHETIC_MODEL_NAME.encode(),
+                        f"{SYNTHETIC_MODEL_NAME} {i:04d}".encode(),
+                    )
+                )
+                paths.append(str(model_path))
+            created[count] = paths
+        return created[count]
+
+    return make
@@ -0,0 +1,12 @@
+#! python3  # noqa: E265
+
+"""Allow to run the plugins generation with `python -m models2plugin`."""
+
+# standard
+import sys
+
+# project
+from models2plugin.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+#! python3  # noqa: E265
+
+"""
+Batch generation of several plugins described in a manifest file.
+
+A manifest is a TOML or JSON file like:
+
+.. code-block:: toml
+
+    output_dir = "dist"
+
+    [defaults]
+    author = "GIS team"
+    author_email = "gis@example.org"
+
+    [[plugins]]
+    name = "Hydrology tools"
+    version = "1.2.0"
+    models = ["models/flow.model3", "models/basins.model3"]
+
+Relative paths are resolved from the manifest directory. Plugin keys not set are
+taken from the ``defaults`` table.
+"""
+
+# standard
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Optional, Union
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# PyQGIS
+from qgis.core import QgsApplication
+
+# project
+from models2plugin.generator import GenerationReport, build_context, generate
+from models2plugin.toolbelt.utils import to_snake_case
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+# QGIS application of a worker process, kept alive until the process ends
+_worker_qgs_app: Optional[QgsApplication] = None
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class ManifestError(Exception):
+    """Raised when a manifest file can't be read or is invalid."""
+
+
+@dataclass
+class PluginSpec:
+    """Description of a plugin to generate."""
+
+    name: str
+    models: list[str] = field(default_factory=list)
+    description: str = "Description"
+    author: str = "Author Name"
+    author_email: str = "Email"
+    version: str = "1.0.0"
+    qgis_minimum_version: str = "3.22"
+    result_cache_size_mb: int = 0
+    output_dir: Optional[str] = None
+
+    def context(self) -> dict:
+        """Template context of the plugin.
+
+        :return: variables used to render the plugin template
+        :rtype: dict
+        """
+        return build_context(
+            plugin_name=self.name,
+            plugin_description=self.description,
+            author=self.author,
+            author_email=self.author_email,
+            plugin_version=self.version,
+            qgis_minimum_version=self.qgis_minimum_version,
+            result_cache_size_mb=self.result_cache_size_mb,
+        )
+
+
+@dataclass
+class PluginResult:
+    """Outcome of the generation of one plugin."""
+
+    name: str
+    output_dir: str
+    error: Optional[str] = None
+    report: Optional[GenerationReport] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def _resolve_path(path: Union[str, Path], base_dir: Path) -> Path:
+    """Resolve a path of the manifest: relative paths are relative to its directory.
+
+    :param path: path as written in the manifest
+    :type path: Union[str, Path]
+    :param base_dir: manifest directory
+    :type base_dir: Path
+
+    :return: absolute path
+    :rtype: Path
+    """
+    path = Path(path)
+    return path if path.is_absolute() else base_dir / path
+
+
+def load_manifest(
+    manifest_path: Union[str, Path], output_dir: Optional[Union[str, Path]] = None
+) -> list[PluginSpec]:
+    """Read a TOML or JSON manifest and return the plugins it describes.
+
+    :param manifest_path: path to the manifest file
+    :type manifest_path: Union[str, Path]
+    :param output_dir: root directory of generated plugins, overriding the one of the \
+    manifest. Defaults to None.
+    :type output_dir: Union[str, Path], optional
+
+    :raises ManifestError: if the manifest can't be read or is invalid
+
+    :return: plugins to generate, in manifest order
+    :rtype: list[PluginSpec]
+    """
+    manifest_path = Path(manifest_path)
+    base_dir = manifest_path.resolve().parent
+
+    try:
+        if manifest_path.suffix.lower() == ".toml":
+            if tomllib is None:
+                raise ManifestError(
+                    "Reading TOML manifests requires Python 3.11+ or the tomli "
+                    "package. Use a JSON manifest instead."
+                )
+            with manifest_path.open("rb") as f:
+                manifest = tomllib.load(f)
+        else:
+            with manifest_path.open("r", encoding="utf-8") as f:
+                manifest = json.load(f)
+    except (OSError, ValueError) as err:
+        raise ManifestError(f"Unable to read manifest {manifest_path}: {err}") from err
+
+    if not isinstance(manifest.get("plugins"), list):
+        raise ManifestError(f"Manifest {manifest_path} has no list of plugins.")
+
+    root_dir = Path(output_dir or manifest.get("output_dir", "output"))
+    if not root_dir.is_absolute():
+        root_dir = (Path.cwd() if output_dir else base_dir) / root_dir
+
+    defaults = manifest.get("defaults", {})
+    spec_keys = {f.name for f in fields(PluginSpec)}
+
+    specs = []
+    for index, plugin in enumerate(manifest["plugins"]):
+        values = {**defaults, **plugin}
+        unknown_keys = set(values) - spec_keys
+        if unknown_keys:
+            raise ManifestError(
+                f"Plugin #{index} of {manifest_path} has unknown keys: "
+                f"{', '.join(sorted(unknown_keys))}"
+            )
+        if not values.get("name"):
+            raise ManifestError(f"Plugin #{index} of {manifest_path} has no name.")
+
+        spec = PluginSpec(**values)
+        spec.models = [str(_resolve_path(model, base_dir)) for model in spec.models]
+        if spec.output_dir:
+            spec.output_dir = str(_resolve_path(spec.output_dir, base_dir))
+        else:
+            spec.output_dir = str(root_dir / to_snake_case(spec.name))
+        specs.append(spec)
+
+    return specs
+
+
+def generate_plugin(spec: PluginSpec, **generate_options) -> PluginResult:
+    """Generate one plugin, catching any error.
+
+    :param spec: plugin to generate
+    :type spec: PluginSpec
+    :param generate_options: keyword arguments passed to `generator.generate`
+
+    :return: generation outcome
+    :rtype: PluginResult
+    """
+    output_dir = spec.output_dir
+    if generate_options.get("output_mode") == "zip":
+        output_dir = f"{output_dir}.zip"
+    result = PluginResult(name=spec.name, output_dir=output_dir)
+
+    missing_models = [model for model in spec.models if not Path(model).is_file()]
+    if missing_models:
+        result.error = f"Missing model files: {', '.join(missing_models)}"
+        return result
+
+    try:
+        result.report = generate(
+            output_dir,
+            spec.context(),
+            models_to_include=spec.models,
+            **generate_options,
+        )
+    except Exception as err:
+        result.error = f"{type(err).__name__}: {err}"
+
+    return result
+
+
+def start_qgis() -> QgsApplication:
+    """Initialize a QGIS application without GUI.
+
+    :return: QGIS application
+    :rtype: QgsApplication
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    qgs_app = QgsApplication([], False)
+    qgs_app.initQgis()
+    init_processing()
+    return qgs_app
+
+
+def init_processing():
+    """Register the processing providers, so that bundled models can be validated \
+    against the algorithms they run. Without the Processing plugin (not found in the \
+    Python path), only the native algorithms are registered."""
+    try:
+        from processing.core.Processing import Processing
+
+        Processing.initialize()
+    except ImportError:
+        from qgis.analysis import QgsNativeAlgorithms
+
+        QgsApplication.processingRegistry().addProvider(QgsNativeAlgorithms())
+
+
+def _init_worker():
+    """Start QGIS in a worker process of the generation pool."""
+    global _worker_qgs_app
+    _worker_qgs_app = start_qgis()
+
+
+def generate_all(
+    specs: list[PluginSpec], max_workers: Optional[int] = 1, **generate_options
+) -> list[PluginResult]:
+    """Generate several plugins. With more than one worker, plugins are generated \
+    in parallel by a pool of processes.
+
+    :param specs: plugins to generate
+    :type specs: list[PluginSpec]
+    :param max_workers: number of worker processes. None means one per CPU. \
+    Defaults to 1 (plugins are generated one after another in this process).
+    :type max_workers: int, optional
+    :param generate_options: keyword arguments passed to `generator.generate`
+
+    :return: generation outcomes, in the same order as specs
+    :rtype: list[PluginResult]
+    """
+    results: list[Optional[PluginResult]] = [None] * len(specs)
+
+    # plugins sharing an output directory would overwrite each other
+    specs_by_output_dir: dict[str, list[int]] = {}
+    for index, spec in enumerate(specs):
+        output_dir = os.path.normcase(os.path.abspath(spec.output_dir))
+        specs_by_output_dir.setdefault(output_dir, []).append(index)
+    for indexes in specs_by_output_dir.values():
+        if len(indexes) > 1:
+            names = ", ".join(specs[index].name for index in indexes)
+            for index in indexes:
+                results[index] = PluginResult(
+                    name=specs[index].name,
+                    output_dir=specs[index].output_dir,
+                    error=f"Output directory shared by several plugins: {names}",
+                )
+
+    pending = [index for index, result in enumerate(results) if result is None]
+    max_workers = min(max_workers or os.cpu_count() or 1, len(pending))
+
+    if max_workers <= 1:
+        for index in pending:
+            results[index] = generate_plugin(specs[index], **generate_options)
+        return results
+
+    # spawn rather than fork: forking a process running Qt is not safe
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    ) as executor:
+        futures = {
+            index: executor.submit(generate_plugin, specs[index], **generate_options)
+            for index in pending
+        }
+        for index, future in futures.items():
+            try:
+                results[index] = future.result()
+            except Exception as err:
+                results[index] = PluginResult(
+                    name=specs[index].name,
+                    output_dir=specs[index].output_dir,
+                    error=f"{type(err).__name__}: {err}",
+                )
+
+    return results
@@ -0,0 +1,227 @@
+#! python3  # noqa: E265
+
+"""
+Command line interface to generate plugins without the QGIS GUI.
+
+Usage, from the directory containing the models2plugin package:
+
+.. code-block:: bash
+
+    python -m models2plugin manifest.toml --output dist
+"""
+
+# standard
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+# project
+from models2plugin.__about__ import __title__, __version__
+from models2plugin.batch import (
+    ManifestError,
+    generate_all,
+    load_manifest,
+    start_qgis,
+)
+from models2plugin.core.file_copy import COPY_STRATEGIES, DEFAULT_COPY_STRATEGY
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line arguments parser.
+
+    :return: arguments parser
+    :rtype: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m models2plugin",
+        description=f"{__title__} - generate QGIS plugins embedding processing "
+        "models, without the QGIS GUI.",
+    )
+    parser.add_argument(
+        "manifest", help="TOML or JSON manifest describing the plugins to generate."
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Root directory of the generated plugins. Overrides the manifest one.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of plugins generated in parallel. 0 means one per CPU. "
+        "Defaults to 1.",
+    )
+    parser.add_argument(
+        "--template",
+        default=None,
+        help="Plugin template to use instead of the default one: a directory or a "
+        "zip archive.",
+    )
+    parser.add_argument(
+        "--zip",
+        action="store_true",
+        help="Write each plugin straight into a zip archive instead of a directory.",
+    )
+    parser.add_argument(
+        "--copy-strategy",
+        choices=COPY_STRATEGIES,
+        default=DEFAULT_COPY_STRATEGY,
+        help="How model files are copied into plugin directories: hardlink (no "
+        "copy, the plugin shares the file with its source), clone (reflink or "
+        "kernel copy) or buffered. Unsupported methods fall back to the next ones. "
+        f"Defaults to {DEFAULT_COPY_STRATEGY}.",
+    )
+    parser.add_argument(
+        "--model-store",
+        default=None,
+        help="Directory of a model store shared by the generated plugins: each "
+        "distinct model is written there once, and the plugins resolve their models "
+        "in it. Not compatible with --zip.",
+    )
+    parser.add_argument(
+        "--compile-models",
+        action="store_true",
+        help="Also export each model as a Python algorithm, registered by the "
+        "generated provider instead of interpreting the model.",
+    )
+    parser.add_argument(
+        "--pack-models",
+        action="store_true",
+        help="Bundle the models of each plugin into a single compressed file, read "
+        "with one file opening at QGIS startup. Not compatible with --model-store.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rewrite every output, even the ones whose inputs did not change.",
+    )
+    parser.add_argument(
+        "--no-validate",
+        dest="validate",
+        action="store_false",
+        help="Don't load the bundled models to check them before generating.",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Fail the generation of a plugin if one of its models has an error.",
+    )
+    parser.add_argument(
+        "--validation-report",
+        default=None,
+        help="JSON file where to write the validation report of every plugin.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=None,
+        help="Measure the time and bytes of each generation phase and print them "
+        "under each plugin. Also enabled by the debug mode or the "
+        "QGIS_MODELS2PLUGIN_PROFILE environment variable.",
+    )
+    parser.add_argument(
+        "--trace-dir",
+        default=None,
+        help="Directory where to write a trace per plugin, in the Chrome trace event "
+        "format (chrome://tracing, Perfetto). Implies --profile.",
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"%(prog)s {__version__}"
+    )
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Generate the plugins described in a manifest.
+
+    :param argv: command line arguments. Defaults to None (sys.argv).
+    :type argv: list[str], optional
+
+    :return: exit code, 0 if every plugin has been generated
+    :rtype: int
+    """
+    args = build_parser().parse_args(argv)
+
+    qgs_app = start_qgis()
+    try:
+        return _run(args)
+    finally:
+        qgs_app.exitQgis()
+
+
+def _run(args: argparse.Namespace) -> int:
+    """Generate the plugins described in a manifest, QGIS being started.
+
+    :param args: parsed command line arguments
+    :type args: argparse.Namespace
+
+    :return: exit code, 0 if every plugin has been generated
+    :rtype: int
+    """
+    try:
+        specs = load_manifest(args.manifest, output_dir=args.output)
+    except ManifestError as err:
+        print(err, file=sys.stderr)
+        return 2
+
+    if args.trace_dir:
+        Path(args.trace_dir).mkdir(parents=True, exist_ok=True)
+        args.profile = True
+
+    results = generate_all(
+        specs,
+        max_workers=args.jobs or None,
+        force=args.force,
+        template_source=args.template,
+        output_mode="zip" if args.zip else "directory",
+        copy_strategy=args.copy_strategy,
+        model_store=args.model_store,
+        compile_models=args.compile_models,
+        pack_models=args.pack_models,
+        validate=args.validate,
+        strict=args.strict,
+        profile=args.profile,
+        trace_path=args.trace_dir,
+    )
+    for result in results:
+        if result.ok:
+            print(
+                f"OK      {result.name} -> {result.output_dir} "
+                f"({len(result.report.written)} written, "
+                f"{len(result.report.unchanged)} unchanged, "
+                f"{len(result.report.removed)} removed)"
+            )
+        else:
+            print(f"FAILED  {result.name}: {result.error}", file=sys.stderr)
+        if result.report is not None and result.report.validation is not None:
+            for line in result.report.validation.summary():
+                print(f"        {line}")
+        if result.report is not None and result.report.timings is not None:
+            for phase, timing in result.report.timings["phases"].items():
+                print(
+                    f"        {phase}: {timing['seconds'] * 1000:.1f} ms, "
+                    f"{timing['calls']} call(s), {timing['bytes']} bytes"
+                )
+
+    if args.validation_report:
+        validation_report = {
+            result.name: result.report.validation.to_dict()
+            for result in results
+            if result.report is not None and result.report.validation is not None
+        }
+        with open(args.validation_report, "w", encoding="utf-8") as f:
+            json.dump(validation_report, f, indent=1)
+
+    failures = sum(1 for result in results if not result.ok)
+    print(f"{len(results) - failures}/{len(results)} plugin(s) generated.")
+
+    return 1 if failures else 0
@@ -0,0 +1 @@
+#! python3  # noqa: E265
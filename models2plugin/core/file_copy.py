@@ -0,0 +1,226 @@
+#! python3  # noqa: E265
+
+"""
+File copies avoiding to duplicate bytes when the file system allows it.
+
+Strategies, each one falling back to the next ones when it is not supported:
+
+- hardlink: the destination is another name of the source file, no byte is copied.
+  Editing one of them in place edits the other one.
+- clone: the kernel copies the file (reflink on copy-on-write file systems such as
+  Btrfs or XFS, copy_file_range, sendfile), without going through Python buffers.
+- buffered: the file is read and written by chunks.
+"""
+
+# standard
+import errno
+import os
+import shutil
+import sys
+from pathlib import Path
+from threading import Lock
+from typing import Union
+
+# project
+from models2plugin.toolbelt.hashing import CHUNK_SIZE
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+COPY_STRATEGIES: tuple[str, ...] = ("hardlink", "clone", "buffered")
+DEFAULT_COPY_STRATEGY: str = "clone"
+
+# ioctl cloning a file on Linux (FICLONE = _IOW(0x94, 9, int))
+FICLONE: int = 0x40049409
+
+# errors telling that a method is not supported, not that the copy failed
+UNSUPPORTED_ERRNOS: frozenset[int] = frozenset(
+    code
+    for code in (
+        errno.EXDEV,
+        errno.EPERM,
+        errno.EACCES,
+        errno.EINVAL,
+        errno.ENOSYS,
+        errno.ENOTTY,
+        errno.EOPNOTSUPP,
+        getattr(errno, "ENOTSUP", errno.EOPNOTSUPP),
+        errno.EMLINK,
+        errno.EBADF,
+    )
+)
+
+# (method, source device, destination device) known not to work, so that they are
+# not tried again for every file
+_unsupported: set[tuple[str, int, int]] = set()
+_unsupported_lock = Lock()
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class IncompleteCopyError(OSError):
+    """Raised when a kernel copy stops before the end of the file, e.g. when the \
+    method is not supported by the file systems or when the source shrank."""
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def _check_copied(method: str, copied: int, size: int):
+    """Make sure a kernel copy went up to the end of the file.
+
+    :raises IncompleteCopyError: if fewer bytes than the file size were copied
+    """
+    if copied < size:
+        raise IncompleteCopyError(
+            errno.EIO, f"{method} copied {copied} bytes out of {size}"
+        )
+
+
+def _is_unsupported(method: str, devices: tuple[int, int]) -> bool:
+    with _unsupported_lock:
+        return (method, *devices) in _unsupported
+
+
+def _set_unsupported(method: str, devices: tuple[int, int]):
+    with _unsupported_lock:
+        _unsupported.add((method, *devices))
+
+
+def _reflink(src_fd: int, dst_fd: int, size: int):
+    """Share the blocks of the source, on copy-on-write file systems (Linux)."""
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.ENOTSUP, "reflink is only supported on Linux")
+    import fcntl
+
+    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int):
+    """Copy in the kernel, possibly server side on network file systems."""
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range is not available")
+    copied = 0
+    while copied < size:
+        count = os.copy_file_range(src_fd, dst_fd, size - copied)
+        if count == 0:
+            break
+        copied += count
+    _check_copied("copy_file_range", copied, size)
+
+
+def _sendfile(src_fd: int, dst_fd: int, size: int):
+    """Copy in the kernel, from the page cache."""
+    if not sys.platform.startswith("linux"):
+        # elsewhere, sendfile only writes into sockets
+        raise OSError(errno.ENOTSUP, "sendfile to a file is only supported on Linux")
+    copied = 0
+    while copied < size:
+        count = os.sendfile(dst_fd, src_fd, copied, size - copied)
+        if count == 0:
+            break
+        copied += count
+    _check_copied("sendfile", copied, size)
+
+
+def _buffered(src_fd: int, dst_fd: int, size: int):
+    """Copy through Python buffers."""
+    with open(src_fd, "rb", closefd=False) as src:
+        with open(dst_fd, "wb", closefd=False) as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+
+# kernel copy methods of the clone strategy, tried in this order
+_CLONE_METHODS = (
+    ("reflink", _reflink),
+    ("copy_file_range", _copy_file_range),
+    ("sendfile", _sendfile),
+)
+
+
+def _clone(source: Path, destination: Path, devices: tuple[int, int]) -> str:
+    """Copy a file with the first supported kernel method, else through buffers.
+
+    :return: method used
+    :rtype: str
+    """
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        src_fd, dst_fd = src.fileno(), dst.fileno()
+        size = os.fstat(src_fd).st_size
+
+        for method, copy in _CLONE_METHODS:
+            if _is_unsupported(method, devices):
+                continue
+            try:
+                copy(src_fd, dst_fd, size)
+            except IncompleteCopyError:
+                # not necessarily unsupported: the next files may be copied
+                pass
+            except OSError as exc:
+                if exc.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+                _set_unsupported(method, devices)
+            else:
+                return method
+            # start again from scratch with the next method
+            os.lseek(src_fd, 0, os.SEEK_SET)
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+            os.ftruncate(dst_fd, 0)
+
+        _buffered(src_fd, dst_fd, size)
+        return "buffered"
+
+
+def copy_file(
+    source: Union[str, Path],
+    destination: Union[str, Path],
+    strategy: str = DEFAULT_COPY_STRATEGY,
+) -> str:
+    """Copy a file, replacing the destination if it exists. Its permission bits are \
+    copied too.
+
+    :param source: source file path
+    :type source: Union[str, Path]
+    :param destination: destination file path
+    :type destination: Union[str, Path]
+    :param strategy: one of COPY_STRATEGIES, the first method tried. Defaults to \
+    DEFAULT_COPY_STRATEGY.
+    :type strategy: str, optional
+
+    :raises ValueError: if the strategy is unknown
+
+    :return: method used: hardlink, reflink, copy_file_range, sendfile or buffered
+    :rtype: str
+    """
+    if strategy not in COPY_STRATEGIES:
+        raise ValueError(
+            f"Unknown copy strategy: {strategy}. Must be one of: "
+            f"{', '.join(COPY_STRATEGIES)}"
+        )
+    source, destination = Path(source), Path(destination)
+    devices = (source.stat().st_dev, destination.parent.stat().st_dev)
+
+    if strategy == "hardlink" and not _is_unsupported("hardlink", devices):
+        try:
+            destination.unlink(missing_ok=True)
+            os.link(source, destination)
+            return "hardlink"
+        except OSError as exc:
+            if exc.errno not in UNSUPPORTED_ERRNOS:
+                raise
+            _set_unsupported("hardlink", devices)
+
+    if strategy == "buffered":
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            _buffered(src.fileno(), dst.fileno(), 0)
+        method = "buffered"
+    else:
+        method = _clone(source, destination, devices)
+
+    shutil.copymode(source, destination)
+    return method
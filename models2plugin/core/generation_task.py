@@ -0,0 +1,94 @@
+#! python3  # noqa: E265
+
+"""
+Plugin generation run as a QGIS background task, so that the interface stays
+responsive while the files are written.
+"""
+
+# standard
+from pathlib import Path
+from typing import Optional, Union
+
+# PyQGIS
+from qgis.core import QgsProcessingFeedback, QgsTask
+from qgis.PyQt.QtCore import pyqtSignal
+
+# project
+from models2plugin.generator import GenerationReport, generate
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class GenerationFeedback(QgsProcessingFeedback):
+    """Feedback relaying the messages of a generation through a signal, received in \
+    the main thread."""
+
+    infoPushed = pyqtSignal(str)
+
+    def pushInfo(self, info: str):
+        super().pushInfo(info)
+        self.infoPushed.emit(info)
+
+
+class GenerationTask(QgsTask):
+    """Generate a plugin in a background task. The task can be canceled at any time: \
+    the generation stops after the file being written."""
+
+    def __init__(
+        self,
+        plugin_output_dir: Union[str, Path],
+        context: dict,
+        models_to_include: list[str],
+        **generate_options,
+    ):
+        """Constructor.
+
+        :param plugin_output_dir: plugin output directory (or zip file path in zip \
+        mode)
+        :type plugin_output_dir: Union[str, Path]
+        :param context: variables used to render the template
+        :type context: dict
+        :param models_to_include: models to copy into the plugin
+        :type models_to_include: list[str]
+        :param generate_options: other keyword arguments of generate
+        """
+        super().__init__(
+            f"Generating the plugin {context['plugin_name']}", QgsTask.CanCancel
+        )
+        self.plugin_output_dir = plugin_output_dir
+        self.context = context
+        self.models_to_include = models_to_include
+        self.generate_options = generate_options
+
+        self.feedback = GenerationFeedback()
+        self.feedback.progressChanged.connect(self.setProgress)
+
+        self.report: Optional[GenerationReport] = None
+        self.exception: Optional[Exception] = None
+
+    def run(self) -> bool:
+        """Generate the plugin, in a worker thread.
+
+        :return: True if the plugin has been generated
+        :rtype: bool
+        """
+        try:
+            self.report = generate(
+                self.plugin_output_dir,
+                self.context,
+                models_to_include=self.models_to_include,
+                feedback=self.feedback,
+                **self.generate_options,
+            )
+        except Exception as exc:
+            self.exception = exc
+            return False
+
+        return not self.report.canceled
+
+    def cancel(self):
+        """Stop the generation after the file being written."""
+        self.feedback.cancel()
+        super().cancel()
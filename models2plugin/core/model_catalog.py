@@ -0,0 +1,170 @@
+#! python3  # noqa: E265
+
+"""
+Catalog of the processing models available on the machine, listed in a background
+task and kept up to date while their folders change.
+
+Models are found through the model discovery index: a refresh only reads the models
+added or modified since the previous scan, even in a previous QGIS session.
+"""
+
+# standard
+from functools import partial
+from pathlib import Path
+from typing import Optional, Union
+
+# PyQGIS
+from qgis.core import Qgis, QgsApplication, QgsTask
+from qgis.PyQt.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+# project
+from models2plugin.core.model_discovery import (
+    ModelDiscoveryIndex,
+    ModelEntry,
+    get_model_discovery_index,
+    model_roots,
+)
+from models2plugin.toolbelt import PlgLogger
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+# delay letting a burst of changes in the directory end before scanning it again
+REFRESH_DELAY: int = 500
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class ModelCatalog(QObject):
+    """Processing models found under root folders. Call refresh to scan them; \
+    modelsChanged is emitted when the list of entries changes."""
+
+    modelsChanged = pyqtSignal()
+
+    def __init__(
+        self,
+        roots: Optional[list[Union[str, Path]]] = None,
+        index: Optional[ModelDiscoveryIndex] = None,
+        parent: Optional[QObject] = None,
+    ):
+        """Constructor.
+
+        :param roots: folders containing the models, searched recursively. Defaults \
+        to None (Processing models folders and additional folders of the settings, \
+        read at each refresh).
+        :type roots: list[Union[str, Path]], optional
+        :param index: model discovery index. Defaults to None (shared index of the \
+        QGIS profile).
+        :type index: ModelDiscoveryIndex, optional
+        :param parent: Qt parent. Defaults to None.
+        :type parent: QObject, optional
+        """
+        super().__init__(parent)
+        self.log = PlgLogger().log
+        self._roots = roots
+        self.index = index or get_model_discovery_index()
+
+        self._entries: dict[str, ModelEntry] = {}
+        self._task: Optional[QgsTask] = None
+        self._refresh_pending = False
+        self._deep_refresh_pending = False
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(REFRESH_DELAY)
+        self._refresh_timer.timeout.connect(partial(self.refresh, deep=True))
+
+        # a folder changes: its models are checked again
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._refresh_timer.start)
+
+    @property
+    def roots(self) -> list[Path]:
+        """Folders containing the models."""
+        if self._roots is None:
+            return model_roots()
+        return [Path(root) for root in self._roots]
+
+    def entries(self) -> list[ModelEntry]:
+        """Models found by the last scan.
+
+        :return: entries sorted by group and name
+        :rtype: list[ModelEntry]
+        """
+        return sorted(
+            self._entries.values(),
+            key=lambda entry: (entry.group.lower(), entry.name.lower(), entry.path),
+        )
+
+    @property
+    def is_scanning(self) -> bool:
+        """True while a scan is running."""
+        return self._task is not None
+
+    def refresh(self, deep: bool = False):
+        """Scan the models folders in a background task. If a scan is already \
+        running, another one starts when it ends.
+
+        :param deep: check every model file, not only the folders whose \
+        modification time changed. Defaults to False.
+        :type deep: bool, optional
+        """
+        if self._task is not None:
+            self._refresh_pending = True
+            self._deep_refresh_pending = self._deep_refresh_pending or deep
+            return
+
+        self._task = QgsTask.fromFunction(
+            "Listing processing models",
+            self._scan,
+            self.index,
+            self.roots,
+            deep,
+            on_finished=self._scan_finished,
+        )
+        QgsApplication.taskManager().addTask(self._task)
+
+    @staticmethod
+    def _scan(
+        task: QgsTask, index: ModelDiscoveryIndex, roots: list[Path], deep: bool
+    ) -> dict[str, ModelEntry]:
+        """Run in a worker thread: list the models, only reading the new or modified \
+        ones, and save the index for the next session."""
+        entries = index.scan(roots, deep=deep)
+        index.save()
+        return entries
+
+    def _scan_finished(
+        self, exception: Optional[Exception], entries: Optional[dict] = None
+    ):
+        """Back in the main thread: publish the scanned entries and watch the \
+        scanned folders."""
+        self._task = None
+
+        if exception is not None:
+            self.log(
+                message=f"Unable to list the models: {exception}",
+                log_level=Qgis.MessageLevel.Warning,
+            )
+        elif entries is not None:
+            self._watch(self.index.directories(self.roots))
+            if entries != self._entries:
+                self._entries = entries
+                self.modelsChanged.emit()
+
+        if self._refresh_pending:
+            deep = self._deep_refresh_pending
+            self._refresh_pending = self._deep_refresh_pending = False
+            self.refresh(deep=deep)
+
+    def _watch(self, directories: list[str]):
+        """Watch exactly the given folders."""
+        watched = set(self._watcher.directories())
+        wanted = set(directories)
+        if watched - wanted:
+            self._watcher.removePaths(sorted(watched - wanted))
+        if wanted - watched:
+            self._watcher.addPaths(sorted(wanted - watched))
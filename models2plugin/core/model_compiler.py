@@ -0,0 +1,163 @@
+#! python3  # noqa: E265
+
+"""
+Compilation of the bundled models to Python, at build time: each model is exported
+by QGIS as a QgsProcessingAlgorithm subclass, written into its own module of the
+`compiled` package of the generated plugin.
+
+The generated provider registers the compiled algorithms instead of interpreting the
+.model3 files, and falls back to the latter for models which couldn't be compiled or
+whose file changed since. The registry format must stay in sync with the `provider`
+module of the plugin template.
+"""
+
+# standard
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+# PyQGIS
+from qgis.core import Qgis, QgsProcessing, QgsProcessingModelAlgorithm
+
+# project
+from models2plugin.toolbelt.hashing import digest_values
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+# package of the generated plugin holding the compiled models
+COMPILED_PACKAGE: str = "compiled"
+# name given in each compiled module to the algorithm class
+COMPILED_CLASS_ALIAS: str = "COMPILED_ALGORITHM"
+# to change whenever the compiled modules change for the same model and QGIS version
+COMPILER_VERSION: int = 1
+
+CLASS_PATTERN = re.compile(r"^class (\w+)\(QgsProcessingAlgorithm\):", re.MULTILINE)
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class ModelCompilationError(Exception):
+    """Raised when a model can't be compiled to Python."""
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def compiled_module_name(file_name: str, used: set[str]) -> str:
+    """Name of the module of a compiled model, unique in the plugin.
+
+    :param file_name: name of the model in the plugin
+    :type file_name: str
+    :param used: names already used, updated
+    :type used: set[str]
+
+    :return: valid Python module name
+    :rtype: str
+    """
+    base = "model_" + re.sub(r"\W+", "_", Path(file_name).stem.lower()).strip("_")
+    name, suffix = base, 1
+    while name in used:
+        suffix += 1
+        name = f"{base}_{suffix}"
+    used.add(name)
+    return name
+
+
+def compiled_inputs_digest(model_digest: str) -> str:
+    """Digest of everything a compiled module is built from: the model content and \
+    the QGIS version exporting it.
+
+    :param model_digest: digest of the model content in the plugin
+    :type model_digest: str
+
+    :return: hexadecimal digest
+    :rtype: str
+    """
+    return digest_values(COMPILER_VERSION, Qgis.QGIS_VERSION_INT, model_digest)
+
+
+def compile_model(model_path: Path, content: Optional[bytes] = None) -> str:
+    """Export a model as the source of a Python module defining a \
+    QgsProcessingAlgorithm subclass, aliased as COMPILED_ALGORITHM.
+
+    :param model_path: .model3 file path
+    :type model_path: Path
+    :param content: content to compile instead of the file one, e.g. with rewritten \
+    references to other models. Defaults to None.
+    :type content: bytes, optional
+
+    :raises ModelCompilationError: if QGIS can't load or export the model, or if the \
+    exported code is not valid
+
+    :return: module source
+    :rtype: str
+    """
+    model = QgsProcessingModelAlgorithm()
+    if content is None:
+        loaded = model.fromFile(str(model_path))
+    else:
+        # models are only loaded from files
+        fd, tmp_path = tempfile.mkstemp(suffix=".model3")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            loaded = model.fromFile(tmp_path)
+        finally:
+            os.unlink(tmp_path)
+    if not loaded:
+        raise ModelCompilationError(f"QGIS can't load the model {model_path.name}")
+
+    try:
+        lines = model.asPythonCode(
+            QgsProcessing.PythonOutputType.PythonQgsProcessingAlgorithmSubclass, 4
+        )
+    except Exception as exc:
+        raise ModelCompilationError(
+            f"QGIS can't export the model {model_path.name}: {exc}"
+        ) from exc
+
+    source = "\n".join(lines)
+    match = CLASS_PATTERN.search(source)
+    if match is None:
+        raise ModelCompilationError(
+            f"No algorithm class in the export of the model {model_path.name}"
+        )
+    source += f"\n\n\n{COMPILED_CLASS_ALIAS} = {match.group(1)}\n"
+
+    try:
+        compile(source, f"{model_path.stem}.py", "exec")
+    except (SyntaxError, ValueError) as exc:
+        raise ModelCompilationError(
+            f"Invalid export of the model {model_path.name}: {exc}"
+        ) from exc
+    return source
+
+
+def dump_compiled_registry(modules: dict[str, tuple[str, str]]) -> bytes:
+    """Build the `__init__` module of the compiled package, listing the compiled \
+    models.
+
+    :param modules: (module name, model digest) by model file name
+    :type modules: dict[str, tuple[str, str]]
+
+    :return: module source
+    :rtype: bytes
+    """
+    lines = [
+        '"""Models compiled to Python by Models2plugin. Generated, do not edit."""',
+        "",
+        "# (module, digest of the compiled model) by model file name",
+        "MODULES = {",
+    ]
+    for file_name, (module_name, digest) in sorted(modules.items()):
+        lines.append(f"    {file_name!r}: ({module_name!r}, {digest!r}),")
+    lines.append("}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
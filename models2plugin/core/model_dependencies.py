@@ -0,0 +1,245 @@
+#! python3  # noqa: E265
+
+"""
+Dependencies between processing models: a model runs another one through a child
+algorithm whose id is "model:<model name>".
+
+Models to bundle into a plugin are resolved with the models they run, transitively,
+each distinct content being bundled once. References to other models are rewritten
+to the provider of the generated plugin, which registers every bundled model.
+"""
+
+# standard
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+# project
+from models2plugin.core.model_discovery import (
+    ModelDiscoveryIndex,
+    ModelEntry,
+    get_model_discovery_index,
+    model_roots,
+)
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+# provider of the models of the user profile in QGIS
+MODEL_PROVIDER_ID: str = "model"
+
+ALG_ID_OPTION_PATTERN = re.compile(rb'<Option\b[^>]*\bname="alg_id"[^>]*>')
+MODEL_REFERENCE_PATTERN = re.compile(rb'\bvalue="model:')
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class ModelDependencyError(Exception):
+    """Raised when models run other models which can't be found."""
+
+    def __init__(self, missing: dict[str, list[str]]):
+        """Constructor.
+
+        :param missing: names of the missing models, by path of the model running them
+        :type missing: dict[str, list[str]]
+        """
+        self.missing = missing
+        details = "; ".join(
+            f"{model} runs {', '.join(names)}"
+            for model, names in sorted(missing.items())
+        )
+        super().__init__(f"Missing model dependencies: {details}")
+
+
+class ModelNameConflictError(Exception):
+    """Raised when models to bundle have the same name but different contents: the \
+    provider of the plugin would register one of them only."""
+
+    def __init__(self, conflicts: dict[str, list[str]]):
+        """Constructor.
+
+        :param conflicts: paths of the models sharing a name, by model name
+        :type conflicts: dict[str, list[str]]
+        """
+        self.conflicts = conflicts
+        details = "; ".join(
+            f"{name}: {', '.join(paths)}" for name, paths in sorted(conflicts.items())
+        )
+        super().__init__(f"Different models have the same name: {details}")
+
+
+@dataclass(frozen=True)
+class BundledModel:
+    """Model to bundle into a plugin."""
+
+    # file name in the models folder of the plugin
+    file_name: str
+    source: Path
+    sha256: str
+    name: str
+    # names of the models it runs
+    dependencies: tuple[str, ...] = ()
+    # size of the source file, in bytes
+    size: int = 0
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def model_dependencies(entry: ModelEntry) -> tuple[str, ...]:
+    """Names of the models run by a model.
+
+    :param entry: model
+    :type entry: ModelEntry
+
+    :return: model names, sorted
+    :rtype: tuple[str, ...]
+    """
+    prefix = f"{MODEL_PROVIDER_ID}:"
+    return tuple(
+        sorted(
+            alg_id[len(prefix) :]
+            for alg_id in entry.child_algorithms
+            if alg_id.startswith(prefix)
+        )
+    )
+
+
+def _entries_by_name(entries: dict[str, ModelEntry]) -> dict[str, ModelEntry]:
+    """Index valid models by name. For homonyms, the first path wins."""
+    by_name = {}
+    for path in sorted(entries):
+        entry = entries[path]
+        if entry.error is None:
+            by_name.setdefault(entry.name, entry)
+    return by_name
+
+
+def _unique_file_name(file_name: str, sha256: str, used: set[str]) -> str:
+    """Keep the file name unless another content already uses it."""
+    if file_name in used:
+        path = Path(file_name)
+        file_name = f"{path.stem}-{sha256[:12]}{path.suffix}"
+    used.add(file_name)
+    return file_name
+
+
+def resolve_model_dependencies(
+    model_paths: list[Path],
+    roots: Optional[list[Union[str, Path]]] = None,
+    index: Optional[ModelDiscoveryIndex] = None,
+) -> list[BundledModel]:
+    """Get the models to bundle: the given ones and the models they run, \
+    transitively. Every model file is parsed once, through the model discovery \
+    index, and a content found several times is bundled once.
+
+    Models run by a model are looked for among the given models first, then in the \
+    models folders, as QGIS would do.
+
+    :param model_paths: paths of the models to bundle
+    :type model_paths: list[Path]
+    :param roots: models folders. Defaults to None (model_roots).
+    :type roots: list[Union[str, Path]], optional
+    :param index: model discovery index. Defaults to None (shared index).
+    :type index: ModelDiscoveryIndex, optional
+
+    :raises FileNotFoundError: if a given model doesn't exist
+    :raises ModelDependencyError: if a model runs a model which can't be found
+    :raises ModelNameConflictError: if models with different contents have the same \
+    name
+
+    :return: models to bundle, given ones first, each content once
+    :rtype: list[BundledModel]
+    """
+    index = index or get_model_discovery_index()
+
+    pending: list[ModelEntry] = []
+    for model_path in model_paths:
+        entry = index.entry(model_path)
+        if entry is None:
+            raise FileNotFoundError(f"Model file not found: {model_path}")
+        pending.append(entry)
+
+    # given models are preferred to their homonyms of the models folders
+    by_name = _entries_by_name({str(entry.path): entry for entry in pending})
+    available: Optional[dict[str, ModelEntry]] = None
+
+    bundled: dict[str, BundledModel] = {}
+    used_file_names: set[str] = set()
+    missing: dict[str, list[str]] = {}
+    # first bundled model of each name
+    bundled_names: dict[str, ModelEntry] = {}
+    conflicts: dict[str, list[str]] = {}
+
+    while pending:
+        entry = pending.pop(0)
+        if entry.sha256 in bundled:
+            continue
+
+        homonym = bundled_names.setdefault(entry.name, entry)
+        if homonym is not entry:
+            conflicts.setdefault(entry.name, [str(homonym.path)]).append(
+                str(entry.path)
+            )
+
+        dependencies = model_dependencies(entry)
+        bundled[entry.sha256] = BundledModel(
+            file_name=_unique_file_name(entry.path.name, entry.sha256, used_file_names),
+            source=entry.path,
+            sha256=entry.sha256,
+            name=entry.name,
+            dependencies=dependencies,
+            size=entry.size,
+        )
+
+        for dependency in dependencies:
+            dependency_entry = by_name.get(dependency)
+            if dependency_entry is None:
+                if available is None:
+                    # the models folders are only scanned if needed
+                    available = _entries_by_name(
+                        index.scan(model_roots() if roots is None else roots)
+                    )
+                dependency_entry = available.get(dependency)
+            if dependency_entry is not None:
+                # a scan doesn't stat the models of unchanged directories: a model
+                # edited in place would keep its previous digest
+                dependency_entry = index.entry(dependency_entry.path)
+            if dependency_entry is None:
+                missing.setdefault(str(entry.path), []).append(dependency)
+                continue
+            by_name.setdefault(dependency, dependency_entry)
+            pending.append(dependency_entry)
+
+    if missing:
+        raise ModelDependencyError(missing)
+    if conflicts:
+        raise ModelNameConflictError(conflicts)
+
+    return list(bundled.values())
+
+
+def rewrite_model_references(content: bytes, provider_id: str) -> bytes:
+    """Make the child algorithms running a model of the user profile run the model \
+    bundled into the plugin instead.
+
+    :param content: .model3 file content
+    :type content: bytes
+    :param provider_id: id of the provider of the generated plugin
+    :type provider_id: str
+
+    :return: rewritten content
+    :rtype: bytes
+    """
+    replacement = f'value="{provider_id}:'.encode("utf-8")
+
+    def rewrite_tag(match: re.Match) -> bytes:
+        return MODEL_REFERENCE_PATTERN.sub(replacement, match.group(0))
+
+    return ALG_ID_OPTION_PATTERN.sub(rewrite_tag, content)
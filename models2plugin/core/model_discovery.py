@@ -0,0 +1,419 @@
+#! python3  # noqa: E265
+
+"""
+Discovery of the processing models available on the machine, under several root
+folders and their subfolders.
+
+What has been found is kept in an index file (directories with their modification
+time, models with their size, modification time, content digest and metadata), so
+that a later scan only costs one stat per directory whose content did not change.
+"""
+
+# standard
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Union
+
+# PyQGIS
+from qgis.core import QgsApplication
+
+# project
+from models2plugin.core.model_reader import read_model_metadata
+from models2plugin.core.output_manifest import write_atomically
+from models2plugin.toolbelt import PlgOptionsManager
+from models2plugin.toolbelt.hashing import digest_bytes
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+INDEX_FILE_NAME: str = "model_catalog.json"
+INDEX_VERSION: int = 2
+
+MODEL_SUFFIX: str = ".model3"
+
+# index shared by the model catalog and the generation
+_shared_index: Optional["ModelDiscoveryIndex"] = None
+_shared_index_lock = Lock()
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+@dataclass(frozen=True)
+class ModelEntry:
+    """Model found on disk."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+    sha256: str
+    name: str
+    group: str = ""
+    description: str = ""
+    child_algorithms: tuple[str, ...] = ()
+    error: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        """Text displayed in model lists."""
+        return f"{self.group} / {self.name}" if self.group else self.name
+
+    def to_dict(self) -> dict:
+        """Serialize the entry for the index file, without its path."""
+        return {
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "sha256": self.sha256,
+            "name": self.name,
+            "group": self.group,
+            "description": self.description,
+            "child_algorithms": list(self.child_algorithms),
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, path: str, data: dict) -> "ModelEntry":
+        """Deserialize an entry of the index file."""
+        data = dict(data, child_algorithms=tuple(data.get("child_algorithms", ())))
+        return cls(path=Path(path), **data)
+
+
+class ModelDiscoveryIndex:
+    """Models found under root folders, persisted in an index file. Methods can be \
+    called from any thread."""
+
+    def __init__(self, index_path: Optional[Union[str, Path]] = None):
+        """Constructor. Loads the index file if it exists.
+
+        :param index_path: index file path. Defaults to None (in memory only).
+        :type index_path: Union[str, Path], optional
+        """
+        self.index_path = Path(index_path) if index_path else None
+        # listing of each scanned directory: modification time, subfolders, models
+        self._directories: dict[str, dict] = {}
+        self._models: dict[str, ModelEntry] = {}
+        self._changed = False
+        self._lock = Lock()
+
+        if self.index_path is not None:
+            self._load()
+
+    def _load(self):
+        """Read the index file, ignoring it if missing or invalid."""
+        try:
+            with self.index_path.open("r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != INDEX_VERSION:
+                return
+            self._directories = index["directories"]
+            self._models = {
+                path: ModelEntry.from_dict(path, data)
+                for path, data in index["models"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            self._directories = {}
+            self._models = {}
+
+    def save(self):
+        """Write the index file if something changed since it was loaded. Errors are \
+        ignored: the index is only a cache."""
+        with self._lock:
+            if self.index_path is None or not self._changed:
+                return
+            index = {
+                "version": INDEX_VERSION,
+                "directories": dict(sorted(self._directories.items())),
+                "models": {
+                    path: entry.to_dict()
+                    for path, entry in sorted(self._models.items())
+                },
+            }
+            self._changed = False
+
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomically(
+                self.index_path, json.dumps(index, indent=1).encode("utf-8")
+            )
+        except OSError:
+            pass
+
+    def scan(
+        self, roots: list[Union[str, Path]], deep: bool = False
+    ) -> dict[str, ModelEntry]:
+        """Find the models under root folders, recursively.
+
+        A directory whose modification time did not change since the previous scan \
+        is not listed again: its models and subfolders are taken from the index. \
+        Models modified in place don't change the modification time of their \
+        directory: use a deep scan to check the size and modification time of \
+        every model.
+
+        :param roots: root folders. Missing folders are ignored.
+        :type roots: list[Union[str, Path]]
+        :param deep: check every model file. Defaults to False.
+        :type deep: bool, optional
+
+        :return: entries by path
+        :rtype: dict[str, ModelEntry]
+        """
+        entries: dict[str, ModelEntry] = {}
+        visited: set[str] = set()
+
+        with self._lock:
+            for root in roots:
+                pending = [os.path.abspath(root)]
+                while pending:
+                    directory = pending.pop()
+                    if directory in visited:
+                        continue
+                    visited.add(directory)
+                    pending.extend(self._scan_directory(directory, deep, entries))
+
+            # forget what disappeared from the scanned trees
+            for directory in list(self._directories):
+                if directory not in visited and _is_under(directory, visited):
+                    del self._directories[directory]
+                    self._changed = True
+            for path in list(self._models):
+                if path not in entries and _is_under(path, visited):
+                    del self._models[path]
+                    self._changed = True
+
+        return entries
+
+    def _scan_directory(
+        self, directory: str, deep: bool, entries: dict[str, ModelEntry]
+    ) -> list[str]:
+        """Add the models of a directory to entries.
+
+        :return: subfolders to scan
+        :rtype: list[str]
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return []
+
+        listing = self._directories.get(directory)
+        if not deep and listing is not None and listing["mtime_ns"] == mtime_ns:
+            for file_name in listing["files"]:
+                path = os.path.join(directory, file_name)
+                entry = self._models.get(path) or self._entry(path)
+                if entry is not None:
+                    entries[path] = entry
+            return [os.path.join(directory, name) for name in listing["dirs"]]
+
+        dirs, files = [], []
+        try:
+            with os.scandir(directory) as dir_entries:
+                for dir_entry in dir_entries:
+                    if dir_entry.is_dir():
+                        if not dir_entry.name.startswith((".", "__")):
+                            dirs.append(dir_entry.name)
+                    elif dir_entry.name.endswith(MODEL_SUFFIX) and dir_entry.is_file():
+                        stat = dir_entry.stat()
+                        entry = self._entry(
+                            dir_entry.path, stat.st_size, stat.st_mtime_ns
+                        )
+                        if entry is not None:
+                            files.append(dir_entry.name)
+                            entries[dir_entry.path] = entry
+        except OSError:
+            return []
+
+        self._directories[directory] = {
+            "mtime_ns": mtime_ns,
+            "dirs": sorted(dirs),
+            "files": sorted(files),
+        }
+        self._changed = True
+        return [os.path.join(directory, name) for name in dirs]
+
+    def _entry(
+        self, path: str, size: Optional[int] = None, mtime_ns: Optional[int] = None
+    ) -> Optional[ModelEntry]:
+        """Get the entry of a model file, reading it only if its size or \
+        modification time changed. The file is stat'ed if they are not given."""
+        if size is None or mtime_ns is None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            size, mtime_ns = stat.st_size, stat.st_mtime_ns
+
+        cached = self._models.get(path)
+        if cached is not None and cached.size == size and cached.mtime_ns == mtime_ns:
+            return cached
+
+        try:
+            content = Path(path).read_bytes()
+        except OSError:
+            return None
+        try:
+            metadata = read_model_metadata(Path(path), content)
+            entry = ModelEntry(
+                Path(path),
+                size,
+                mtime_ns,
+                sha256=digest_bytes(content),
+                name=metadata.name,
+                group=metadata.group,
+                description=metadata.description,
+                child_algorithms=metadata.child_algorithms,
+            )
+        except ValueError as exc:
+            entry = ModelEntry(
+                Path(path),
+                size,
+                mtime_ns,
+                sha256=digest_bytes(content),
+                name=Path(path).stem,
+                error=str(exc),
+            )
+
+        self._models[path] = entry
+        self._changed = True
+        return entry
+
+    def directories(self, roots: list[Union[str, Path]]) -> list[str]:
+        """Folders found by the previous scans under root folders.
+
+        :param roots: root folders
+        :type roots: list[Union[str, Path]]
+
+        :return: folder paths, roots included
+        :rtype: list[str]
+        """
+        roots = {os.path.abspath(root) for root in roots}
+        with self._lock:
+            return sorted(
+                directory
+                for directory in self._directories
+                if directory in roots or _is_under(directory, roots)
+            )
+
+    def entry(self, model_path: Union[str, Path]) -> Optional[ModelEntry]:
+        """Get the up-to-date entry of a model file, which may be out of the roots.
+
+        :param model_path: model file path
+        :type model_path: Union[str, Path]
+
+        :return: entry, None if the file doesn't exist
+        :rtype: Optional[ModelEntry]
+        """
+        with self._lock:
+            return self._entry(os.path.abspath(model_path))
+
+    def resolve(self, model: str, roots: list[Union[str, Path]]) -> Optional[Path]:
+        """Find a model given by a path relative to a root, a file name or a model \
+        name, in this order of priority.
+
+        :param model: model to find
+        :type model: str
+        :param roots: root folders
+        :type roots: list[Union[str, Path]]
+
+        :return: model file path, None if not found
+        :rtype: Optional[Path]
+        """
+        return self.resolve_all([model], roots)[model]
+
+    def resolve_all(
+        self, models: list[str], roots: list[Union[str, Path]]
+    ) -> dict[str, Optional[Path]]:
+        """Find several models, as resolve does, scanning the roots once for all.
+
+        :param models: models to find
+        :type models: list[str]
+        :param roots: root folders
+        :type roots: list[Union[str, Path]]
+
+        :return: model file path by model, None for the models not found
+        :rtype: dict[str, Optional[Path]]
+        """
+        entries = self.scan(roots)
+
+        # first path in alphabetical order for homonyms
+        by_file_name: dict[str, Path] = {}
+        by_name: dict[str, Path] = {}
+        for path in sorted(entries):
+            by_file_name.setdefault(entries[path].path.name, Path(path))
+            by_name.setdefault(entries[path].name, Path(path))
+
+        resolved = {}
+        for model in models:
+            found = None
+            for root in roots:
+                candidate = os.path.abspath(os.path.join(root, model))
+                if candidate in entries:
+                    found = entries[candidate].path
+                    break
+            if found is None:
+                found = by_file_name.get(model) or by_name.get(model)
+            resolved[model] = found
+        return resolved
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def _is_under(path: str, directories: set[str]) -> bool:
+    """Tell if a path is in one of the directories, looking at its parents."""
+    return any(str(parent) in directories for parent in Path(path).parents)
+
+
+def default_models_dir() -> Path:
+    """Default models folder of the QGIS profile."""
+    return Path(QgsApplication.qgisSettingsDirPath(), "processing", "models")
+
+
+def model_roots() -> list[Path]:
+    """Folders where models are searched: the Processing models folders and the \
+    additional folders of the plugin settings.
+
+    :return: folders, without duplicates
+    :rtype: list[Path]
+    """
+    try:
+        from processing.modeler.ModelerUtils import ModelerUtils
+
+        folders = ModelerUtils.modelsFolders()
+    except Exception:
+        # Processing plugin not available, e.g. from the command line
+        folders = [default_models_dir()]
+
+    folders += PlgOptionsManager.get_plg_settings().models_folders_list
+
+    roots = []
+    for folder in folders:
+        root = Path(os.path.abspath(folder))
+        if root not in roots:
+            roots.append(root)
+    return roots
+
+
+def default_index_path() -> Path:
+    """Index file of the QGIS profile."""
+    return Path(QgsApplication.qgisSettingsDirPath(), "models2plugin", INDEX_FILE_NAME)
+
+
+def get_model_discovery_index() -> ModelDiscoveryIndex:
+    """Get the index of the QGIS profile, loaded once per process.
+
+    :return: shared index
+    :rtype: ModelDiscoveryIndex
+    """
+    global _shared_index
+
+    with _shared_index_lock:
+        if _shared_index is None:
+            _shared_index = ModelDiscoveryIndex(default_index_path())
+    return _shared_index
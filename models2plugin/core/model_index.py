@@ -0,0 +1,122 @@
+#! python3  # noqa: E265
+
+"""
+Index of the models bundled into a generated plugin, written at build time so that
+the generated provider can list its algorithms without parsing the models.
+
+The format must stay in sync with the `model_index` module of the plugin template.
+"""
+
+# standard
+import json
+from pathlib import Path
+from threading import Lock
+
+# PyQGIS
+from qgis.core import QgsProcessingModelAlgorithm
+
+# project
+from models2plugin.toolbelt.hashing import digest_values
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+INDEX_FILE_NAME: str = "index.json"
+INDEX_VERSION: int = 2
+
+# model descriptions by content digest, so that a model bundled into several plugins
+# is parsed once per process
+_entries_cache: dict[str, dict] = {}
+_entries_cache_lock = Lock()
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def describe_model(model_path: Path, digest: str) -> dict:
+    """Parse a model and describe it for the index.
+
+    :param model_path: path to the .model3 file
+    :type model_path: Path
+    :param digest: SHA-256 digest of the file content
+    :type digest: str
+
+    :return: model description. Its "error" key is set if the model can't be loaded.
+    :rtype: dict
+    """
+    with _entries_cache_lock:
+        cached = _entries_cache.get(digest)
+    if cached is not None:
+        return dict(cached)
+
+    model = QgsProcessingModelAlgorithm()
+    if not model.fromFile(str(model_path)):
+        description = {"error": "Unable to load the model"}
+    else:
+        parameters = [param.toVariantMap() for param in model.parameterDefinitions()]
+        try:
+            json.dumps(parameters)
+        except (TypeError, ValueError):
+            # the generated plugin will read these definitions from the model itself
+            parameters = None
+
+        description = {
+            "name": model.name(),
+            "display_name": model.displayName(),
+            "group": model.group(),
+            "group_id": model.groupId(),
+            "help": model.shortHelpString(),
+            "parameters": parameters,
+            # read by the generated provider, which doesn't parse the model to list it
+            "flags": int(model.flags()),
+        }
+
+    with _entries_cache_lock:
+        _entries_cache[digest] = description
+    return dict(description)
+
+
+def index_inputs_digest(models: list[tuple[str, Path, str]]) -> str:
+    """Digest of everything the index is built from, to know if it is up to date.
+
+    :param models: bundled models, as (file name in the plugin, source path, digest)
+    :type models: list[tuple[str, Path, str]]
+
+    :return: hexadecimal digest
+    :rtype: str
+    """
+    return digest_values(
+        INDEX_VERSION, *sorted((file_name, digest) for file_name, _, digest in models)
+    )
+
+
+def build_model_index(models: list[tuple[str, Path, str]]) -> dict:
+    """Build the index of bundled models.
+
+    :param models: bundled models, as (file name in the plugin, source path, digest)
+    :type models: list[tuple[str, Path, str]]
+
+    :return: index, entries being sorted by file name
+    :rtype: dict
+    """
+    entries = []
+    for file_name, model_path, digest in sorted(models):
+        entry = {"file": file_name, "sha256": digest}
+        entry.update(describe_model(model_path, digest))
+        entries.append(entry)
+
+    return {"version": INDEX_VERSION, "models": entries}
+
+
+def dump_model_index(index: dict) -> bytes:
+    """Serialize the index of bundled models.
+
+    :param index: index, as built by build_model_index
+    :type index: dict
+
+    :return: index file content
+    :rtype: bytes
+    """
+    return json.dumps(index, indent=1).encode("utf-8")
@@ -0,0 +1,77 @@
+#! python3  # noqa: E265
+
+"""
+Pack of the models bundled into a generated plugin: a single file holding every model,
+compressed, so that the generated provider opens one file at startup instead of one
+per model, and only decompresses a model when it is needed.
+
+Layout: magic bytes, size of the table (unsigned 32 bits, little endian), table as
+JSON (offset and size of each model in the data, digest of its content), then the
+models compressed with zlib, one after the other.
+
+The format must stay in sync with the `model_index` module of the plugin template.
+"""
+
+# standard
+import json
+import struct
+import zlib
+
+# project
+from models2plugin.toolbelt.hashing import digest_values
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+PACK_FILE_NAME: str = "models.pack"
+PACK_MAGIC: bytes = b"M2PPACK\n"
+PACK_VERSION: int = 1
+
+# build time matters less than the size read at each QGIS startup
+COMPRESSION_LEVEL: int = 9
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def pack_inputs_digest(models: list[tuple[str, str]]) -> str:
+    """Digest of everything a pack is built from.
+
+    :param models: bundled models, as (file name in the plugin, content digest)
+    :type models: list[tuple[str, str]]
+
+    :return: hexadecimal digest
+    :rtype: str
+    """
+    return digest_values(PACK_VERSION, COMPRESSION_LEVEL, *sorted(models))
+
+
+def build_model_pack(models: list[tuple[str, bytes, str]]) -> bytes:
+    """Pack models into a single file content.
+
+    :param models: bundled models, as (file name in the plugin, content, digest)
+    :type models: list[tuple[str, bytes, str]]
+
+    :return: pack file content
+    :rtype: bytes
+    """
+    table = {}
+    blobs = []
+    offset = 0
+    for file_name, content, digest in sorted(models):
+        blob = zlib.compress(content, COMPRESSION_LEVEL)
+        table[file_name] = {
+            "offset": offset,
+            "size": len(blob),
+            "raw_size": len(content),
+            "sha256": digest,
+        }
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = json.dumps(
+        {"version": PACK_VERSION, "models": table}, separators=(",", ":")
+    ).encode("utf-8")
+    return b"".join([PACK_MAGIC, struct.pack("<I", len(header)), header, *blobs])
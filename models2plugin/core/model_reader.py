@@ -0,0 +1,94 @@
+#! python3  # noqa: E265
+
+"""
+Read the metadata of processing models (.model3 files) straight from their XML, without
+loading them into QGIS, so that many models can be listed quickly from any thread.
+"""
+
+# standard
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+@dataclass(frozen=True)
+class ModelMetadata:
+    """Metadata of a processing model."""
+
+    name: str
+    group: str = ""
+    description: str = ""
+    # ids of the algorithms run by the model, e.g. native:buffer or model:Other
+    child_algorithms: tuple[str, ...] = ()
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def _option_value(options: dict[str, ET.Element], name: str) -> str:
+    """Get the value of a string option, an empty string if missing."""
+    option = options.get(name)
+    if option is None:
+        return ""
+    return option.get("value", "")
+
+
+def read_model_metadata(
+    model_path: Path, content: Optional[bytes] = None
+) -> ModelMetadata:
+    """Read the name, group and description of a model.
+
+    :param model_path: path to the .model3 file
+    :type model_path: Path
+    :param content: file content, if already read. Defaults to None.
+    :type content: bytes, optional
+
+    :raises ValueError: if the file is not a processing model
+
+    :return: model metadata. The name defaults to the file name without extension.
+    :rtype: ModelMetadata
+    """
+    try:
+        if content is None:
+            root = ET.parse(model_path).getroot()
+        else:
+            root = ET.fromstring(content)
+    except ET.ParseError as exc:
+        raise ValueError(f"Invalid model file {model_path.name}: {exc}") from exc
+    if root.tag != "Option":
+        raise ValueError(f"Invalid model file {model_path.name}: not a model")
+
+    options = {option.get("name"): option for option in root.findall("Option")}
+
+    description = ""
+    help_option: Optional[ET.Element] = options.get("help")
+    if help_option is not None:
+        description = _option_value(
+            {option.get("name"): option for option in help_option.findall("Option")},
+            "ALG_DESC",
+        )
+
+    child_algorithms = set()
+    children_option: Optional[ET.Element] = options.get("children")
+    if children_option is not None:
+        for child in children_option.findall("Option"):
+            alg_id = _option_value(
+                {option.get("name"): option for option in child.findall("Option")},
+                "alg_id",
+            )
+            if alg_id:
+                child_algorithms.add(alg_id)
+
+    return ModelMetadata(
+        name=_option_value(options, "model_name") or model_path.stem,
+        group=_option_value(options, "model_group"),
+        description=description,
+        child_algorithms=tuple(sorted(child_algorithms)),
+    )
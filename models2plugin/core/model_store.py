@@ -0,0 +1,169 @@
+#! python3  # noqa: E265
+
+"""
+Content-addressed store of models, shared by generated plugins.
+
+Each distinct model content is stored once, named after its SHA-256 digest. A plugin
+generated against the store holds no model file: its models folder only contains a
+manifest mapping model file names to digests, resolved by the generated provider.
+
+The layout and the manifest format must stay in sync with the `model_index` module
+of the plugin template.
+"""
+
+# standard
+import json
+import os
+from pathlib import Path
+from typing import Union
+
+# project
+from models2plugin.core.file_copy import DEFAULT_COPY_STRATEGY
+from models2plugin.core.output_manifest import copy_atomically, write_atomically
+from models2plugin.toolbelt.hashing import digest_values
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+STORE_MANIFEST_FILE_NAME: str = "store.json"
+STORE_MANIFEST_VERSION: int = 1
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class ModelStore:
+    """Models stored by content digest, under <directory>/<2 first hex digits>/."""
+
+    def __init__(
+        self, directory: Union[str, Path], copy_strategy: str = DEFAULT_COPY_STRATEGY
+    ):
+        """Constructor.
+
+        :param directory: store directory, created if needed
+        :type directory: Union[str, Path]
+        :param copy_strategy: how model files are copied into the store, see \
+        file_copy. "hardlink" is replaced by DEFAULT_COPY_STRATEGY. Defaults to \
+        DEFAULT_COPY_STRATEGY.
+        :type copy_strategy: str, optional
+        """
+        self.directory = Path(os.path.abspath(directory))
+        # a blob hard linked to its source would change with it, while staying named
+        # after its former content
+        self.copy_strategy = (
+            DEFAULT_COPY_STRATEGY if copy_strategy == "hardlink" else copy_strategy
+        )
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def blob_path(self, sha256: str) -> Path:
+        """Path of a model content in the store.
+
+        :param sha256: SHA-256 digest of the content
+        :type sha256: str
+
+        :return: file path, which may not exist
+        :rtype: Path
+        """
+        return self.directory / sha256[:2] / f"{sha256}.model3"
+
+    def _has(self, sha256: str, size: int) -> bool:
+        """Tell if a content is stored. Blobs are written atomically and never \
+        modified, their size is enough to detect a damaged store."""
+        try:
+            return self.blob_path(sha256).stat().st_size == size
+        except OSError:
+            return False
+
+    def add_file(self, source: Path, sha256: str) -> bool:
+        """Store a model file, unless its content is already stored.
+
+        :param source: model file path
+        :type source: Path
+        :param sha256: SHA-256 digest of its content
+        :type sha256: str
+
+        :return: True if the file has been copied into the store
+        :rtype: bool
+        """
+        if self._has(sha256, source.stat().st_size):
+            return False
+        blob = self.blob_path(sha256)
+        blob.parent.mkdir(exist_ok=True)
+        copy_atomically(source, blob, self.copy_strategy)
+        return True
+
+    def add_bytes(self, content: bytes, sha256: str) -> bool:
+        """Store a model content, unless it is already stored.
+
+        :param content: model file content
+        :type content: bytes
+        :param sha256: SHA-256 digest of the content
+        :type sha256: str
+
+        :return: True if the content has been written into the store
+        :rtype: bool
+        """
+        if self._has(sha256, len(content)):
+            return False
+        blob = self.blob_path(sha256)
+        blob.parent.mkdir(exist_ok=True)
+        write_atomically(blob, content)
+        return True
+
+    def relative_location(self, models_dir: Path) -> str:
+        """Location of the store as written in the manifest of a plugin: relative to \
+        its models folder when possible, so that the plugin and the store can be \
+        moved together.
+
+        :param models_dir: models folder of the plugin
+        :type models_dir: Path
+
+        :return: store path, relative or absolute
+        :rtype: str
+        """
+        try:
+            return os.path.relpath(self.directory, os.path.abspath(models_dir))
+        except ValueError:
+            # on another drive
+            return str(self.directory)
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def store_manifest_inputs_digest(location: str, models: dict[str, str]) -> str:
+    """Digest of everything a store manifest is built from.
+
+    :param location: store location, as written in the manifest
+    :type location: str
+    :param models: digests by model file name
+    :type models: dict[str, str]
+
+    :return: hexadecimal digest
+    :rtype: str
+    """
+    return digest_values(STORE_MANIFEST_VERSION, location, *sorted(models.items()))
+
+
+def dump_store_manifest(location: str, models: dict[str, str]) -> bytes:
+    """Serialize the manifest of the models of a plugin kept in a store.
+
+    :param location: store location, relative to the models folder of the plugin \
+    or absolute
+    :type location: str
+    :param models: digests by model file name
+    :type models: dict[str, str]
+
+    :return: manifest file content
+    :rtype: bytes
+    """
+    manifest = {
+        "version": STORE_MANIFEST_VERSION,
+        "store": Path(location).as_posix(),
+        "models": dict(sorted(models.items())),
+    }
+    return json.dumps(manifest, indent=1).encode("utf-8")
@@ -0,0 +1,197 @@
+#! python3  # noqa: E265
+
+"""
+Validation of the models bundled into a plugin, at build time: each model is loaded,
+and its child algorithms and parameters are checked against the processing registry.
+
+Models are validated in parallel, by a pool of threads.
+"""
+
+# standard
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+# PyQGIS
+from qgis.core import QgsApplication, QgsProcessingModelAlgorithm
+
+# project
+from models2plugin.core.model_dependencies import (
+    MODEL_PROVIDER_ID,
+    BundledModel,
+)
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+ERROR: str = "error"
+WARNING: str = "warning"
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+@dataclass
+class ModelIssue:
+    """Problem found in a model."""
+
+    severity: str
+    message: str
+    # id of the child algorithm concerned, if any
+    child_id: Optional[str] = None
+
+
+@dataclass
+class ModelValidation:
+    """Validation outcome of a model."""
+
+    file_name: str
+    name: str
+    issues: list[ModelIssue] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True if the model has no error (it may have warnings)."""
+        return not any(issue.severity == ERROR for issue in self.issues)
+
+
+@dataclass
+class ValidationReport:
+    """Validation outcome of the models of a plugin, in bundle order."""
+
+    models: list[ModelValidation] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True if no model has an error."""
+        return all(model.ok for model in self.models)
+
+    @property
+    def issues_count(self) -> int:
+        """Number of issues, errors and warnings."""
+        return sum(len(model.issues) for model in self.models)
+
+    def to_dict(self) -> dict:
+        """Serialize the report, e.g. to dump it as JSON."""
+        return {"ok": self.ok, "models": [asdict(model) for model in self.models]}
+
+    def summary(self) -> list[str]:
+        """Describe the issues, one line each.
+
+        :return: lines formatted as "<severity> <file>[<child>]: <message>"
+        :rtype: list[str]
+        """
+        lines = []
+        for model in self.models:
+            for issue in model.issues:
+                location = model.file_name
+                if issue.child_id:
+                    location += f"[{issue.child_id}]"
+                lines.append(f"{issue.severity.upper()} {location}: {issue.message}")
+        return lines
+
+
+class ModelValidationError(Exception):
+    """Raised when bundled models have errors and the validation is strict."""
+
+    def __init__(self, report: ValidationReport):
+        self.report = report
+        invalid = [model.file_name for model in report.models if not model.ok]
+        super().__init__(f"Invalid models: {', '.join(invalid)}")
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def validate_model(model: BundledModel, bundled_names: set[str]) -> ModelValidation:
+    """Load a model and check its child algorithms and parameters.
+
+    :param model: bundled model
+    :type model: BundledModel
+    :param bundled_names: names of the bundled models, run from the plugin provider
+    :type bundled_names: set[str]
+
+    :return: validation outcome
+    :rtype: ModelValidation
+    """
+    validation = ModelValidation(file_name=model.file_name, name=model.name)
+    issues = validation.issues
+
+    algorithm = QgsProcessingModelAlgorithm()
+    if not algorithm.fromFile(str(model.source)):
+        issues.append(ModelIssue(ERROR, "QGIS can't load the model"))
+        return validation
+
+    registry = QgsApplication.processingRegistry()
+    model_prefix = f"{MODEL_PROVIDER_ID}:"
+
+    for child_id, child in algorithm.childAlgorithms().items():
+        alg_id = child.algorithmId()
+        model_name = alg_id[len(model_prefix) :]
+        if alg_id.startswith(model_prefix) and model_name in bundled_names:
+            # bundled: run from the plugin provider, validated on its own
+            continue
+
+        if child.algorithm() is None:
+            provider_id = alg_id.split(":", 1)[0]
+            if registry.providerById(provider_id) is None:
+                issues.append(
+                    ModelIssue(
+                        WARNING,
+                        f"Provider {provider_id} of algorithm {alg_id} is not "
+                        "available here, its algorithms can't be checked",
+                        child_id,
+                    )
+                )
+            else:
+                issues.append(
+                    ModelIssue(ERROR, f"Unknown algorithm {alg_id}", child_id)
+                )
+            continue
+
+        if child.isActive():
+            valid, child_issues = algorithm.validateChildAlgorithm(child_id)
+            if not valid:
+                for message in child_issues:
+                    issues.append(ModelIssue(ERROR, message, child_id))
+
+    for parameter in algorithm.parameterDefinitions():
+        if registry.parameterType(parameter.type()) is None:
+            issues.append(
+                ModelIssue(
+                    ERROR,
+                    f"Parameter {parameter.name()} has an unknown type "
+                    f"{parameter.type()}",
+                )
+            )
+
+    return validation
+
+
+def validate_models(
+    models: list[BundledModel], max_workers: Optional[int] = None
+) -> ValidationReport:
+    """Validate models in parallel.
+
+    :param models: bundled models
+    :type models: list[BundledModel]
+    :param max_workers: number of threads. Defaults to None (ThreadPoolExecutor \
+    default, depending on the number of CPU).
+    :type max_workers: int, optional
+
+    :return: validation report, models being in the given order
+    :rtype: ValidationReport
+    """
+    bundled_names = {model.name for model in models}
+    if len(models) <= 1 or max_workers == 1:
+        validations = [validate_model(model, bundled_names) for model in models]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            validations = list(
+                executor.map(lambda model: validate_model(model, bundled_names), models)
+            )
+    return ValidationReport(models=validations)
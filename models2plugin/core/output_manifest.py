@@ -0,0 +1,192 @@
+#! python3  # noqa: E265
+
+"""
+Manifest of the files written into a plugin output directory, used to only rewrite
+outputs whose inputs changed since the previous generation.
+"""
+
+# standard
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+# project
+from models2plugin.core.file_copy import DEFAULT_COPY_STRATEGY, copy_file
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+MANIFEST_FILE_NAME: str = ".models2plugin.json"
+MANIFEST_VERSION: int = 1
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def write_atomically(path: Path, data: bytes):
+    """Write a file through a temporary file renamed at the end, so that the \
+    destination is never left half-written.
+
+    :param path: destination file path
+    :type path: Path
+    :param data: file content
+    :type data: bytes
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def copy_atomically(
+    source: Path, path: Path, strategy: str = DEFAULT_COPY_STRATEGY
+) -> str:
+    """Copy a file through a temporary file renamed at the end, so that the \
+    destination is never left half-written.
+
+    :param source: source file path
+    :type source: Path
+    :param path: destination file path
+    :type path: Path
+    :param strategy: copy strategy, see file_copy. Defaults to DEFAULT_COPY_STRATEGY.
+    :type strategy: str, optional
+
+    :return: copy method used
+    :rtype: str
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    os.close(fd)
+    try:
+        method = copy_file(source, tmp_path, strategy)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return method
+
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class OutputManifest:
+    """Files generated into an output directory, with a digest of their inputs."""
+
+    def __init__(self, output_dir: Union[str, Path]):
+        """Constructor. Loads the manifest of the previous generation if any.
+
+        :param output_dir: plugin output directory
+        :type output_dir: Union[str, Path]
+        """
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_FILE_NAME
+        self.template_digest: Optional[str] = None
+        self.context_digest: Optional[str] = None
+
+        self.previous_files: dict[str, dict] = {}
+        self.files: dict[str, dict] = {}
+
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                previous = json.load(f)
+            if previous.get("version") == MANIFEST_VERSION:
+                self.previous_files = previous.get("files", {})
+        except (OSError, ValueError):
+            # no manifest or a corrupted one: every output will be written
+            pass
+
+    def is_up_to_date(self, relative_path: str, inputs_digest: str) -> bool:
+        """Tell if an output has already been generated from the same inputs and is \
+        still on disk.
+
+        :param relative_path: output path, relative to the output directory
+        :type relative_path: str
+        :param inputs_digest: digest of everything the output is generated from
+        :type inputs_digest: str
+
+        :return: True if the output doesn't need to be written again
+        :rtype: bool
+        """
+        previous = self.previous_files.get(relative_path)
+        if not previous or previous.get("inputs") != inputs_digest:
+            return False
+
+        try:
+            return (self.output_dir / relative_path).stat().st_size == previous.get(
+                "size"
+            )
+        except OSError:
+            return False
+
+    def record(self, relative_path: str, inputs_digest: str, size: int):
+        """Record an output of the current generation.
+
+        :param relative_path: output path, relative to the output directory
+        :type relative_path: str
+        :param inputs_digest: digest of everything the output is generated from
+        :type inputs_digest: str
+        :param size: output size in bytes
+        :type size: int
+        """
+        self.files[relative_path] = {"inputs": inputs_digest, "size": size}
+
+    def stale_paths(self) -> list[str]:
+        """Outputs of the previous generation not produced by the current one.
+
+        :return: output paths, relative to the output directory
+        :rtype: list[str]
+        """
+        return sorted(set(self.previous_files) - set(self.files))
+
+    def remove_stale_outputs(self) -> list[str]:
+        """Delete outputs of the previous generation not produced by the current \
+        one, and the directories they leave empty.
+
+        :return: removed output paths, relative to the output directory
+        :rtype: list[str]
+        """
+        removed = []
+        for relative_path in self.stale_paths():
+            stale_file = self.output_dir / relative_path
+            try:
+                stale_file.unlink()
+            except FileNotFoundError:
+                pass
+            removed.append(relative_path)
+
+            for parent in stale_file.parents:
+                if parent == self.output_dir or self.output_dir not in parent.parents:
+                    break
+                try:
+                    parent.rmdir()
+                except OSError:
+                    # not empty
+                    break
+
+        return removed
+
+    def keep_unvisited_files(self):
+        """Keep the outputs of the previous generation not handled by the current \
+        one, when it stops before its end: they are still on disk, unchanged."""
+        for relative_path, previous in self.previous_files.items():
+            self.files.setdefault(relative_path, previous)
+
+    def save(self):
+        """Write the manifest into the output directory."""
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "template": self.template_digest,
+            "context": self.context_digest,
+            "files": dict(sorted(self.files.items())),
+        }
+        write_atomically(self.path, json.dumps(manifest, indent=1).encode("utf-8"))
@@ -0,0 +1,283 @@
+#! python3  # noqa: E265
+
+"""
+Destinations of the files of a generated plugin: a directory, updated incrementally,
+or a zip archive streamed from memory.
+"""
+
+# standard
+import os
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Optional, Union
+
+# project
+from models2plugin.core.file_copy import (
+    COPY_STRATEGIES,
+    DEFAULT_COPY_STRATEGY,
+)
+from models2plugin.core.output_manifest import (
+    OutputManifest,
+    copy_atomically,
+    write_atomically,
+)
+from models2plugin.toolbelt.hashing import CHUNK_SIZE
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+OUTPUT_MODES: tuple[str, ...] = ("directory", "zip")
+
+# fixed timestamp of zip entries, so that the same inputs give the same archive
+ZIP_DATE_TIME: tuple = (1980, 1, 1, 0, 0, 0)
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class PluginOutput:
+    """Base class of plugin outputs. Paths are relative to the plugin root folder, \
+    with POSIX separators."""
+
+    def is_up_to_date(self, relative_path: str, inputs_digest: str) -> bool:
+        """Tell if a file already generated from the same inputs can be kept as is.
+
+        :param relative_path: file path in the plugin
+        :type relative_path: str
+        :param inputs_digest: digest of everything the file is generated from
+        :type inputs_digest: str
+
+        :return: True if the file doesn't need to be written again
+        :rtype: bool
+        """
+        return False
+
+    def keep(self, relative_path: str, inputs_digest: str):
+        """Keep a file which is up to date.
+
+        :param relative_path: file path in the plugin
+        :type relative_path: str
+        :param inputs_digest: digest of everything the file is generated from
+        :type inputs_digest: str
+        """
+        raise NotImplementedError
+
+    def write_bytes(self, relative_path: str, data: bytes, inputs_digest: str):
+        """Write a file.
+
+        :param relative_path: file path in the plugin
+        :type relative_path: str
+        :param data: file content
+        :type data: bytes
+        :param inputs_digest: digest of everything the file is generated from
+        :type inputs_digest: str
+        """
+        raise NotImplementedError
+
+    def copy_file(self, relative_path: str, source: Path, inputs_digest: str):
+        """Copy a file.
+
+        :param relative_path: file path in the plugin
+        :type relative_path: str
+        :param source: path of the file to copy
+        :type source: Path
+        :param inputs_digest: digest of everything the file is generated from
+        :type inputs_digest: str
+        """
+        self.write_bytes(relative_path, source.read_bytes(), inputs_digest)
+
+    def record_inputs(self, template_digest: str, context_digest: str):
+        """Record what the whole plugin is generated from.
+
+        :param template_digest: digest of the template files
+        :type template_digest: str
+        :param context_digest: digest of the template variables
+        :type context_digest: str
+        """
+
+    def make_dir(self, relative_path: str):
+        """Create a directory, even if no file is written into it.
+
+        :param relative_path: directory path in the plugin
+        :type relative_path: str
+        """
+
+    def close(self) -> list[str]:
+        """Finalize the output.
+
+        :return: files of a previous generation removed from the output
+        :rtype: list[str]
+        """
+        return []
+
+    def abort(self):
+        """Finalize an output whose generation stopped before its end (canceled or \
+        failed), leaving it in a consistent state."""
+
+
+class DirectoryOutput(PluginOutput):
+    """Write the plugin into a directory, only rewriting the files whose inputs \
+    changed since the previous generation."""
+
+    def __init__(
+        self, directory: Union[str, Path], copy_strategy: str = DEFAULT_COPY_STRATEGY
+    ):
+        """Constructor.
+
+        :param directory: plugin output directory
+        :type directory: Union[str, Path]
+        :param copy_strategy: how copied files are transferred, one of \
+        COPY_STRATEGIES. Defaults to DEFAULT_COPY_STRATEGY.
+        :type copy_strategy: str, optional
+
+        :raises ValueError: if the copy strategy is unknown
+        """
+        if copy_strategy not in COPY_STRATEGIES:
+            raise ValueError(
+                f"Unknown copy strategy: {copy_strategy}. Must be one of: "
+                f"{', '.join(COPY_STRATEGIES)}"
+            )
+        self.copy_strategy = copy_strategy
+        # number of files copied by each method
+        self.copy_methods: dict[str, int] = {}
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest = OutputManifest(self.directory)
+
+    def is_up_to_date(self, relative_path: str, inputs_digest: str) -> bool:
+        return self.manifest.is_up_to_date(relative_path, inputs_digest)
+
+    def keep(self, relative_path: str, inputs_digest: str):
+        self.manifest.record(
+            relative_path,
+            inputs_digest,
+            (self.directory / relative_path).stat().st_size,
+        )
+
+    def write_bytes(self, relative_path: str, data: bytes, inputs_digest: str):
+        destination_file = self.directory / relative_path
+        destination_file.parent.mkdir(parents=True, exist_ok=True)
+        write_atomically(destination_file, data)
+        self.manifest.record(relative_path, inputs_digest, len(data))
+
+    def copy_file(self, relative_path: str, source: Path, inputs_digest: str):
+        destination_file = self.directory / relative_path
+        destination_file.parent.mkdir(parents=True, exist_ok=True)
+        method = copy_atomically(source, destination_file, self.copy_strategy)
+        self.copy_methods[method] = self.copy_methods.get(method, 0) + 1
+        self.manifest.record(
+            relative_path, inputs_digest, destination_file.stat().st_size
+        )
+
+    def record_inputs(self, template_digest: str, context_digest: str):
+        self.manifest.template_digest = template_digest
+        self.manifest.context_digest = context_digest
+
+    def make_dir(self, relative_path: str):
+        (self.directory / relative_path).mkdir(parents=True, exist_ok=True)
+
+    def close(self) -> list[str]:
+        removed = self.manifest.remove_stale_outputs()
+        self.manifest.save()
+        return removed
+
+    def abort(self):
+        # every file is written atomically: files already written are complete and
+        # recorded, the other ones are left as generated previously
+        self.manifest.keep_unvisited_files()
+        self.manifest.save()
+
+
+class ZipOutput(PluginOutput):
+    """Stream the plugin into a zip archive, under its root folder, without writing \
+    the plugin files on disk. An archive written to a path is built into a temporary \
+    file renamed at the end, so that a previous archive is kept until the new one is \
+    complete."""
+
+    def __init__(
+        self,
+        target: Union[str, os.PathLike, zipfile.ZipFile, BinaryIO],
+        root_folder: str,
+        compression: int = zipfile.ZIP_DEFLATED,
+    ):
+        """Constructor.
+
+        :param target: zip file path, opened zip file or writable binary stream. \
+        Zip files and streams passed by the caller are not closed.
+        :type target: Union[str, os.PathLike, zipfile.ZipFile, BinaryIO]
+        :param root_folder: name of the plugin folder in the archive
+        :type root_folder: str
+        :param compression: zip compression method. Defaults to ZIP_DEFLATED.
+        :type compression: int, optional
+        """
+        self.root_folder = PurePosixPath(root_folder)
+        self.compression = compression
+
+        self._path: Optional[Path] = None
+        self._tmp_path: Optional[str] = None
+        self._tmp_file: Optional[BinaryIO] = None
+        if isinstance(target, zipfile.ZipFile):
+            self.archive = target
+            self._owns_archive = False
+        else:
+            if isinstance(target, (str, os.PathLike)):
+                self._path = Path(target)
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                fd, self._tmp_path = tempfile.mkstemp(
+                    dir=self._path.parent, prefix=f".{self._path.name}."
+                )
+                target = self._tmp_file = os.fdopen(fd, "wb")
+            self.archive = zipfile.ZipFile(target, "w", compression=compression)
+            self._owns_archive = True
+
+    def _zip_info(self, relative_path: str, is_dir: bool = False) -> zipfile.ZipInfo:
+        """Build the entry of a file, with a fixed timestamp and standard rights."""
+        name = (self.root_folder / relative_path).as_posix()
+        if is_dir:
+            name += "/"
+        info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+        info.compress_type = zipfile.ZIP_STORED if is_dir else self.compression
+        info.external_attr = (0o40755 if is_dir else 0o100644) << 16
+        return info
+
+    def write_bytes(self, relative_path: str, data: bytes, inputs_digest: str):
+        self.archive.writestr(self._zip_info(relative_path), data)
+
+    def copy_file(self, relative_path: str, source: Path, inputs_digest: str):
+        with open(source, "rb") as src:
+            with self.archive.open(self._zip_info(relative_path), "w") as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+    def make_dir(self, relative_path: str):
+        self.archive.writestr(self._zip_info(relative_path, is_dir=True), b"")
+
+    def _close_archive(self):
+        if self._owns_archive:
+            self.archive.close()
+        if self._tmp_file is not None:
+            self._tmp_file.close()
+
+    def close(self) -> list[str]:
+        try:
+            self._close_archive()
+        except BaseException:
+            self.abort()
+            raise
+        if self._tmp_path is not None:
+            os.replace(self._tmp_path, self._path)
+            self._tmp_path = None
+        return []
+
+    def abort(self):
+        try:
+            self._close_archive()
+        finally:
+            # an incomplete archive would be mistaken for a plugin: only the
+            # temporary file is removed, a previous archive is left as is
+            if self._tmp_path is not None:
+                Path(self._tmp_path).unlink(missing_ok=True)
+                self._tmp_path = None
@@ -0,0 +1,237 @@
+#! python3  # noqa: E265
+
+"""
+Plugin template loaded in memory, once per process.
+
+The template tree is read through a loader (a directory or a zip archive by default)
+into a bundle holding every file content, whether it is binary or text, and the
+compiled template of text files.
+"""
+
+# standard
+import mimetypes
+import os
+import zipfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from threading import Lock
+from typing import Optional, Union
+
+# project
+from models2plugin.toolbelt.hashing import digest_bytes, digest_values
+from models2plugin.toolbelt.template_engine import CompiledTemplate
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+# never part of a template, even when found in its directory
+IGNORED_NAMES: frozenset = frozenset({"__pycache__", ".DS_Store", "Thumbs.db"})
+IGNORED_SUFFIXES: frozenset = frozenset({".pyc", ".pyo"})
+
+_bundles_cache: dict[tuple, "TemplateBundle"] = {}
+_bundles_cache_lock = Lock()
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+@dataclass(frozen=True)
+class TemplateEntry:
+    """File of the plugin template."""
+
+    relative_path: str
+    content: bytes
+    digest: str
+    template: Optional[CompiledTemplate] = None
+
+    @property
+    def is_binary(self) -> bool:
+        """Binary files are copied as is, text files are rendered."""
+        return self.template is None
+
+
+class TemplateBundle:
+    """Every file of a plugin template, sorted by relative path."""
+
+    def __init__(self, files: dict[str, bytes]):
+        """Constructor.
+
+        :param files: file contents by relative path (POSIX separators)
+        :type files: dict[str, bytes]
+        """
+        entries = []
+        for relative_path, content in sorted(files.items()):
+            entries.append(
+                TemplateEntry(
+                    relative_path=relative_path,
+                    content=content,
+                    digest=digest_bytes(content),
+                    template=self._compile(relative_path, content),
+                )
+            )
+        self.entries: tuple[TemplateEntry, ...] = tuple(entries)
+        self.digest: str = digest_values(
+            *((entry.relative_path, entry.digest) for entry in self.entries)
+        )
+
+    @staticmethod
+    def _compile(relative_path: str, content: bytes) -> Optional[CompiledTemplate]:
+        """Compile a template file, unless it is an image or not UTF-8 text."""
+        mime_type, _ = mimetypes.guess_type(relative_path)
+        if mime_type and mime_type.startswith("image/"):
+            return None
+        try:
+            return CompiledTemplate(content.decode("utf-8"))
+        except UnicodeDecodeError:
+            return None
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class TemplateLoader(ABC):
+    """Base class of plugin template loaders. Subclasses must implement `key` and \
+    `load`."""
+
+    @property
+    @abstractmethod
+    def key(self) -> tuple:
+        """Identifier of the loaded template, used to cache the bundle."""
+
+    @abstractmethod
+    def load(self) -> dict[str, bytes]:
+        """Read the template files.
+
+        :return: file contents by relative path (POSIX separators)
+        :rtype: dict[str, bytes]
+        """
+
+    @staticmethod
+    def is_ignored(relative_path: str) -> bool:
+        """Tell if a file found in a template source is not part of the template."""
+        path = PurePosixPath(relative_path)
+        return path.suffix in IGNORED_SUFFIXES or any(
+            part in IGNORED_NAMES for part in path.parts
+        )
+
+
+class DirectoryTemplateLoader(TemplateLoader):
+    """Load a template from a directory."""
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(os.path.abspath(directory))
+
+    @property
+    def key(self) -> tuple:
+        return ("directory", str(self.directory))
+
+    def load(self) -> dict[str, bytes]:
+        if not self.directory.is_dir():
+            raise FileNotFoundError(f"Template directory not found: {self.directory}")
+
+        files = {}
+        for root, dirs, file_names in os.walk(self.directory):
+            dirs[:] = [name for name in dirs if name not in IGNORED_NAMES]
+            for file_name in file_names:
+                absolute_path = Path(root, file_name)
+                relative_path = absolute_path.relative_to(self.directory).as_posix()
+                if not self.is_ignored(relative_path):
+                    files[relative_path] = absolute_path.read_bytes()
+        return files
+
+
+class ZipTemplateLoader(TemplateLoader):
+    """Load a template from a zip archive."""
+
+    def __init__(self, zip_path: Union[str, Path], root: Optional[str] = None):
+        """Constructor.
+
+        :param zip_path: path to the zip archive
+        :type zip_path: Union[str, Path]
+        :param root: folder of the archive containing the template. Defaults to None \
+        (the single top-level folder of the archive if any, else the archive root).
+        :type root: str, optional
+        """
+        self.zip_path = Path(os.path.abspath(zip_path))
+        self.root = root
+
+    @property
+    def key(self) -> tuple:
+        return ("zip", str(self.zip_path), self.root)
+
+    def load(self) -> dict[str, bytes]:
+        with zipfile.ZipFile(self.zip_path) as archive:
+            names = [name for name in archive.namelist() if not name.endswith("/")]
+
+            root = self.root
+            if root is None:
+                top_levels = {PurePosixPath(name).parts[0] for name in names}
+                single_folder = len(top_levels) == 1 and all(
+                    "/" in name for name in names
+                )
+                root = top_levels.pop() if single_folder else ""
+            prefix = f"{root.strip('/')}/" if root.strip("/") else ""
+
+            files = {}
+            for name in names:
+                if not name.startswith(prefix):
+                    continue
+                relative_path = name[len(prefix) :]
+                if not self.is_ignored(relative_path):
+                    files[relative_path] = archive.read(name)
+        return files
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def template_loader_for(
+    source: Union[str, Path, TemplateLoader],
+) -> TemplateLoader:
+    """Get the loader of a template source.
+
+    :param source: template directory, zip archive or loader
+    :type source: Union[str, Path, TemplateLoader]
+
+    :return: template loader
+    :rtype: TemplateLoader
+    """
+    if isinstance(source, TemplateLoader):
+        return source
+    if Path(source).suffix.lower() == ".zip":
+        return ZipTemplateLoader(source)
+    return DirectoryTemplateLoader(source)
+
+
+def get_template_bundle(source: Union[str, Path, TemplateLoader]) -> TemplateBundle:
+    """Get a template bundle. A template is loaded once per process: later calls \
+    return the cached bundle without reading the template source again.
+
+    :param source: template directory, zip archive or loader
+    :type source: Union[str, Path, TemplateLoader]
+
+    :return: template bundle
+    :rtype: TemplateBundle
+    """
+    loader = template_loader_for(source)
+
+    with _bundles_cache_lock:
+        bundle = _bundles_cache.get(loader.key)
+        if bundle is None:
+            bundle = TemplateBundle(loader.load())
+            _bundles_cache[loader.key] = bundle
+    return bundle
+
+
+def clear_template_bundles():
+    """Forget every loaded template bundle, so that templates are read again."""
+    with _bundles_cache_lock:
+        _bundles_cache.clear()
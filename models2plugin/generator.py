@@ -1,22 +1,100 @@
-import mimetypes
 import os
-import re
-import shutil
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Optional, Union
 
-from qgis.core import Qgis, QgsApplication
+from qgis.core import Qgis, QgsProcessingFeedback
 
 from models2plugin.__about__ import DIR_PLUGIN_ROOT
-from models2plugin.toolbelt import PlgLogger
+from models2plugin.core.file_copy import DEFAULT_COPY_STRATEGY
+from models2plugin.core.model_compiler import (
+    COMPILED_PACKAGE,
+    ModelCompilationError,
+    compile_model,
+    compiled_inputs_digest,
+    compiled_module_name,
+    dump_compiled_registry,
+)
+from models2plugin.core.model_dependencies import (
+    BundledModel,
+    resolve_model_dependencies,
+    rewrite_model_references,
+)
+from models2plugin.core.model_discovery import (
+    default_models_dir,
+    get_model_discovery_index,
+    model_roots,
+)
+from models2plugin.core.model_index import (
+    INDEX_FILE_NAME,
+    build_model_index,
+    dump_model_index,
+    index_inputs_digest,
+)
+from models2plugin.core.model_pack import (
+    PACK_FILE_NAME,
+    build_model_pack,
+    pack_inputs_digest,
+)
+from models2plugin.core.model_store import (
+    STORE_MANIFEST_FILE_NAME,
+    ModelStore,
+    dump_store_manifest,
+    store_manifest_inputs_digest,
+)
+from models2plugin.core.model_validation import (
+    ERROR,
+    ModelValidationError,
+    ValidationReport,
+    validate_models,
+)
+from models2plugin.core.plugin_output import (
+    OUTPUT_MODES,
+    DirectoryOutput,
+    PluginOutput,
+    ZipOutput,
+)
+from models2plugin.core.template_bundle import TemplateLoader, get_template_bundle
+from models2plugin.toolbelt import PlgLogger, PlgOptionsManager
+from models2plugin.toolbelt.env_var_parser import EnvVarParser
+from models2plugin.toolbelt.hashing import digest_bytes, digest_values
+from models2plugin.toolbelt.preferences import PREFIX_ENV_VARIABLE
+from models2plugin.toolbelt.profiler import Profiler
+from models2plugin.toolbelt.template_engine import compile_template
+from models2plugin.toolbelt.utils import to_snake_case
 
 plugin_template_dir = Path(
     DIR_PLUGIN_ROOT, "template/plugin"
 )  # Directory containing the plugin template files
 
+# environment variables enabling the profiling of the generation, and giving the
+# trace file (or the directory of the trace files, one per plugin)
+PROFILE_ENV_VARIABLE = f"{PREFIX_ENV_VARIABLE}PROFILE"
+PROFILE_TRACE_ENV_VARIABLE = f"{PREFIX_ENV_VARIABLE}PROFILE_TRACE"
 
 logger = PlgLogger()
 
 
+@dataclass
+class GenerationReport:
+    """Outputs of a plugin generation, as paths relative to the output directory."""
+
+    output_dir: Optional[Path]
+    written: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    # models added to the model store, by file name in the plugin
+    stored: list[str] = field(default_factory=list)
+    canceled: bool = False
+    validation: Optional[ValidationReport] = None
+    # time and bytes of each phase, when the generation is profiled
+    timings: Optional[dict] = None
+
+
+class GenerationCanceled(Exception):
+    """Raised when the feedback of a running generation is canceled."""
+
+
 # Render the template by replacing variables in the content
 def render_template(contenu, variables):
     """Function that replaces variables in the template content with their values.
@@ -27,61 +105,663 @@ def render_template(contenu, variables):
     Returns:
         str: The content with variables replaced by their values.
     """
-    for cle, valeur in variables.items():
-        contenu = re.sub(r"{{\s*" + re.escape(cle) + r"\s*}}", valeur, contenu)
-    return contenu
+    return compile_template(contenu).render(variables)
+
+
+def build_context(
+    plugin_name: str,
+    plugin_description: str = "Description",
+    author: str = "Author Name",
+    author_email: str = "Email",
+    plugin_version: str = "1.0.0",
+    qgis_minimum_version: str = "3.22",
+    result_cache_size_mb: int = 0,
+) -> dict:
+    """Build the variables used to render the plugin template.
+
+    Args:
+        plugin_name (str): The name of the generated plugin.
+        plugin_description (str): The description of the generated plugin.
+        author (str): The author name.
+        author_email (str): The author email.
+        plugin_version (str): The version of the generated plugin.
+        qgis_minimum_version (str): The minimum QGIS version of the generated plugin.
+        result_cache_size_mb (int): The maximum size of the cache of the model \
+            results of the generated plugin, in MB. 0 disables the cache.
+    Returns:
+        dict: The template context.
+    """
+    plugin_folder_name = to_snake_case(plugin_name)
+    # remove the _ to only have characters
+    plugin_provider_id = plugin_folder_name.replace("_", "")
+
+    return {
+        "plugin_name": plugin_name,
+        "plugin_folder_name": plugin_folder_name,
+        "plugin_provider_id": plugin_provider_id,
+        "qgis_minimum_version": qgis_minimum_version,
+        "plugin_description": plugin_description,
+        "about": plugin_description,
+        "plugin_version": plugin_version,
+        "author": author,
+        "author_email": author_email,
+        "result_cache_size_mb": int(result_cache_size_mb),
+    }
+
+
+def resolve_model_paths(models: list[str]) -> list[Path]:
+    """Get the paths of the models to include in the plugin.
+
+    Args:
+        models (list[str]): Each either a path to a .model3 file, or a path relative \
+            to a models folder, a file name or a model name, found through the \
+            model discovery index. The models folders are scanned once for all.
+    Returns:
+        list[Path]: The paths of the model files, in the same order.
+    """
+    relative_models = [model for model in models if not Path(model).is_absolute()]
+    found = (
+        get_model_discovery_index().resolve_all(relative_models, model_roots())
+        if relative_models
+        else {}
+    )
+    return [
+        Path(model)
+        if Path(model).is_absolute()
+        else found[model] or default_models_dir() / model
+        for model in models
+    ]
+
+
+def resolve_models(models_to_include: list[str]) -> list[BundledModel]:
+    """Resolve the models to bundle into the plugin, with the models they run.
+
+    Args:
+        models_to_include (list[str]): The models selected for the plugin, as \
+            accepted by resolve_model_paths. Missing ones are skipped with an error \
+            message.
+    Returns:
+        list[BundledModel]: The models to bundle, each content once.
+    Raises:
+        ModelDependencyError: If a model runs a model which can't be found.
+        ModelNameConflictError: If models with different contents have the same \
+            name.
+    """
+    model_paths = []
+    for model_to_include, model_path in zip(
+        models_to_include, resolve_model_paths(models_to_include)
+    ):
+        if model_path.exists():
+            model_paths.append(model_path)
+        else:
+            logger.log(
+                f"Model file {model_to_include} does not exist and will not be copied.",
+                log_level=Qgis.MessageLevel.Critical,
+            )
+
+    models = resolve_model_dependencies(model_paths)
+    # models parsed for the resolution are kept for the next generations
+    get_model_discovery_index().save()
+
+    for model in models:
+        if model.source in model_paths:
+            continue
+        logger.log(
+            f"Model {model.name} ({model.source}) is bundled as a dependency.",
+            log_level=Qgis.MessageLevel.Info,
+        )
+    return models
+
+
+def validate_bundled_models(
+    models: list[BundledModel], strict: bool = False
+) -> ValidationReport:
+    """Validate the models to bundle, in parallel, logging their issues.
+
+    Args:
+        models (list[BundledModel]): The models to bundle.
+        strict (bool): Raise an error if a model has an error.
+    Returns:
+        ValidationReport: The issues of each model.
+    Raises:
+        ModelValidationError: In strict mode, if a model has an error.
+    """
+    validation = validate_models(models)
+    for model in validation.models:
+        for issue in model.issues:
+            logger.log(
+                f"Model {model.file_name}: {issue.message}"
+                + (f" (child algorithm {issue.child_id})" if issue.child_id else ""),
+                log_level=Qgis.MessageLevel.Critical
+                if issue.severity == ERROR
+                else Qgis.MessageLevel.Warning,
+            )
+
+    if strict and not validation.ok:
+        raise ModelValidationError(validation)
+    return validation
+
+
+def profiling_enabled() -> bool:
+    """Tell if generations are profiled by default: in debug mode, or if the \
+    QGIS_MODELS2PLUGIN_PROFILE environment variable is true.
+
+    Returns:
+        bool: True if generations are profiled.
+    """
+    return PlgOptionsManager.get_debug_mode() or EnvVarParser.get_env_var(
+        PROFILE_ENV_VARIABLE, False
+    )
 
 
-def generate(plugin_output_dir, context, models_to_include: list[str] = []):
+def _trace_file(trace_path: Union[str, Path], context: dict) -> Path:
+    """Get the trace file of a generation: the given path, or a file named after \
+    the plugin if it is an existing directory."""
+    trace_path = Path(trace_path)
+    if trace_path.is_dir():
+        return trace_path / f"{context['plugin_folder_name']}.trace.json"
+    return trace_path
 
-    plugin_output_dir: Path = Path(plugin_output_dir)
-    plugin_output_dir.mkdir(parents=True, exist_ok=True)
 
-    """Generate a QGIS plugin from a template by replacing variables in the template files."""
-    # Walking through the source template dir
-    for root, _, files in os.walk(plugin_template_dir):
-        for file_name in files:
-            absolute_path = os.path.join(root, file_name)
-            relative_path = os.path.relpath(absolute_path, plugin_template_dir)
-            destination_file = os.path.join(plugin_output_dir, relative_path)
+def generate(
+    plugin_output_dir,
+    context,
+    models_to_include: list[str] = [],
+    force: bool = False,
+    template_source: Optional[Union[str, Path, TemplateLoader]] = None,
+    output_mode: str = "directory",
+    copy_strategy: str = DEFAULT_COPY_STRATEGY,
+    model_store: Optional[Union[str, Path]] = None,
+    compile_models: bool = False,
+    pack_models: bool = False,
+    feedback: Optional[QgsProcessingFeedback] = None,
+    validate: bool = True,
+    strict: bool = False,
+    profile: Optional[bool] = None,
+    trace_path: Optional[Union[str, Path]] = None,
+) -> GenerationReport:
+    """Generate a QGIS plugin from a template by replacing variables in the template files.
 
-            # Ensure the destination directory exists
-            os.makedirs(os.path.dirname(destination_file), exist_ok=True)
+    In directory mode, outputs whose inputs (template file, used variables, model
+    content) did not change since the previous generation into the same directory are
+    left untouched, and outputs no longer produced are deleted. In zip mode, files are
+    streamed into the archive, under the plugin folder, without any intermediate file.
+
+    Models run by the included models are bundled too, and run from the plugin. They
+    are resolved before anything is written: a ModelDependencyError is raised if one
+    can't be found, a ModelNameConflictError if different models have the same name.
+
+    If the feedback is canceled, the generation stops after the file being written.
+    A directory output is left consistent (every file is either complete from this
+    generation or from the previous one, and recorded as such) and a zip archive
+    written to a path is left as generated previously.
+
+    Args:
+        plugin_output_dir (str | Path | ZipFile | BinaryIO): The directory where the \
+            plugin is generated or, in zip mode, the zip file path, an opened \
+            ZipFile or a writable binary stream.
+        context (dict): The variables used to render the template.
+        models_to_include (list[str]): The models to copy into the plugin.
+        force (bool): Rewrite every output, even unchanged ones.
+        template_source (str | Path | TemplateLoader): The plugin template, as a \
+            directory, a zip archive or a custom loader. Defaults to the template \
+            shipped with Models2plugin.
+        output_mode (str): "directory" or "zip".
+        copy_strategy (str): In directory mode, how model files are copied: \
+            "hardlink" (no byte copied, but the plugin and the source then share \
+            the file), "clone" (reflink or kernel copy) or "buffered". Unsupported \
+            methods fall back to the next ones.
+        model_store (str | Path): In directory mode, a content-addressed store \
+            shared by several plugins, where each distinct model is written once. \
+            The models folder of the plugin then only holds a manifest of its \
+            models, resolved in the store by the generated provider: the plugin \
+            only works while the store is reachable at the same relative (or, on \
+            another drive, absolute) location.
+        compile_models (bool): Also export each model as a Python \
+            QgsProcessingAlgorithm, in a module of the compiled package of the \
+            plugin, registered by the provider instead of interpreting the model. \
+            Models which can't be exported are interpreted, as without this option.
+        pack_models (bool): Bundle the models into a single compressed file, \
+            models/models.pack, read with one file opening by the generated \
+            provider, instead of one .model3 file per model. Not compatible with \
+            a model store.
+        feedback (QgsProcessingFeedback): Receives the progress and a message per \
+            file, and tells if the generation is canceled.
+        validate (bool): Load the bundled models and check their child algorithms \
+            and parameters before writing anything. Issues are logged and stored \
+            in the report.
+        strict (bool): Raise a ModelValidationError, before writing anything, if a \
+            bundled model has an error.
+        profile (bool): Measure the time and bytes of each phase (model lookup, \
+            validation, template walk, render, write, copy, index), log a summary \
+            and store it in the report. Defaults to profiling_enabled().
+        trace_path (str | Path): Trace file in the Chrome trace event format, \
+            written when profiling. An existing directory receives a file named \
+            after the plugin. Defaults to the QGIS_MODELS2PLUGIN_PROFILE_TRACE \
+            environment variable, no trace if not set.
+    Returns:
+        GenerationReport: The outputs written, left unchanged and removed.
+    """
+    profiler = Profiler(enabled=profiling_enabled() if profile is None else profile)
+    if trace_path is None:
+        trace_path = EnvVarParser.get_env_var(PROFILE_TRACE_ENV_VARIABLE, "") or None
 
-            mime_type, _ = mimetypes.guess_type(absolute_path)
-            # Check if the file is an image
-            if mime_type and mime_type.startswith("image/"):
-                # In that case, we just copy the file
-                shutil.copyfile(absolute_path, destination_file)
+    # log records of the run are sent in batches, repeated messages being coalesced
+    with PlgLogger.buffered():
+        try:
+            report = _generate(
+                plugin_output_dir,
+                context,
+                models_to_include=models_to_include,
+                force=force,
+                template_source=template_source,
+                output_mode=output_mode,
+                copy_strategy=copy_strategy,
+                model_store=model_store,
+                compile_models=compile_models,
+                pack_models=pack_models,
+                feedback=feedback,
+                validate=validate,
+                strict=strict,
+                profiler=profiler,
+            )
+            if profiler.enabled:
+                report.timings = profiler.to_dict()
+            return report
+        finally:
+            if profiler.enabled:
+                _report_profile(profiler, context, trace_path)
+
+
+def _report_profile(
+    profiler: Profiler, context: dict, trace_path: Optional[Union[str, Path]]
+):
+    """Log the summary of a profiled generation and write its trace file."""
+    logger.log(
+        f"Generation profile of {context['plugin_name']}:\n"
+        + "\n".join(profiler.summary()),
+        log_level=Qgis.MessageLevel.Info,
+    )
+    if trace_path:
+        trace_file = _trace_file(trace_path, context)
+        try:
+            profiler.dump_chrome_trace(trace_file)
+        except OSError as exc:
+            logger.log(
+                f"Unable to write the generation trace {trace_file}: {exc}",
+                log_level=Qgis.MessageLevel.Warning,
+            )
+
+
+def _generate(
+    plugin_output_dir,
+    context,
+    models_to_include: list[str],
+    force: bool,
+    template_source: Optional[Union[str, Path, TemplateLoader]],
+    output_mode: str,
+    copy_strategy: str,
+    model_store: Optional[Union[str, Path]],
+    compile_models: bool,
+    pack_models: bool,
+    feedback: Optional[QgsProcessingFeedback],
+    validate: bool,
+    strict: bool,
+    profiler: Profiler,
+) -> GenerationReport:
+    """Generate the plugin, see generate."""
+    if model_store is not None and output_mode != "directory":
+        raise ValueError("A model store can only be used in directory mode.")
+    if model_store is not None and pack_models:
+        raise ValueError("Models can't be both packed and kept in a model store.")
+
+    # models with the models they run, resolved and checked before anything is written
+    with profiler.phase("model lookup"):
+        models = resolve_models(models_to_include)
+    validation = None
+    if validate:
+        with profiler.phase("validation"):
+            validation = validate_bundled_models(models, strict=strict)
+
+    if output_mode == "directory":
+        output = DirectoryOutput(plugin_output_dir, copy_strategy=copy_strategy)
+        report = GenerationReport(output_dir=Path(plugin_output_dir))
+    elif output_mode == "zip":
+        output = ZipOutput(plugin_output_dir, root_folder=context["plugin_folder_name"])
+        report = GenerationReport(
+            output_dir=Path(plugin_output_dir)
+            if isinstance(plugin_output_dir, (str, os.PathLike))
+            else None
+        )
+    else:
+        raise ValueError(
+            f"Unknown output mode: {output_mode}. Must be one of: "
+            f"{', '.join(OUTPUT_MODES)}"
+        )
+    report.validation = validation
+    store = (
+        ModelStore(model_store, copy_strategy=copy_strategy)
+        if model_store is not None
+        else None
+    )
+
+    try:
+        _write_plugin(
+            output,
+            report,
+            context,
+            models=models,
+            force=force,
+            template_source=template_source,
+            store=store,
+            compile_models=compile_models,
+            pack_models=pack_models,
+            feedback=feedback,
+            profiler=profiler,
+        )
+    except GenerationCanceled:
+        output.abort()
+        report.canceled = True
+        logger.log("Plugin generation canceled.", log_level=Qgis.MessageLevel.Warning)
+        return report
+    except BaseException:
+        output.abort()
+        raise
+
+    with profiler.phase("close"):
+        report.removed = output.close()
+
+    if isinstance(output, DirectoryOutput) and output.copy_methods:
+        logger.log(
+            "Files copied by method: "
+            + ", ".join(
+                f"{method} {count}" for method, count in output.copy_methods.items()
+            ),
+            log_level=4,
+        )
+
+    return report
+
+
+def _write_plugin(
+    output: PluginOutput,
+    report: GenerationReport,
+    context: dict,
+    models: list[BundledModel],
+    force: bool,
+    template_source: Optional[Union[str, Path, TemplateLoader]],
+    store: Optional[ModelStore],
+    compile_models: bool,
+    pack_models: bool,
+    feedback: Optional[QgsProcessingFeedback],
+    profiler: Profiler,
+):
+    """Write the plugin files into an output, filling the report.
+
+    Raises:
+        GenerationCanceled: If the feedback is canceled.
+    """
+    with profiler.phase("template walk"):
+        bundle = get_template_bundle(template_source or plugin_template_dir)
+    output.record_inputs(bundle.digest, digest_values(*sorted(context.items())))
+    # one step per template file, per model, for the models index, the models pack,
+    # the manifest of the models kept in the store and the registry of the compiled
+    # models
+    steps_count = (
+        len(bundle)
+        + len(models)
+        + 1
+        + pack_models
+        + (store is not None)
+        + compile_models
+    )
+    step = 0
+
+    for entry in bundle:
+        _start_step(feedback, step, steps_count, entry.relative_path)
+        step += 1
+
+        with profiler.phase("template walk"):
+            if entry.is_binary:
+                # binary files (images) are copied as is
+                inputs_digest = entry.digest
             else:
-                # Otherwise, we assume it's a text file and generate the content using the template
-                with open(absolute_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                rendered_content = render_template(content, context)
+                # text files are rendered, depending on the variables they use
+                inputs_digest = digest_values(
+                    entry.digest,
+                    *sorted(
+                        (name, context[name])
+                        for name in entry.template.variables
+                        if name in context
+                    ),
+                )
 
-                # Write the rendered content to the destination file
-                with open(destination_file, "w", encoding="utf-8") as f:
-                    f.write(rendered_content)
+            up_to_date = not force and output.is_up_to_date(
+                entry.relative_path, inputs_digest
+            )
+            if up_to_date:
+                output.keep(entry.relative_path, inputs_digest)
+        if up_to_date:
+            report.unchanged.append(entry.relative_path)
+            continue
+
+        if entry.is_binary:
+            content = entry.content
+        else:
+            with profiler.phase("render") as record:
+                content = entry.template.render(context).encode("utf-8")
+                record.add_bytes(len(content))
 
-    plutin_output_models_dir = plugin_output_dir / "models"
-    os.makedirs(plutin_output_models_dir, exist_ok=True)
+        with profiler.phase("write") as record:
+            output.write_bytes(entry.relative_path, content, inputs_digest)
+            record.add_bytes(len(content))
+        report.written.append(entry.relative_path)
+
+    output.make_dir("models")
+    # (file name in the plugin, source path, digest) of the bundled models
+    bundled_models = []
+    # (model, rewritten content if any, digest) of the models to pack
+    packed_models = []
+    # digests of the models kept in the store, by file name in the plugin
+    stored_models = {}
+    # (module name, model digest) of the compiled models, by file name in the plugin
+    compiled_models = {}
+    compiled_module_names = set()
+
+    for model in models:
+        relative_path = f"models/{model.file_name}"
+        _start_step(feedback, step, steps_count, relative_path)
+        step += 1
 
-    for model_to_include in models_to_include:
         logger.log(
-            f"Processing model: {model_to_include}", log_level=Qgis.MessageLevel.Info
+            f"Processing model: {model.source}", log_level=Qgis.MessageLevel.Info
         )
 
-        models_dir = os.path.join(
-            QgsApplication.qgisSettingsDirPath(), "processing", "models"
+        with profiler.phase("copy") as record:
+            content = None
+            inputs_digest = model.sha256
+            if model.dependencies:
+                # the models it runs are run from the plugin provider
+                content = rewrite_model_references(
+                    model.source.read_bytes(), context["plugin_provider_id"]
+                )
+                inputs_digest = digest_bytes(content)
+
+            if pack_models:
+                # packed at the end, models being read only if the pack changed
+                packed_models.append((model, content, inputs_digest))
+            elif store is not None:
+                # written once for every plugin sharing the store
+                if content is not None:
+                    added = store.add_bytes(content, inputs_digest)
+                else:
+                    added = store.add_file(model.source, inputs_digest)
+                if added:
+                    report.stored.append(model.file_name)
+                    record.add_bytes(len(content) if content else model.size)
+                stored_models[model.file_name] = inputs_digest
+            elif not force and output.is_up_to_date(relative_path, inputs_digest):
+                output.keep(relative_path, inputs_digest)
+                report.unchanged.append(relative_path)
+            elif content is not None:
+                output.write_bytes(relative_path, content, inputs_digest)
+                report.written.append(relative_path)
+                record.add_bytes(len(content))
+            else:
+                output.copy_file(relative_path, model.source, inputs_digest)
+                report.written.append(relative_path)
+                record.add_bytes(model.size)
+        bundled_models.append((model.file_name, model.source, inputs_digest))
+
+        if compile_models:
+            module_name = compiled_module_name(model.file_name, compiled_module_names)
+            if _compile_model(
+                output,
+                report,
+                model,
+                content,
+                f"{COMPILED_PACKAGE}/{module_name}.py",
+                compiled_inputs_digest(inputs_digest),
+                force,
+                profiler,
+            ):
+                compiled_models[model.file_name] = (module_name, inputs_digest)
+
+    if compile_models:
+        # compiled models registered by the generated provider
+        relative_path = f"{COMPILED_PACKAGE}/__init__.py"
+        _start_step(feedback, step, steps_count, relative_path)
+        step += 1
+        content = dump_compiled_registry(compiled_models)
+        inputs_digest = digest_bytes(content)
+        if not force and output.is_up_to_date(relative_path, inputs_digest):
+            output.keep(relative_path, inputs_digest)
+            report.unchanged.append(relative_path)
+        else:
+            output.write_bytes(relative_path, content, inputs_digest)
+            report.written.append(relative_path)
+
+    if pack_models:
+        relative_path = f"models/{PACK_FILE_NAME}"
+        _start_step(feedback, step, steps_count, relative_path)
+        step += 1
+        inputs_digest = pack_inputs_digest(
+            [(model.file_name, digest) for model, _, digest in packed_models]
         )
+        if not force and output.is_up_to_date(relative_path, inputs_digest):
+            output.keep(relative_path, inputs_digest)
+            report.unchanged.append(relative_path)
+        else:
+            with profiler.phase("pack") as record:
+                pack = build_model_pack(
+                    [
+                        (
+                            model.file_name,
+                            content
+                            if content is not None
+                            else model.source.read_bytes(),
+                            digest,
+                        )
+                        for model, content, digest in packed_models
+                    ]
+                )
+                output.write_bytes(relative_path, pack, inputs_digest)
+                record.add_bytes(len(pack))
+            report.written.append(relative_path)
 
-        model_path = Path(models_dir, model_to_include)
+    if store is not None:
+        # models resolved in the store by the generated provider
+        relative_path = f"models/{STORE_MANIFEST_FILE_NAME}"
+        _start_step(feedback, step, steps_count, relative_path)
+        step += 1
+        location = store.relative_location(output.directory / "models")
+        inputs_digest = store_manifest_inputs_digest(location, stored_models)
+        if not force and output.is_up_to_date(relative_path, inputs_digest):
+            output.keep(relative_path, inputs_digest)
+            report.unchanged.append(relative_path)
+        else:
+            output.write_bytes(
+                relative_path,
+                dump_store_manifest(location, stored_models),
+                inputs_digest,
+            )
+            report.written.append(relative_path)
 
-        if model_path.exists():
-            # Copy the model file to the plugin output directory
-            shutil.copy(model_path, plutin_output_models_dir / model_path.name)
+    # index of the models, read by the generated provider to list its algorithms
+    relative_path = f"models/{INDEX_FILE_NAME}"
+    _start_step(feedback, step, steps_count, relative_path)
+    with profiler.phase("index") as record:
+        inputs_digest = index_inputs_digest(bundled_models)
+        if not force and output.is_up_to_date(relative_path, inputs_digest):
+            output.keep(relative_path, inputs_digest)
+            report.unchanged.append(relative_path)
         else:
+            index = build_model_index(bundled_models)
+            for entry in index["models"]:
+                if "error" in entry:
+                    logger.log(
+                        f"Model {entry['file']} can't be loaded by QGIS: "
+                        f"{entry['error']}",
+                        log_level=Qgis.MessageLevel.Warning,
+                    )
+            content = dump_model_index(index)
+            output.write_bytes(relative_path, content, inputs_digest)
+            report.written.append(relative_path)
+            record.add_bytes(len(content))
+
+    if feedback is not None:
+        feedback.setProgress(100)
+
+
+def _compile_model(
+    output: PluginOutput,
+    report: GenerationReport,
+    model: BundledModel,
+    content: Optional[bytes],
+    relative_path: str,
+    inputs_digest: str,
+    force: bool,
+    profiler: Profiler,
+) -> bool:
+    """Write the module of a model compiled to Python, unless it is up to date.
+
+    Args:
+        content (bytes): The model content bundled into the plugin, if it differs \
+            from the source one.
+    Returns:
+        bool: False if the model can't be compiled, the error being logged.
+    """
+    if not force and output.is_up_to_date(relative_path, inputs_digest):
+        output.keep(relative_path, inputs_digest)
+        report.unchanged.append(relative_path)
+        return True
+
+    with profiler.phase("compile") as record:
+        try:
+            source = compile_model(model.source, content).encode("utf-8")
+        except ModelCompilationError as exc:
             logger.log(
-                f"Model file {model_to_include} does not exist and will not be copied.",
-                log_level=Qgis.MessageLevel.Critical,
+                f"{exc}. It will be interpreted from its .model3 file.",
+                log_level=Qgis.MessageLevel.Warning,
             )
+            return False
+        output.write_bytes(relative_path, source, inputs_digest)
+        report.written.append(relative_path)
+        record.add_bytes(len(source))
+    return True
+
+
+def _start_step(
+    feedback: Optional[QgsProcessingFeedback], step: int, steps_count: int, name: str
+):
+    """Report the file about to be generated, unless the generation is canceled.
+
+    Raises:
+        GenerationCanceled: If the feedback is canceled.
+    """
+    if feedback is None:
+        return
+    if feedback.isCanceled():
+        raise GenerationCanceled()
+    feedback.setProgress(100 * step / steps_count)
+    feedback.pushInfo(name)
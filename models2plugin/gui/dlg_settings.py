@@ -32,9 +32,8 @@ from models2plugin.toolbelt.preferences import PlgSettingsStructure
 # ########## Globals ###############
 # ##################################
 
-FORM_CLASS, _ = uic.loadUiType(
-    Path(__file__).parent / "{}.ui".format(Path(__file__).stem)
-)
+# parsed when the options page is created, not when the module is imported
+UI_PATH: Path = Path(__file__).parent / "{}.ui".format(Path(__file__).stem)
 
 
 # ############################################################################
@@ -42,7 +41,7 @@ FORM_CLASS, _ = uic.loadUiType(
 # ##################################
 
 
-class ConfigOptionsPage(FORM_CLASS, QgsOptionsPageWidget):
+class ConfigOptionsPage(QgsOptionsPageWidget):
     """Settings form embedded into QGIS 'options' menu."""
 
     def __init__(self, parent):
@@ -51,7 +50,7 @@ class ConfigOptionsPage(FORM_CLASS, QgsOptionsPageWidget):
         self.plg_settings = PlgOptionsManager()
 
         # load UI and set objectName
-        self.setupUi(self)
+        uic.loadUi(UI_PATH, self)
         self.setObjectName("mOptionsPage{}".format(__title__))
 
         report_context_message = quote(
@@ -103,6 +102,9 @@ class ConfigOptionsPage(FORM_CLASS, QgsOptionsPageWidget):
         settings.debug_mode = self.opt_debug.isChecked()
         settings.version = __version__
 
+        # models
+        settings.models_folders = self.opt_models_folders.text().strip()
+
         # dump new settings into QgsSettings
         self.plg_settings.save_from_object(settings)
 
@@ -114,12 +116,17 @@ class ConfigOptionsPage(FORM_CLASS, QgsOptionsPageWidget):
 
     def load_settings(self):
         """Load options from QgsSettings into UI form."""
+        # settings may have been modified outside of the plugin since cached
+        self.plg_settings.invalidate_cache()
         settings = self.plg_settings.get_plg_settings()
 
         # global
         self.opt_debug.setChecked(settings.debug_mode)
         self.lbl_version_saved_value.setText(settings.version)
 
+        # models
+        self.opt_models_folders.setText(settings.models_folders)
+
     def reset_settings(self):
         """Reset settings to default values (set in preferences.py module)."""
         default_settings = PlgSettingsStructure()
@@ -1,27 +1,26 @@
-import os
 from pathlib import Path
 
 from qgis.core import (
-    QgsApplication,
     QgsExpression,
     QgsExpressionContext,
     QgsExpressionContextUtils,
 )
 from qgis.gui import QgsFileWidget
 from qgis.PyQt import QtWidgets, uic
+from qgis.PyQt.QtCore import Qt
 
 from models2plugin.__about__ import DIR_PLUGIN_ROOT
+from models2plugin.core.model_catalog import ModelCatalog
 from models2plugin.toolbelt.utils import get_text_content, to_snake_case
 
-FORM_CLASS, _ = uic.loadUiType(
-    Path(__file__).parent / "{}.ui".format(Path(__file__).stem)
-)
+# parsed when the dialog is created, not when the module is imported
+UI_PATH = Path(__file__).parent / "{}.ui".format(Path(__file__).stem)
 
 
-class MainDialog(QtWidgets.QDialog, FORM_CLASS):
+class MainDialog(QtWidgets.QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setupUi(self)
+        uic.loadUi(UI_PATH, self)
 
         self.authorLineEdit.setText(self.current_qgis_user())
         self.outputDirectoryFileWidget.setStorageMode(
@@ -34,9 +33,11 @@ class MainDialog(QtWidgets.QDialog, FORM_CLASS):
 
         self.display_page(0)
 
-        # display the models in the model list widget
-        for model_file in self.modelListFileName():
-            self.modelListWidget.addItem(model_file)
+        # display the models in the model list widget, listed in the background and
+        # updated when the models folders change
+        self.model_catalog = ModelCatalog(parent=self)
+        self.model_catalog.modelsChanged.connect(self.populate_model_list)
+        self.model_catalog.refresh()
 
         self.pluginNameLineEdit.editingFinished.connect(
             self.updateOutputDirectoryFileSlot
@@ -75,17 +76,42 @@ class MainDialog(QtWidgets.QDialog, FORM_CLASS):
         expression = QgsExpression("@user_full_name")
         return expression.evaluate(context)
 
-    def modelListFileName(self):
-        models_dir = os.path.join(
-            QgsApplication.qgisSettingsDirPath(), "processing", "models"
-        )
-
+    def populate_model_list(self):
+        """Fill the model list widget from the catalog, keeping the selection."""
+        selected_paths = set(self.selected_model_paths())
+
+        self.modelListWidget.clear()
+        for entry in self.model_catalog.entries():
+            item = QtWidgets.QListWidgetItem(entry.label)
+            item.setData(Qt.ItemDataRole.UserRole, str(entry.path))
+            tooltip = str(entry.path)
+            if entry.error:
+                tooltip += f"\n\n{entry.error}"
+            elif entry.description:
+                tooltip += f"\n\n{entry.description}"
+            item.setToolTip(tooltip)
+            self.modelListWidget.addItem(item)
+            item.setSelected(str(entry.path) in selected_paths)
+
+    def selected_model_paths(self) -> list[str]:
+        """Paths of the models selected in the model list widget."""
         return [
-            filename
-            for filename in os.listdir(models_dir)
-            if filename.endswith(".model3")
+            item.data(Qt.ItemDataRole.UserRole)
+            for item in self.modelListWidget.selectedItems()
         ]
 
+    def set_generation_running(self, running: bool):
+        """Enable the widgets matching the state of the generation.
+
+        :param running: True when a generation starts, False when it ends
+        :type running: bool
+        """
+        self.generatePushButton.setEnabled(not running)
+        self.cancelPushButton.setEnabled(running)
+        if running:
+            self.generationProgressBar.setValue(0)
+            self.informationTextBrowser.clear()
+
     def updateOutputDirectoryFileSlot(self):
         """Update the output directory based on the plugin name."""
 
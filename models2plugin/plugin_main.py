@@ -7,9 +7,11 @@ import os
 # standard
 from functools import partial
 from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Optional
 
 # PyQGIS
-from qgis.core import QgsApplication, QgsSettings
+from qgis.core import Qgis, QgsApplication, QgsSettings
 from qgis.gui import QgisInterface
 from qgis.PyQt.QtCore import QCoreApplication, QLocale, QTranslator, QUrl
 from qgis.PyQt.QtGui import QDesktopServices, QIcon
@@ -23,11 +25,12 @@ from models2plugin.__about__ import (
     __uri_homepage__,
 )
 from models2plugin.gui.dlg_settings import PlgOptionsFactory
-from models2plugin.gui.main_dlg import MainDialog
 from models2plugin.toolbelt import PlgLogger
-from models2plugin.toolbelt.utils import get_text_content, to_snake_case
+from models2plugin.toolbelt.utils import get_text_content
 
-from .generator import generate
+if TYPE_CHECKING:
+    from models2plugin.core.generation_task import GenerationTask
+    from models2plugin.gui.main_dlg import MainDialog
 
 # ############################################################################
 # ########## Classes ###############
@@ -44,8 +47,13 @@ class Models2PluginPlugin:
         """
         self.iface = iface
         self.log = PlgLogger().log
+        # records of the standard loggers of the plugin modules
+        PlgLogger.attach_to_logger()
 
         self.actions: list[QAction] = []
+        self.generation_task: Optional["GenerationTask"] = None
+        # built on first use, most sessions never open it
+        self.main_dlg: Optional["MainDialog"] = None
 
         # translation
         # initialize the locale
@@ -66,6 +74,7 @@ class Models2PluginPlugin:
 
     def initGui(self):
         """Set up plugin UI elements."""
+        start = perf_counter()
 
         # settings page within the QGIS preferences menu
         self.options_factory = PlgOptionsFactory()
@@ -92,11 +101,7 @@ class Models2PluginPlugin:
             )
         )
 
-        # Main Dialog
-        self.main_dlg = MainDialog()
-
-        self.main_dlg.generatePushButton.clicked.connect(self.generate_slot)
-
+        # Main Dialog, built when the action is triggered for the first time
         main_dlg_icon_path = os.path.join(DIR_PLUGIN_ROOT, "resources/images/icon.png")
 
         self.action_main_dialog = QAction(
@@ -105,7 +110,7 @@ class Models2PluginPlugin:
             self.iface.mainWindow(),
         )
 
-        self.action_main_dialog.triggered.connect(lambda: self.main_dlg.show())
+        self.action_main_dialog.triggered.connect(self.show_main_dialog)
 
         self.iface.addToolBarIcon(self.action_main_dialog)
 
@@ -132,6 +137,29 @@ class Models2PluginPlugin:
             self.action_help_plugin_menu_documentation
         )
 
+        self.log(
+            message=f"GUI set up in {(perf_counter() - start) * 1000:.1f} ms",
+            log_level=4,
+        )
+
+    def show_main_dialog(self):
+        """Show the main dialog, building it on first call: its UI file is parsed \
+        and the models are listed at that time only."""
+        if self.main_dlg is None:
+            start = perf_counter()
+            from models2plugin.gui.main_dlg import MainDialog
+
+            self.main_dlg = MainDialog(self.iface.mainWindow())
+            self.main_dlg.generatePushButton.clicked.connect(self.generate_slot)
+            self.main_dlg.cancelPushButton.clicked.connect(self.cancel_generation_slot)
+            self.log(
+                message="Main dialog built in "
+                f"{(perf_counter() - start) * 1000:.1f} ms",
+                log_level=4,
+            )
+
+        self.main_dlg.show()
+
     def tr(self, message: str) -> str:
         """Get the translation for a string using Qt translation API.
 
@@ -166,36 +194,102 @@ class Models2PluginPlugin:
             self.iface.removeToolBarIcon(action)
             self.iface.removePluginMenu(__title__, action)
 
+        if self.generation_task is not None:
+            # the task ends after the dialog is deleted: its outcome is not displayed
+            task = self.generation_task
+            for signal in (
+                task.taskCompleted,
+                task.taskTerminated,
+                task.progressChanged,
+                task.feedback.infoPushed,
+            ):
+                try:
+                    signal.disconnect()
+                except TypeError:
+                    # nothing connected
+                    pass
+            task.cancel()
+            self.generation_task = None
+
+        if self.main_dlg is not None:
+            self.main_dlg.close()
+            self.main_dlg.deleteLater()
+            self.main_dlg = None
+
+        PlgLogger.flush_buffer()
+        PlgLogger.detach_from_logger()
+
     def generate_slot(self):
-        plugin_name = get_text_content(self.main_dlg.pluginNameLineEdit, "MyPlugin")
+        # the generator and its dependencies are only imported when generating
+        from models2plugin.core.generation_task import GenerationTask
+        from models2plugin.generator import build_context
 
         plugin_output_directory = self.main_dlg.outputDirectoryFileWidget.filePath()
 
-        plugin_folder_name = to_snake_case(plugin_name)
-        plugin_provider_id = to_snake_case(plugin_name)
-        # remove the _ to only have characters
-        plugin_provider_id = plugin_provider_id.replace("_", "")
-
-        context = {  # to be configure by user
-            "plugin_name": plugin_name,
-            "plugin_folder_name": plugin_folder_name,
-            "plugin_provider_id": plugin_provider_id,
-            "qgis_minimum_version": "3.22",  # TODO make it configurable
-            "plugin_description": get_text_content(
-                self.main_dlg.descriptionTextEdit, "Description"
-            ),
-            "about": get_text_content(self.main_dlg.descriptionTextEdit, "Description"),
-            "plugin_version": "1.0.0",  # TODO make it configurable
-            "author": get_text_content(self.main_dlg.authorLineEdit, "Author Name"),
-            "author_email": get_text_content(self.main_dlg.emailLineEdit, "Email"),
-        }
-
-        models_to_include = [
-            item.text() for item in self.main_dlg.modelListWidget.selectedItems()
-        ]
+        description = get_text_content(self.main_dlg.descriptionTextEdit, "Description")
+        context = build_context(
+            plugin_name=get_text_content(self.main_dlg.pluginNameLineEdit, "MyPlugin"),
+            plugin_description=description,
+            author=get_text_content(self.main_dlg.authorLineEdit, "Author Name"),
+            author_email=get_text_content(self.main_dlg.emailLineEdit, "Email"),
+        )
 
-        generate(plugin_output_directory, context, models_to_include=models_to_include)
+        models_to_include = self.main_dlg.selected_model_paths()
 
-        self.main_dlg.informationTextBrowser.setText(
-            f"Plugin generated at {plugin_output_directory}"
+        # generated in a background task, so that QGIS stays responsive
+        task = GenerationTask(
+            plugin_output_directory, context, models_to_include=models_to_include
         )
+        task.feedback.infoPushed.connect(self.main_dlg.informationTextBrowser.append)
+        task.progressChanged.connect(
+            lambda progress: self.main_dlg.generationProgressBar.setValue(int(progress))
+        )
+        task.taskCompleted.connect(partial(self.generation_finished_slot, task))
+        task.taskTerminated.connect(partial(self.generation_finished_slot, task))
+
+        self.generation_task = task
+        self.main_dlg.set_generation_running(True)
+        QgsApplication.taskManager().addTask(task)
+
+    def cancel_generation_slot(self):
+        """Cancel the running generation. Files already written are kept."""
+        if self.generation_task is not None:
+            self.generation_task.cancel()
+
+    def generation_finished_slot(self, task: "GenerationTask"):
+        """Display the outcome of a generation task.
+
+        :param task: finished task
+        :type task: GenerationTask
+        """
+        if task is self.generation_task:
+            self.generation_task = None
+        if self.main_dlg is None:
+            # plugin unloaded meanwhile
+            return
+        self.main_dlg.set_generation_running(False)
+
+        browser = self.main_dlg.informationTextBrowser
+        report = task.report
+        if task.exception is not None:
+            browser.append(f"Plugin generation failed: {task.exception}")
+            self.log(
+                message=f"Plugin generation failed: {task.exception}",
+                log_level=Qgis.MessageLevel.Critical,
+                push=True,
+            )
+        elif report is None or report.canceled:
+            browser.append(
+                "Plugin generation canceled. Files already written are kept, the "
+                "other ones are left as generated previously."
+            )
+        else:
+            if report.validation is not None:
+                for line in report.validation.summary():
+                    browser.append(line)
+            self.main_dlg.generationProgressBar.setValue(100)
+            browser.append(
+                f"Plugin generated at {task.plugin_output_dir} "
+                f"({len(report.written)} written, {len(report.unchanged)} unchanged, "
+                f"{len(report.removed)} removed)"
+            )
@@ -0,0 +1,125 @@
+from typing import Optional
+
+from qgis.core import (
+    QgsApplication,
+    QgsProcessingAlgorithm,
+    QgsProcessingException,
+    QgsProcessingModelAlgorithm,
+    QgsProcessingParameters,
+)
+from qgis.PyQt.QtGui import QIcon
+
+from .model_index import ModelLibrary
+from .result_cache import NotCacheable, get_result_cache
+from .run_profiler import profile_model_run, profiling_enabled
+
+
+class ModelAlgorithmProxy(QgsProcessingAlgorithm):
+    """Lightweight algorithm standing for a bundled model.
+
+    The instance registered in the provider is described by the models index only.
+    The model file is parsed when an instance is created to be run or to open its
+    dialog, the first time only.
+    """
+
+    def __init__(self, entry: dict, library: ModelLibrary, registered: bool = True):
+        """Constructor.
+
+        :param entry: models index entry
+        :type entry: dict
+        :param library: bundled models
+        :type library: ModelLibrary
+        :param registered: True for the instance registered in the provider, False
+        for instances created to be executed
+        :type registered: bool
+        """
+        super().__init__()
+        self._entry = entry
+        self._library = library
+        self._registered = registered
+        self._model: Optional[QgsProcessingModelAlgorithm] = None
+
+    def createInstance(self):
+        return ModelAlgorithmProxy(self._entry, self._library, registered=False)
+
+    def name(self) -> str:
+        return self._entry["name"]
+
+    def displayName(self) -> str:
+        return self._entry["display_name"]
+
+    def group(self) -> str:
+        return self._entry["group"]
+
+    def groupId(self) -> str:
+        return self._entry["group_id"]
+
+    def shortHelpString(self) -> str:
+        return self._entry["help"]
+
+    def icon(self) -> QIcon:
+        return QgsApplication.getThemeIcon("/processingModel.svg")
+
+    def flags(self):
+        if self._model is not None:
+            return self._model.flags()
+        flags = super().flags()
+        if "flags" in self._entry:
+            # flags of the model, stored in the index: listing the algorithm or
+            # checking it can run in a background thread doesn't parse the model
+            return type(flags)(self._entry["flags"])
+        return flags
+
+    def model(self) -> QgsProcessingModelAlgorithm:
+        """Get the bundled model, parsing it on first call."""
+        if self._model is None:
+            self._model = self._library.model(self._entry)
+        return self._model
+
+    def initAlgorithm(self, config=None):
+        parameters = self._entry.get("parameters")
+        if self._registered and parameters is not None:
+            # cheap definitions from the index, enough to list the algorithm
+            for definition in parameters:
+                param = QgsProcessingParameters.parameterFromVariantMap(definition)
+                if param is not None:
+                    self.addParameter(param)
+            return
+
+        for param in self.model().parameterDefinitions():
+            self.addParameter(param.clone())
+
+    def processAlgorithm(self, parameters, context, feedback):
+        cache = get_result_cache()
+        key = None
+        if cache is not None:
+            try:
+                key = cache.key(self._entry["sha256"], self, parameters, context)
+            except NotCacheable as exc:
+                feedback.pushInfo(f"Results won't be cached: {exc}")
+            if key is not None:
+                results = cache.restore(key, self, parameters, context)
+                if results is not None:
+                    feedback.pushInfo("Results taken from the cache of previous runs.")
+                    return results
+
+        algorithm = self.model().create()
+        if profiling_enabled():
+            results, ok = profile_model_run(
+                self.name(), algorithm, parameters, context, feedback
+            )
+        else:
+            results, ok = algorithm.run(parameters, context, feedback)
+        if not ok:
+            raise QgsProcessingException(
+                f"Execution of the model {self.displayName()} failed."
+            )
+
+        if key is not None:
+            try:
+                cache.store(key, results, context)
+            except NotCacheable as exc:
+                feedback.pushInfo(f"Results won't be cached: {exc}")
+            except OSError as exc:
+                feedback.reportError(f"Unable to cache the results: {exc}")
+        return results
@@ -0,0 +1,258 @@
+from functools import partial
+from typing import Optional
+
+from qgis.core import (
+    QgsApplication,
+    QgsProcessingAlgorithm,
+    QgsProcessingAlgRunnerTask,
+    QgsProcessingContext,
+    QgsProcessingException,
+    QgsProcessingFeedback,
+    QgsProject,
+)
+from qgis.PyQt.QtCore import QEventLoop, QObject, QThread, QTimer, pyqtSignal
+
+PROVIDER_ID = "{{ plugin_provider_id }}"
+
+
+class BatchRun:
+    """One run of a batch: its parameters, then its results or its error."""
+
+    def __init__(self, index: int, parameters: dict):
+        self.index = index
+        self.parameters = parameters
+        self.results: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.progress = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True if the run succeeded."""
+        return self.results is not None and self.error is None
+
+
+class RunFeedback(QgsProcessingFeedback):
+    """Feedback of a run, keeping its errors to report them with the run."""
+
+    def __init__(self):
+        super().__init__()
+        self.errors = []
+
+    def reportError(self, error: str, fatalError: bool = False):
+        self.errors.append(error)
+        super().reportError(error, fatalError)
+
+
+class BatchRunner(QObject):
+    """Run an algorithm with several parameter sets, in parallel background tasks.
+    Algorithms which can't run in a background thread (FlagNoThreading) are run one
+    after another in the main thread instead.
+
+    A failing run doesn't stop the batch: its error is stored in its BatchRun. Outputs
+    should be written to files, temporary layers being dropped with the context of
+    their run.
+
+    :Example:
+
+    .. code-block:: python
+
+        runner = BatchRunner("my model", [{"INPUT": path, "OUTPUT": out} ...])
+        runner.finished.connect(lambda: print([run.error for run in runner.runs]))
+        runner.start()
+    """
+
+    # overall progress, from 0 to 100
+    progressChanged = pyqtSignal(float)
+    # index of the run which just ended
+    runFinished = pyqtSignal(int)
+    # every run ended
+    finished = pyqtSignal()
+
+    def __init__(
+        self,
+        algorithm_id: str,
+        parameter_sets: list,
+        max_workers: Optional[int] = None,
+        parent: Optional[QObject] = None,
+    ):
+        """Constructor.
+
+        :param algorithm_id: algorithm id, or name of a model of this plugin
+        :type algorithm_id: str
+        :param parameter_sets: parameter values of each run
+        :type parameter_sets: list
+        :param max_workers: number of runs at the same time. Defaults to None (one per
+        CPU).
+        :type max_workers: int, optional
+        :param parent: Qt parent. Defaults to None.
+        :type parent: QObject, optional
+        """
+        super().__init__(parent)
+        if ":" not in algorithm_id:
+            algorithm_id = f"{PROVIDER_ID}:{algorithm_id}"
+        self.algorithm_id = algorithm_id
+        self.runs = [
+            BatchRun(index, dict(parameters))
+            for index, parameters in enumerate(parameter_sets)
+        ]
+        self.max_workers = max(1, max_workers or QThread.idealThreadCount())
+
+        self._algorithm: Optional[QgsProcessingAlgorithm] = None
+        # runs are made in the main thread, one at a time
+        self._main_thread = False
+        self._pending = list(range(len(self.runs)))
+        # task (None in the main thread), context and feedback of the running runs,
+        # by index
+        self._running = {}
+        self._canceled = False
+        self._finished = False
+
+    @property
+    def is_finished(self) -> bool:
+        """True when every run ended."""
+        return self._finished
+
+    @property
+    def progress(self) -> float:
+        """Overall progress, from 0 to 100."""
+        if not self.runs:
+            return 100.0
+        return sum(run.progress for run in self.runs) / len(self.runs)
+
+    def failures(self) -> list:
+        """Runs which failed.
+
+        :return: failed runs
+        :rtype: list[BatchRun]
+        """
+        return [run for run in self.runs if run.error is not None]
+
+    def start(self):
+        """Start the first runs, the next ones starting as the previous ones end.
+
+        :raises QgsProcessingException: if the algorithm doesn't exist
+        """
+        self._algorithm = QgsApplication.processingRegistry().algorithmById(
+            self.algorithm_id
+        )
+        if self._algorithm is None:
+            raise QgsProcessingException(f"Unknown algorithm {self.algorithm_id}")
+        self._main_thread = bool(
+            self._algorithm.create().flags() & QgsProcessingAlgorithm.FlagNoThreading
+        )
+        self._start_next()
+
+    def cancel(self):
+        """Cancel the running runs and skip the pending ones."""
+        self._canceled = True
+        for index in self._pending:
+            self.runs[index].error = "Canceled"
+        self._pending = []
+        for task, _, feedback in self._running.values():
+            if task is None:
+                feedback.cancel()
+            else:
+                task.cancel()
+        self._start_next()
+
+    def _start_next(self):
+        """Start pending runs up to the number of workers, or end the batch."""
+        max_workers = 1 if self._main_thread else self.max_workers
+        while self._pending and len(self._running) < max_workers:
+            self._start_run(self._pending.pop(0))
+
+        if not self._running and not self._finished:
+            self._finished = True
+            self.progressChanged.emit(self.progress)
+            self.finished.emit()
+
+    def _start_run(self, index: int):
+        """Start a run in a background task, or in the main thread, with its own
+        context and feedback."""
+        run = self.runs[index]
+        context = QgsProcessingContext()
+        context.setProject(QgsProject.instance())
+        feedback = RunFeedback()
+        feedback.progressChanged.connect(partial(self._run_progress, index))
+
+        if self._main_thread:
+            # once the events queued meanwhile are processed, e.g. a cancellation
+            self._running[index] = (None, context, feedback)
+            QTimer.singleShot(0, partial(self._run_in_main_thread, index))
+            return
+
+        task = QgsProcessingAlgRunnerTask(
+            self._algorithm, run.parameters, context, feedback
+        )
+        task.executed.connect(partial(self._run_executed, index))
+        self._running[index] = (task, context, feedback)
+        QgsApplication.taskManager().addTask(task)
+
+    def _run_in_main_thread(self, index: int):
+        """Run an algorithm which can't run in a background thread."""
+        _, context, feedback = self._running[index]
+        results, successful = {}, False
+        if not feedback.isCanceled():
+            try:
+                results, successful = self._algorithm.run(
+                    self.runs[index].parameters, context, feedback
+                )
+            except QgsProcessingException as exc:
+                feedback.reportError(str(exc))
+        self._run_executed(index, successful, results)
+
+    def _run_progress(self, index: int, progress: float):
+        self.runs[index].progress = progress
+        self.progressChanged.emit(self.progress)
+
+    def _run_executed(self, index: int, successful: bool, results: dict):
+        """Back in the main thread: store the outcome of a run, start the next one."""
+        _, _, feedback = self._running.pop(index)
+        run = self.runs[index]
+        run.progress = 100.0
+        if successful:
+            run.results = results
+        elif self._canceled or feedback.isCanceled():
+            run.error = "Canceled"
+        else:
+            run.error = "\n".join(feedback.errors) or "Execution failed"
+
+        self.runFinished.emit(index)
+        self.progressChanged.emit(self.progress)
+        self._start_next()
+
+
+def run_batch(
+    algorithm_id: str,
+    parameter_sets: list,
+    max_workers: Optional[int] = None,
+    feedback: Optional[QgsProcessingFeedback] = None,
+) -> list:
+    """Run a batch and wait for its end, e.g. from the Python console. Must be
+    called from the main thread.
+
+    :param algorithm_id: algorithm id, or name of a model of this plugin
+    :type algorithm_id: str
+    :param parameter_sets: parameter values of each run
+    :type parameter_sets: list
+    :param max_workers: number of runs at the same time. Defaults to None (one per
+    CPU).
+    :type max_workers: int, optional
+    :param feedback: receives the overall progress, cancels the batch. Defaults to
+    None.
+    :type feedback: QgsProcessingFeedback, optional
+
+    :return: runs, in the order of the parameter sets
+    :rtype: list[BatchRun]
+    """
+    runner = BatchRunner(algorithm_id, parameter_sets, max_workers)
+    loop = QEventLoop()
+    runner.finished.connect(loop.quit)
+    if feedback is not None:
+        runner.progressChanged.connect(feedback.setProgress)
+        feedback.canceled.connect(runner.cancel)
+
+    runner.start()
+    if not runner.is_finished:
+        loop.exec()
+    return runner.runs
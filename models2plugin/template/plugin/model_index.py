@@ -0,0 +1,288 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from qgis.core import QgsMessageLog, QgsProcessingModelAlgorithm, QgsXmlUtils
+from qgis.PyQt.QtXml import QDomDocument
+
+INDEX_FILE_NAME = "index.json"
+INDEX_VERSION = 2
+
+# manifest of the models kept in a shared model store, instead of the models folder
+STORE_MANIFEST_FILE_NAME = "store.json"
+STORE_MANIFEST_VERSION = 1
+
+# single compressed file holding every model, instead of one file per model
+PACK_FILE_NAME = "models.pack"
+PACK_MAGIC = b"M2PPACK\n"
+PACK_VERSION = 1
+
+
+def model_entry(
+    model: Optional[QgsProcessingModelAlgorithm], file_name: str, digest: str
+) -> dict:
+    """Describe a model for the index.
+
+    :param model: loaded model, None if it can't be loaded
+    :type model: Optional[QgsProcessingModelAlgorithm]
+    :param file_name: name of the model in the plugin
+    :type file_name: str
+    :param digest: SHA-256 digest of the model content
+    :type digest: str
+
+    :return: index entry. Its "error" key is set if the model can't be loaded.
+    :rtype: dict
+    """
+    entry = {"file": file_name, "sha256": digest}
+
+    if model is None:
+        entry["error"] = "Unable to load the model"
+        return entry
+
+    parameters = [param.toVariantMap() for param in model.parameterDefinitions()]
+    try:
+        json.dumps(parameters)
+    except (TypeError, ValueError):
+        # some definitions can't be stored: they are read from the model when needed
+        parameters = None
+
+    entry.update(
+        {
+            "name": model.name(),
+            "display_name": model.displayName(),
+            "group": model.group(),
+            "group_id": model.groupId(),
+            "help": model.shortHelpString(),
+            "parameters": parameters,
+            "flags": int(model.flags()),
+        }
+    )
+    return entry
+
+
+class ModelPack:
+    """Models packed into a single file: a table giving the offset, size and digest
+    of each model, then the models compressed with zlib. The file is read at once,
+    models being decompressed when needed."""
+
+    def __init__(self, pack_path: Path):
+        """Constructor.
+
+        :param pack_path: pack file path
+        :type pack_path: Path
+
+        :raises OSError: if the file can't be read
+        :raises ValueError: if the file is not a valid pack
+        """
+        data = pack_path.read_bytes()
+        if not data.startswith(PACK_MAGIC):
+            raise ValueError(f"{pack_path} is not a models pack")
+        table_offset = len(PACK_MAGIC) + 4
+        (table_size,) = struct.unpack_from("<I", data, len(PACK_MAGIC))
+        table = json.loads(data[table_offset : table_offset + table_size])
+        if table.get("version") != PACK_VERSION:
+            raise ValueError(f"Unsupported models pack version in {pack_path}")
+
+        self.models: dict = table["models"]
+        self._data = memoryview(data)[table_offset + table_size :]
+
+    def read(self, file_name: str) -> bytes:
+        """Decompress a model.
+
+        :param file_name: name of the model in the plugin
+        :type file_name: str
+
+        :return: model file content
+        :rtype: bytes
+        """
+        entry = self.models[file_name]
+        start = entry["offset"]
+        return zlib.decompress(self._data[start : start + entry["size"]])
+
+
+class ModelLibrary:
+    """Models bundled with the plugin, described by an index so that listing them
+    doesn't require to parse them. Models are only parsed when they are needed."""
+
+    def __init__(self, models_dir: Path):
+        self.models_dir = models_dir
+        self._entries: Optional[list] = None
+        self._models = {}
+        self._lock = Lock()
+        # (path, digest) of the models kept in a model store, by file name
+        self._stored = self._load_store_manifest()
+        self._pack = self._load_pack()
+
+    def _load_pack(self) -> Optional[ModelPack]:
+        """Read the pack of the models, if the plugin has been generated with one."""
+        pack_path = self.models_dir / PACK_FILE_NAME
+        if not pack_path.exists():
+            return None
+        try:
+            return ModelPack(pack_path)
+        except (OSError, ValueError, KeyError) as exc:
+            QgsMessageLog.logMessage(
+                f"Invalid models pack {pack_path}: {exc}", "{{ plugin_name }}"
+            )
+            return None
+
+    def _load_store_manifest(self) -> Optional[dict]:
+        """Read the manifest of the models kept in a model store, if the plugin has
+        been generated against one. Stored models are named after their digest."""
+        manifest_path = self.models_dir / STORE_MANIFEST_FILE_NAME
+        try:
+            with manifest_path.open("r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except OSError:
+            return None
+        except ValueError:
+            QgsMessageLog.logMessage(
+                f"Invalid model store manifest {manifest_path}", "{{ plugin_name }}"
+            )
+            return None
+        if manifest.get("version") != STORE_MANIFEST_VERSION:
+            return None
+
+        store_dir = self.models_dir / manifest["store"]
+        return {
+            file_name: (store_dir / digest[:2] / f"{digest}.model3", digest)
+            for file_name, digest in manifest["models"].items()
+        }
+
+    def model_path(self, file_name: str) -> Path:
+        """Path of a bundled model, in the models folder or in the model store.
+
+        :param file_name: name of the model in the plugin
+        :type file_name: str
+
+        :return: model file path
+        :rtype: Path
+        """
+        if self._stored is not None and file_name in self._stored:
+            return self._stored[file_name][0]
+        return self.models_dir / file_name
+
+    def _model_files(self) -> list:
+        """Bundled models, as (file name, path, digest). The digest is only known
+        for packed and stored models: their content can't change. Packed models
+        have no path."""
+        if self._pack is not None:
+            return [
+                (file_name, None, entry["sha256"])
+                for file_name, entry in sorted(self._pack.models.items())
+            ]
+        if self._stored is not None:
+            return [
+                (file_name, path, digest)
+                for file_name, (path, digest) in sorted(self._stored.items())
+            ]
+        return [
+            (model_file.name, model_file, None)
+            for model_file in sorted(self.models_dir.glob("*.model3"))
+        ]
+
+    def entries(self) -> list:
+        """Index entries of the valid models, loading the index if needed.
+
+        :return: index entries, sorted by model file name
+        :rtype: list
+        """
+        if self._entries is None:
+            self._entries = [
+                entry for entry in self._load_index() if "error" not in entry
+            ]
+        return self._entries
+
+    def _load_index(self) -> list:
+        """Read the index file, updating the entries of the models whose content
+        changed since it was written."""
+        index_path = self.models_dir / INDEX_FILE_NAME
+        try:
+            with index_path.open("r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != INDEX_VERSION:
+                index = {}
+        except (OSError, ValueError):
+            index = {}
+        previous_entries = {entry["file"]: entry for entry in index.get("models", [])}
+
+        entries = []
+        changed = False
+        for file_name, model_file, digest in self._model_files():
+            if digest is None:
+                digest = hashlib.sha256(model_file.read_bytes()).hexdigest()
+            entry = previous_entries.get(file_name)
+            if not entry or entry.get("sha256") != digest:
+                entry = model_entry(self._load_model(file_name), file_name, digest)
+                changed = True
+            entries.append(entry)
+        changed = changed or len(entries) != len(previous_entries)
+
+        if changed:
+            self._save_index(index_path, entries)
+        for entry in entries:
+            if "error" in entry:
+                QgsMessageLog.logMessage(
+                    f"Model {entry['file']} can't be loaded: {entry['error']}",
+                    "{{ plugin_name }}",
+                )
+        return entries
+
+    @staticmethod
+    def _save_index(index_path: Path, entries: list):
+        """Write the index for the next start. Errors are ignored, the plugin
+        directory may be read-only."""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=index_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "models": entries}, f, indent=1)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            pass
+
+    def model(self, entry: dict) -> QgsProcessingModelAlgorithm:
+        """Get the model of an index entry, parsing it on first call.
+
+        :param entry: index entry
+        :type entry: dict
+
+        :raises ValueError: if the model can't be loaded
+
+        :return: model algorithm, shared: use create() to get an instance to run
+        :rtype: QgsProcessingModelAlgorithm
+        """
+        with self._lock:
+            model = self._models.get(entry["file"])
+            if model is None:
+                model = self._load_model(entry["file"])
+                if model is None:
+                    raise ValueError(f"Unable to load the model {entry['file']}")
+                self._models[entry["file"]] = model
+        return model
+
+    def _load_model(self, file_name: str) -> Optional[QgsProcessingModelAlgorithm]:
+        """Parse a bundled model, from the pack or from its file.
+
+        :param file_name: name of the model in the plugin
+        :type file_name: str
+
+        :return: model algorithm, None if it can't be loaded
+        :rtype: Optional[QgsProcessingModelAlgorithm]
+        """
+        model = QgsProcessingModelAlgorithm()
+        if self._pack is None or file_name not in self._pack.models:
+            return model if model.fromFile(str(self.model_path(file_name))) else None
+
+        # as QgsProcessingModelAlgorithm.fromFile does, from memory
+        document = QDomDocument()
+        document.setContent(self._pack.read(file_name))
+        element = document.documentElement()
+        if element.isNull() or not model.loadVariant(QgsXmlUtils.readVariant(element)):
+            return None
+        return model
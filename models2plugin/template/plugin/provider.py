@@ -1,20 +1,79 @@
+import importlib
 import os
+import time
 from pathlib import Path
+from typing import Optional
 
-from qgis.core import QgsProcessingModelAlgorithm, QgsProcessingProvider
+from qgis.core import QgsMessageLog, QgsProcessingAlgorithm, QgsProcessingProvider
 from qgis.PyQt.QtGui import QIcon
 
+from .algorithms import ModelAlgorithmProxy
+from .model_index import ModelLibrary
+from .run_profiler import log_startup_profile, profiling_enabled
+
+try:
+    # models compiled to Python when the plugin was generated, if any
+    from .compiled import MODULES as COMPILED_MODULES
+except ImportError:
+    COMPILED_MODULES = {}
+
 DIR_PLUGIN_ROOT: Path = Path(__file__).parent
 
+# name given in each compiled module to the algorithm class
+COMPILED_CLASS_ALIAS = "COMPILED_ALGORITHM"
+
 
 class Provider(QgsProcessingProvider):
     """The provider of our plugin."""
 
     def loadAlgorithms(self):
-        for model_path in DIR_PLUGIN_ROOT.glob("models/*.model3"):
-            model = QgsProcessingModelAlgorithm()
-            if model.fromFile(str(model_path)):
-                self.addAlgorithm(model)
+        # seconds spent to load the index, then each model
+        self.load_timings = {}
+        profiling = profiling_enabled()
+
+        start = time.perf_counter()
+        # models are listed from their index and only parsed when needed
+        self.library = ModelLibrary(DIR_PLUGIN_ROOT / "models")
+        entries = self.library.entries()
+        self.load_timings["models index"] = time.perf_counter() - start
+
+        for entry in entries:
+            start = time.perf_counter()
+            # compiled models don't report their child algorithms: profile the
+            # interpreted ones
+            algorithm = None if profiling else self.compiled_algorithm(entry)
+            if algorithm is None:
+                algorithm = ModelAlgorithmProxy(entry, self.library)
+            self.addAlgorithm(algorithm)
+            self.load_timings[entry["file"]] = time.perf_counter() - start
+
+        if profiling:
+            log_startup_profile(self.load_timings)
+
+    @staticmethod
+    def compiled_algorithm(entry: dict) -> Optional[QgsProcessingAlgorithm]:
+        """Get the algorithm compiled from a model, if it has been compiled from the
+        current content of its file.
+
+        :param entry: models index entry
+        :type entry: dict
+
+        :return: compiled algorithm, None if the model must be interpreted
+        :rtype: Optional[QgsProcessingAlgorithm]
+        """
+        module_name, digest = COMPILED_MODULES.get(entry["file"], (None, None))
+        if module_name is None or digest != entry["sha256"]:
+            return None
+        try:
+            module = importlib.import_module(f".compiled.{module_name}", __package__)
+            return getattr(module, COMPILED_CLASS_ALIAS)()
+        except Exception as exc:
+            QgsMessageLog.logMessage(
+                f"Compiled model {entry['file']} can't be loaded, it is "
+                f"interpreted instead: {exc}",
+                "{{ plugin_name }}",
+            )
+            return None
 
     def id(self) -> str:
         """The ID of the provider"""
@@ -0,0 +1,429 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from qgis.core import (
+    QgsApplication,
+    QgsMapLayer,
+    QgsProcessingAlgorithm,
+    QgsProcessingContext,
+    QgsProcessingFeatureSourceDefinition,
+    QgsProcessingOutputLayerDefinition,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterFile,
+    QgsProcessingParameterMapLayer,
+    QgsProcessingParameterMultipleLayers,
+    QgsProcessingParameterRasterLayer,
+    QgsProcessingParameters,
+    QgsProcessingParameterVectorLayer,
+    QgsProcessingUtils,
+    QgsProviderRegistry,
+    QgsVectorLayer,
+)
+
+# maximum size of the cached results, set when the plugin was generated (0: no cache)
+RESULT_CACHE_SIZE_MB = int("{{ result_cache_size_mb }}")
+
+RESULTS_FILE_NAME = "results.json"
+CACHE_VERSION = 2
+
+LAYER_PARAMETER_TYPES = (
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterVectorLayer,
+    QgsProcessingParameterRasterLayer,
+    QgsProcessingParameterMapLayer,
+    QgsProcessingParameterMultipleLayers,
+)
+
+# scheme of the destinations which are not paths, e.g. memory: or postgres:
+URI_SCHEME_PATTERN = re.compile(r"^\w{2,}:")
+
+# side files of the output formats made of several files, by main file suffix. Other
+# outputs are stored alone.
+SIDE_FILE_SUFFIXES = {
+    ".shp": (".shx", ".dbf", ".prj", ".cpg", ".qix", ".sbn", ".sbx", ".qmd"),
+    ".tab": (".dat", ".map", ".id", ".ind"),
+}
+
+_result_cache: Optional["ResultCache"] = None
+_result_cache_lock = Lock()
+
+
+class NotCacheable(Exception):
+    """Raised when a run can't be cached, e.g. when an input layer is not a file."""
+
+
+def file_fingerprint(path: str) -> list:
+    """Identify a file version, or a folder version from the files it contains.
+
+    :param path: file or folder path
+    :type path: str
+
+    :raises NotCacheable: if the file doesn't exist
+
+    :return: absolute path, modification time and size. For a folder, absolute path
+    and digest of the relative path, modification time and size of its files.
+    :rtype: list
+    """
+    if os.path.isdir(path):
+        # the modification time of a folder only changes when its entries do, not
+        # when a file is edited in place
+        listing = []
+        for root, dirs, file_names in os.walk(path):
+            dirs.sort()
+            for file_name in sorted(file_names):
+                file_path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                listing.append(
+                    [
+                        os.path.relpath(file_path, path),
+                        stat.st_mtime_ns,
+                        stat.st_size,
+                    ]
+                )
+        digest = hashlib.sha256(json.dumps(listing).encode("utf-8")).hexdigest()
+        return [os.path.abspath(path), digest]
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        raise NotCacheable(f"{path} is not a file") from None
+    return [os.path.abspath(path), stat.st_mtime_ns, stat.st_size]
+
+
+def side_files(path: Path) -> list:
+    """Files making an output with its main file, e.g. the .dbf and .shx files of a
+    shapefile.
+
+    :param path: main file path
+    :type path: Path
+
+    :return: names of the main file and of its existing side files
+    :rtype: list[str]
+    """
+    files = [path.name]
+    for suffix in SIDE_FILE_SUFFIXES.get(path.suffix.lower(), ()):
+        if path.suffix.isupper():
+            suffix = suffix.upper()
+        if path.with_suffix(suffix).is_file():
+            files.append(path.stem + suffix)
+    return files
+
+
+def layer_fingerprint(layer: QgsMapLayer) -> dict:
+    """Identify a layer version, from its file and its features count.
+
+    :param layer: input layer
+    :type layer: QgsMapLayer
+
+    :raises NotCacheable: if the layer is not stored in a file or has unsaved edits
+
+    :return: fingerprint
+    :rtype: dict
+    """
+    if isinstance(layer, QgsVectorLayer) and layer.isModified():
+        raise NotCacheable(f"Layer {layer.name()} has unsaved edits")
+    parts = QgsProviderRegistry.instance().decodeUri(
+        layer.providerType(), layer.source()
+    )
+    path = parts.get("path")
+    if not path or not os.path.isfile(path):
+        # memory, database or web layers: their content can't be identified
+        raise NotCacheable(f"Layer {layer.name()} is not stored in a file")
+
+    fingerprint = {"source": layer.source(), "file": file_fingerprint(path)}
+    if isinstance(layer, QgsVectorLayer):
+        fingerprint["features"] = layer.featureCount()
+    return fingerprint
+
+
+def normalize_value(value):
+    """Convert a parameter value into JSON serializable data, stable across runs."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [normalize_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): normalize_value(item) for key, item in value.items()}
+    if isinstance(value, QgsProcessingFeatureSourceDefinition):
+        return {
+            "source": normalize_value(value.source.staticValue()),
+            "selected_only": value.selectedFeaturesOnly,
+            "feature_limit": value.featureLimit,
+        }
+    if hasattr(value, "authid"):
+        # coordinate reference systems
+        return value.authid() or value.toWkt()
+    return str(value)
+
+
+class ResultCache:
+    """Outputs of the runs of the bundled models, by model content, parameter values
+    and input layers versions. Entries are folders holding the results and the output
+    files, the least recently used ones being removed beyond the maximum size."""
+
+    def __init__(self, directory: Path, max_size: int):
+        """Constructor.
+
+        :param directory: cache folder
+        :type directory: Path
+        :param max_size: maximum size of the cached files, in bytes
+        :type max_size: int
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self._lock = Lock()
+
+    def key(
+        self,
+        model_digest: str,
+        algorithm: QgsProcessingAlgorithm,
+        parameters: dict,
+        context: QgsProcessingContext,
+    ) -> str:
+        """Key of a run.
+
+        :param model_digest: SHA-256 digest of the model content
+        :type model_digest: str
+        :param algorithm: algorithm run, to get its parameter definitions
+        :type algorithm: QgsProcessingAlgorithm
+        :param parameters: parameter values
+        :type parameters: dict
+        :param context: processing context, to resolve the input layers
+        :type context: QgsProcessingContext
+
+        :raises NotCacheable: if an input can't be identified
+
+        :return: hexadecimal digest
+        :rtype: str
+        """
+        values = {}
+        outputs = []
+        for definition in algorithm.parameterDefinitions():
+            name = definition.name()
+            if definition.isDestination():
+                outputs.append(name)
+                continue
+
+            value = {"value": normalize_value(parameters.get(name))}
+            if isinstance(definition, LAYER_PARAMETER_TYPES):
+                layers = QgsProcessingParameters.parameterAsLayerList(
+                    definition, parameters, context
+                )
+                value["layers"] = [layer_fingerprint(layer) for layer in layers]
+                source = parameters.get(name)
+                if (
+                    isinstance(source, QgsProcessingFeatureSourceDefinition)
+                    and source.selectedFeaturesOnly
+                    and layers
+                ):
+                    value["selection"] = sorted(layers[0].selectedFeatureIds())
+            elif isinstance(definition, QgsProcessingParameterFile):
+                path = QgsProcessingParameters.parameterAsFile(
+                    definition, parameters, context
+                )
+                if path:
+                    value["file"] = file_fingerprint(path)
+            values[name] = value
+
+        key = json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "model": model_digest,
+                "parameters": values,
+                "outputs": sorted(outputs),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def restore(
+        self,
+        key: str,
+        algorithm: QgsProcessingAlgorithm,
+        parameters: dict,
+        context: QgsProcessingContext,
+    ) -> Optional[dict]:
+        """Get the results of a cached run, copying its output files to the
+        requested destinations.
+
+        :return: results, None if the run is not cached
+        :rtype: Optional[dict]
+        """
+        entry_dir = self.directory / key
+        try:
+            with (entry_dir / RESULTS_FILE_NAME).open("r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        results = {}
+        try:
+            for name, stored in cached.items():
+                if "value" in stored:
+                    results[name] = stored["value"]
+                    continue
+                destination = self._destination(name, stored["file"], parameters)
+                stem_length = len(Path(stored["file"]).stem)
+                for file_name in stored["files"]:
+                    # side files are renamed after the destination
+                    shutil.copyfile(
+                        entry_dir / file_name,
+                        destination.with_name(
+                            destination.stem + file_name[stem_length:]
+                        ),
+                    )
+                results[name] = str(destination) + stored["uri_suffix"]
+                self._load_on_completion(
+                    algorithm, name, parameters.get(name), results[name], context
+                )
+        except (OSError, KeyError):
+            return None
+
+        # most recently used
+        now = time.time()
+        os.utime(entry_dir, (now, now))
+        return results
+
+    @staticmethod
+    def _destination(name: str, file_name: str, parameters: dict) -> Path:
+        """Path requested for an output, or a temporary one."""
+        value = parameters.get(name)
+        if isinstance(value, QgsProcessingOutputLayerDefinition):
+            value = value.sink.staticValue()
+        if (
+            isinstance(value, str)
+            and value
+            and value != "TEMPORARY_OUTPUT"
+            and not URI_SCHEME_PATTERN.match(value)
+        ):
+            path = Path(value)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            return path
+        return Path(QgsProcessingUtils.generateTempFilename(file_name))
+
+    @staticmethod
+    def _load_on_completion(
+        algorithm: QgsProcessingAlgorithm,
+        name: str,
+        value,
+        layer_uri: str,
+        context: QgsProcessingContext,
+    ):
+        """Load a restored output layer into the project, as the run would have."""
+        if not isinstance(value, QgsProcessingOutputLayerDefinition):
+            return
+        if value.destinationProject is None:
+            return
+        definition = algorithm.parameterDefinition(name)
+        layer_name = value.destinationName or (
+            definition.description() if definition else name
+        )
+        context.addLayerToLoadOnCompletion(
+            layer_uri,
+            QgsProcessingContext.LayerDetails(
+                layer_name, value.destinationProject, name
+            ),
+        )
+
+    def store(self, key: str, results: dict, context: QgsProcessingContext):
+        """Cache the results of a run, copying its output files.
+
+        :raises NotCacheable: if an output is not a file or a simple value
+        """
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.directory, prefix=".tmp-"))
+        try:
+            cached = {}
+            for name, value in results.items():
+                cached[name] = self._store_output(tmp_dir, name, value, context)
+            with (tmp_dir / RESULTS_FILE_NAME).open("w", encoding="utf-8") as f:
+                json.dump(cached, f)
+
+            entry_dir = self.directory / key
+            with self._lock:
+                if entry_dir.exists():
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                os.replace(tmp_dir, entry_dir)
+        finally:
+            if tmp_dir.exists():
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.evict()
+
+    @staticmethod
+    def _store_output(
+        tmp_dir: Path, name: str, value, context: QgsProcessingContext
+    ) -> dict:
+        """Copy an output file, with its side files, or keep a simple value."""
+        if isinstance(value, str):
+            path = value.split("|", 1)[0]
+            if os.path.isfile(path):
+                path = Path(path)
+                files = side_files(path)
+                for file_name in files:
+                    shutil.copyfile(path.parent / file_name, tmp_dir / file_name)
+                return {
+                    "file": path.name,
+                    "files": files,
+                    "uri_suffix": value[len(str(path)) :],
+                }
+            if context.temporaryLayerStore().mapLayer(value) is not None:
+                raise NotCacheable(f"Output {name} is a temporary layer")
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            raise NotCacheable(f"Output {name} can't be stored") from None
+        return {"value": value}
+
+    def evict(self):
+        """Remove the least recently used entries beyond the maximum size."""
+        with self._lock:
+            entries = []
+            for entry_dir in self.directory.iterdir():
+                if not entry_dir.is_dir() or entry_dir.name.startswith("."):
+                    continue
+                size = sum(
+                    file.stat().st_size
+                    for file in entry_dir.iterdir()
+                    if file.is_file()
+                )
+                entries.append((entry_dir.stat().st_mtime, size, entry_dir))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry_dir in sorted(entries):
+                if total <= self.max_size:
+                    break
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total -= size
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Get the cache of the plugin, in the QGIS profile.
+
+    :return: cache, None if the plugin has been generated without
+    :rtype: Optional[ResultCache]
+    """
+    global _result_cache
+
+    if RESULT_CACHE_SIZE_MB <= 0:
+        return None
+    with _result_cache_lock:
+        if _result_cache is None:
+            directory = Path(
+                QgsApplication.qgisSettingsDirPath(),
+                "{{ plugin_folder_name }}",
+                "result_cache",
+            )
+            directory.mkdir(parents=True, exist_ok=True)
+            _result_cache = ResultCache(directory, RESULT_CACHE_SIZE_MB * 1024 * 1024)
+    return _result_cache
@@ -0,0 +1,317 @@
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from qgis.core import (
+    QgsApplication,
+    QgsMessageLog,
+    QgsProcessingContext,
+    QgsProcessingFeedback,
+    QgsProcessingModelAlgorithm,
+    QgsProcessingMultiStepFeedback,
+    QgsProcessingUtils,
+    QgsVectorLayer,
+)
+
+# set to 1 to profile the runs of the bundled models and the plugin startup
+PROFILE_ENV_VARIABLE = "QGIS_MODELS2PLUGIN_PROFILE_MODELS"
+# interval between two samples of the memory used by QGIS, in seconds
+SAMPLE_INTERVAL = 0.05
+
+_profiling: Optional[bool] = None
+
+
+def profiling_enabled() -> bool:
+    """Tell if the runs are profiled: set_profiling, else the environment variable."""
+    if _profiling is not None:
+        return _profiling
+    return os.environ.get(PROFILE_ENV_VARIABLE, "").lower() in ("1", "true", "yes")
+
+
+def set_profiling(enabled: Optional[bool]):
+    """Enable or disable the profiling, e.g. from the Python console.
+
+    :param enabled: profile the runs. None to follow the environment variable again.
+    :type enabled: Optional[bool]
+    """
+    global _profiling
+    _profiling = enabled
+
+
+def profiles_dir() -> Path:
+    """Folder of the trace files, in the QGIS profile."""
+    return Path(
+        QgsApplication.qgisSettingsDirPath(), "{{ plugin_folder_name }}", "profiles"
+    )
+
+
+def current_rss() -> Optional[int]:
+    """Memory used by the QGIS process, in bytes, None if it can't be measured."""
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", encoding="ascii") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+    return None
+
+
+class MemorySampler(threading.Thread):
+    """Sample the memory used by the process, keeping the peak since the last
+    reset."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._peak = current_rss()
+
+    def run(self):
+        while not self._stop_event.wait(SAMPLE_INTERVAL):
+            self.sample()
+
+    def sample(self):
+        rss = current_rss()
+        if rss is None:
+            return
+        with self._lock:
+            if self._peak is None or rss > self._peak:
+                self._peak = rss
+
+    def reset(self) -> Optional[int]:
+        """Get the peak since the previous reset and start a new measure.
+
+        :return: peak memory, in bytes
+        :rtype: Optional[int]
+        """
+        self.sample()
+        with self._lock:
+            peak, self._peak = self._peak, current_rss()
+        return peak
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class ChildProfile:
+    """Measures of a child algorithm of a model run."""
+
+    def __init__(self, child_id: str, description: str, start: float):
+        self.child_id = child_id
+        self.description = description
+        self.start = start
+        self.seconds = 0.0
+        self.peak_rss: Optional[int] = None
+        self.features: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "child_id": self.child_id,
+            "description": self.description,
+            "seconds": self.seconds,
+            "peak_rss": self.peak_rss,
+            "features": self.features,
+        }
+
+
+class ProfilingFeedback(QgsProcessingMultiStepFeedback):
+    """Feedback forwarding everything to the feedback of the run, and noticing when
+    the model starts a child algorithm from the messages naming it."""
+
+    def __init__(self, model: QgsProcessingModelAlgorithm, feedback):
+        super().__init__(1, feedback)
+        self.children = {
+            child_id: child.description() or child_id
+            for child_id, child in model.childAlgorithms().items()
+        }
+        # longest ids first, so that an id ending another one is not mistaken for it
+        self._child_ids = sorted(self.children, key=len, reverse=True)
+        self.profiles = []
+        self.sampler = MemorySampler()
+        self.origin = time.perf_counter()
+        self._current: Optional[ChildProfile] = None
+        self.sampler.start()
+
+    def _child_of(self, text: str) -> Optional[str]:
+        """Child algorithm named at the end of a message, e.g. "Prepare algorithm:
+        <child id>"."""
+        text = text.rstrip()
+        for child_id in self._child_ids:
+            if text.endswith(child_id) and text[: -len(child_id)].endswith((" ", ":")):
+                return child_id
+        return None
+
+    def _notice(self, text: str):
+        child_id = self._child_of(text)
+        if child_id is None:
+            return
+        if self._current is not None and self._current.child_id == child_id:
+            return
+        now = time.perf_counter()
+        self._end_current(now)
+        self._current = ChildProfile(child_id, self.children[child_id], now)
+        self.profiles.append(self._current)
+
+    def _end_current(self, now: float):
+        if self._current is not None:
+            self._current.seconds = now - self._current.start
+            self._current.peak_rss = self.sampler.reset()
+            self._current = None
+
+    def finish(self):
+        """End the measures, at the end of the run."""
+        self._end_current(time.perf_counter())
+        self.sampler.stop()
+
+    def setProgressText(self, text: str):
+        self._notice(text)
+        super().setProgressText(text)
+
+    def pushInfo(self, info: str):
+        self._notice(info)
+        super().pushInfo(info)
+
+    def pushDebugInfo(self, info: str):
+        self._notice(info)
+        super().pushDebugInfo(info)
+
+
+def count_child_features(profiles: list, context: QgsProcessingContext):
+    """Count the features of the layers output by each child algorithm, when QGIS
+    keeps the child results in the context (QGIS 3.38+)."""
+    if not hasattr(context, "modelResult"):
+        return
+    child_results = context.modelResult().childResults()
+    for profile in profiles:
+        child_result = child_results.get(profile.child_id)
+        if child_result is None:
+            continue
+        count = None
+        for value in child_result.outputs().values():
+            if not isinstance(value, str):
+                continue
+            layer = QgsProcessingUtils.mapLayerFromString(value, context)
+            if isinstance(layer, QgsVectorLayer):
+                count = (count or 0) + layer.featureCount()
+        profile.features = count
+
+
+def summary(profiles: list, total: float) -> list:
+    """Table of the measures, one line per child algorithm, slowest first.
+
+    :return: table lines, header included
+    :rtype: list[str]
+    """
+    header = (
+        f"{'child algorithm':<32} {'time (ms)':>10} {'%':>6} "
+        f"{'peak (MB)':>10} {'features':>10}"
+    )
+    lines = [header]
+    for profile in sorted(profiles, key=lambda p: p.seconds, reverse=True):
+        peak = f"{profile.peak_rss / 1e6:.1f}" if profile.peak_rss else "-"
+        features = "-" if profile.features is None else str(profile.features)
+        percent = 100 * profile.seconds / total if total else 0
+        lines.append(
+            f"{profile.description[:32]:<32} {profile.seconds * 1000:>10.1f} "
+            f"{percent:>6.1f} {peak:>10} {features:>10}"
+        )
+    lines.append(f"{'total':<32} {total * 1000:>10.1f}")
+    return lines
+
+
+def write_trace(name: str, profiles: list, origin: float, total: float) -> Path:
+    """Write the measures of a run, in the Chrome trace event format.
+
+    :return: trace file path
+    :rtype: Path
+    """
+    pid = os.getpid()
+    events = [
+        {
+            "name": name,
+            "cat": "model",
+            "ph": "X",
+            "ts": 0,
+            "dur": total * 1e6,
+            "pid": pid,
+            "tid": 0,
+        }
+    ]
+    for profile in profiles:
+        events.append(
+            {
+                "name": profile.description,
+                "cat": "child",
+                "ph": "X",
+                "ts": (profile.start - origin) * 1e6,
+                "dur": profile.seconds * 1e6,
+                "pid": pid,
+                "tid": 0,
+                "args": profile.to_dict(),
+            }
+        )
+
+    trace_dir = profiles_dir()
+    trace_dir.mkdir(parents=True, exist_ok=True)
+    safe_name = "".join(char if char.isalnum() else "_" for char in name)
+    trace_path = trace_dir / f"{safe_name}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    with trace_path.open("w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return trace_path
+
+
+def profile_model_run(
+    name: str,
+    model: QgsProcessingModelAlgorithm,
+    parameters: dict,
+    context: QgsProcessingContext,
+    feedback: QgsProcessingFeedback,
+):
+    """Run a model, measuring the wall time, the peak memory and the output features
+    of each child algorithm. The summary is pushed to the feedback and the measures
+    are written to a trace file.
+
+    :return: results and success, as QgsProcessingAlgorithm.run
+    :rtype: tuple
+    """
+    profiling_feedback = ProfilingFeedback(model, feedback)
+    try:
+        results, ok = model.run(parameters, context, profiling_feedback)
+    finally:
+        profiling_feedback.finish()
+    total = time.perf_counter() - profiling_feedback.origin
+    profiles = profiling_feedback.profiles
+
+    count_child_features(profiles, context)
+    lines = summary(profiles, total)
+    for line in lines:
+        feedback.pushInfo(line)
+    try:
+        trace_path = write_trace(name, profiles, profiling_feedback.origin, total)
+        feedback.pushInfo(f"Profile written to {trace_path}")
+    except OSError as exc:
+        feedback.reportError(f"Unable to write the profile: {exc}")
+    return results, ok
+
+
+def log_startup_profile(timings: dict):
+    """Log the time spent to load the algorithms of the plugin.
+
+    :param timings: seconds by step, e.g. index loading then each model
+    :type timings: dict
+    """
+    total = sum(timings.values())
+    lines = [f"Algorithms loaded in {total * 1000:.1f} ms:"]
+    for step, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+        lines.append(f"{step:<40} {seconds * 1000:>10.2f} ms")
+    QgsMessageLog.logMessage("\n".join(lines), "{{ plugin_name }}")
@@ -0,0 +1,63 @@
+#! python3  # noqa: E265
+
+"""
+Content hashing helpers.
+"""
+
+# standard
+import hashlib
+import os
+from typing import Union
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+CHUNK_SIZE: int = 1024 * 1024
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def digest_bytes(data: bytes) -> str:
+    """Compute the SHA-256 digest of some content.
+
+    :param data: content to hash
+    :type data: bytes
+
+    :return: hexadecimal digest
+    :rtype: str
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def digest_file(path: Union[str, os.PathLike]) -> str:
+    """Compute the SHA-256 digest of a file content, reading it by chunks.
+
+    :param path: file path
+    :type path: Union[str, os.PathLike]
+
+    :return: hexadecimal digest
+    :rtype: str
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def digest_values(*values) -> str:
+    """Compute a SHA-256 digest identifying a sequence of values.
+
+    :return: hexadecimal digest
+    :rtype: str
+    """
+    sha = hashlib.sha256()
+    for value in values:
+        encoded = str(value).encode("utf-8")
+        # prefix each value with its length so that ("ab", "c") != ("a", "bc")
+        sha.update(len(encoded).to_bytes(8, "little"))
+        sha.update(encoded)
+    return sha.hexdigest()
@@ -2,12 +2,16 @@
 
 # standard library
 import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
 from functools import partial
+from threading import Lock
 from typing import Callable, Literal, Optional, Union
 
 # PyQGIS
 from qgis.core import Qgis, QgsMessageLog, QgsMessageOutput
 from qgis.gui import QgsMessageBar
+from qgis.PyQt.QtCore import QCoreApplication, QObject, QThread, QTimer, pyqtSignal
 from qgis.PyQt.QtWidgets import QPushButton, QWidget
 from qgis.utils import iface
 
@@ -20,9 +24,78 @@ from models2plugin.__about__ import __title__
 # ##################################
 
 
+class LogBuffer:
+    """Thread-safe queue of log records, flushed in batches."""
+
+    def __init__(self):
+        self._records: list[dict] = []
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def append(self, record: dict):
+        """Queue a record.
+
+        :param record: keyword arguments of PlgLogger.log
+        :type record: dict
+        """
+        with self._lock:
+            self._records.append(record)
+
+    def drain(self) -> list[dict]:
+        """Empty the buffer, coalescing repeated messages: a message logged several \
+        times is returned once, suffixed by the number of occurrences.
+
+        :return: records, in the order of their first occurrence
+        :rtype: list[dict]
+        """
+        with self._lock:
+            records, self._records = self._records, []
+
+        coalesced: dict[tuple, list] = {}
+        for record in records:
+            if record.get("button"):
+                # records with a widget are never merged
+                key = (id(record),)
+            else:
+                key = (
+                    record["message"],
+                    record["application"],
+                    int(record["log_level"]),
+                    record["push"],
+                )
+            if key in coalesced:
+                coalesced[key][1] += 1
+            else:
+                coalesced[key] = [record, 1]
+
+        drained = []
+        for record, count in coalesced.values():
+            if count > 1:
+                record = {**record, "message": f"{record['message']} (x{count})"}
+            drained.append(record)
+        return drained
+
+
+class _LogDispatcher(QObject):
+    """Relay flush requests to the thread owning this object (the main thread), \
+    where the message bar can be used."""
+
+    flushRequested = pyqtSignal()
+
+
 class PlgLogger(logging.Handler):
     """Python logging handler supercharged with QGIS useful methods."""
 
+    # buffered mode
+    _buffer: Optional[LogBuffer] = None
+    _buffering_depth: int = 0
+    _buffering_lock = Lock()
+    _flush_timer: Optional[QTimer] = None
+    # created at import, so in the main thread
+    _dispatcher = _LogDispatcher()
+
     @staticmethod
     def log(
         message: str,
@@ -121,8 +194,11 @@ class PlgLogger(logging.Handler):
             log(message="Plugin loaded - TEST", log_level=4, push=0)
         """
         # if not debug mode and not push, let's ignore INFO, SUCCESS and TEST
-        debug_mode = plg_prefs_hdlr.PlgOptionsManager.get_plg_settings().debug_mode
-        if not debug_mode and not push and (log_level < 1 or log_level > 2):
+        if (
+            not push
+            and (log_level < 1 or log_level > 2)
+            and not plg_prefs_hdlr.PlgOptionsManager.get_debug_mode()
+        ):
             return
 
         # if log_level is an int, convert it to Qgis.MessageLevel
@@ -140,6 +216,52 @@ class PlgLogger(logging.Handler):
                 logging.error(err_msg)
                 message = err_msg
 
+        # buffered mode: the record is sent on next flush
+        if PlgLogger._buffer is not None:
+            PlgLogger._buffer.append(
+                {
+                    "message": message,
+                    "application": application,
+                    "log_level": log_level,
+                    "push": push,
+                    "duration": duration,
+                    "button": button,
+                    "button_text": button_text,
+                    "button_more_text": button_more_text,
+                    "button_connect": button_connect,
+                    "parent_location": parent_location,
+                }
+            )
+            return
+
+        PlgLogger._send(
+            message=message,
+            application=application,
+            log_level=log_level,
+            push=push,
+            duration=duration,
+            button=button,
+            button_text=button_text,
+            button_more_text=button_more_text,
+            button_connect=button_connect,
+            parent_location=parent_location,
+        )
+
+    @staticmethod
+    def _send(
+        message: str,
+        application: str,
+        log_level: Qgis.MessageLevel,
+        push: bool,
+        duration: Optional[int],
+        button: bool,
+        button_text: Optional[str],
+        button_more_text: Optional[str],
+        button_connect: Optional[Callable],
+        parent_location: Optional[QWidget],
+    ):
+        """Send a message to QGIS messages windows and optionally to the message \
+        bar. See `log` for parameters."""
         # send it to QGIS messages panel
         QgsMessageLog.logMessage(
             message=message, tag=application, notifyUser=push, level=log_level
@@ -191,3 +313,156 @@ class PlgLogger(logging.Handler):
                     level=log_level,
                     duration=duration,
                 )
+
+    # -- Buffered mode -------------------------------------------------------
+
+    @staticmethod
+    def _in_main_thread() -> bool:
+        """Tell if the current thread is the Qt main thread."""
+        app = QCoreApplication.instance()
+        return app is None or QThread.currentThread() == app.thread()
+
+    @classmethod
+    def start_buffering(cls, flush_interval: int = 500):
+        """Queue log records instead of sending them immediately. Records are sent \
+        in batches, repeated messages being coalesced, every flush_interval \
+        milliseconds when an event loop runs and when buffering stops.
+
+        Calls can be nested: buffering stops with the last call to stop_buffering.
+
+        :param flush_interval: delay between automatic flushes, in milliseconds. \
+        Defaults to 500.
+        :type flush_interval: int, optional
+        """
+        with cls._buffering_lock:
+            cls._buffering_depth += 1
+            if cls._buffer is None:
+                cls._buffer = LogBuffer()
+
+        # the timer must belong to the main thread, which runs the event loop
+        if cls._in_main_thread() and cls._flush_timer is None:
+            cls._flush_timer = QTimer()
+            cls._flush_timer.setInterval(flush_interval)
+            cls._flush_timer.timeout.connect(cls.flush_buffer)
+            cls._flush_timer.start()
+
+    @classmethod
+    def stop_buffering(cls):
+        """Stop buffering started by the matching start_buffering call and flush \
+        queued records if this was the last one."""
+        with cls._buffering_lock:
+            cls._buffering_depth = max(cls._buffering_depth - 1, 0)
+            if cls._buffering_depth:
+                return
+
+        cls.flush_buffer()
+        if cls._in_main_thread():
+            if cls._flush_timer is not None:
+                cls._flush_timer.stop()
+                cls._flush_timer = None
+            with cls._buffering_lock:
+                if not cls._buffering_depth:
+                    cls._buffer = None
+        # else: the buffer is released by the flush run in the main thread
+
+    @classmethod
+    @contextmanager
+    def buffered(cls, flush_interval: int = 500) -> Iterator[None]:
+        """Context manager enabling the buffered mode while the block runs.
+
+        :Example:
+
+        .. code-block:: python
+
+            with PlgLogger.buffered():
+                for model in models:
+                    PlgLogger.log(f"Processing {model}")
+        """
+        cls.start_buffering(flush_interval=flush_interval)
+        try:
+            yield
+        finally:
+            cls.stop_buffering()
+
+    @classmethod
+    def flush_buffer(cls):
+        """Send queued records. Out of the main thread, the flush is delegated to \
+        the main thread so that the message bar is only used from there."""
+        if not cls._in_main_thread():
+            cls._dispatcher.flushRequested.emit()
+            return
+
+        buffer = cls._buffer
+        if buffer is None:
+            return
+        for record in buffer.drain():
+            cls._send(**record)
+
+        with cls._buffering_lock:
+            if not cls._buffering_depth and not len(buffer):
+                cls._buffer = None
+
+    # -- Python logging integration ------------------------------------------
+
+    def emit(self, record: logging.LogRecord):
+        """Send a record of the standard logging module to QGIS messages \
+        window. Debug records are only kept in debug mode.
+
+        :param record: record to send
+        :type record: logging.LogRecord
+        """
+        if record.levelno >= logging.ERROR:
+            log_level = Qgis.MessageLevel.Critical
+        elif record.levelno >= logging.WARNING:
+            log_level = Qgis.MessageLevel.Warning
+        elif record.levelno >= logging.INFO:
+            log_level = Qgis.MessageLevel.Info
+        else:
+            log_level = Qgis.MessageLevel.NoLevel
+
+        try:
+            self.log(message=self.format(record), log_level=log_level)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        """Send records queued in buffered mode."""
+        self.flush_buffer()
+
+    @classmethod
+    def attach_to_logger(cls, logger_name: str = "models2plugin") -> "PlgLogger":
+        """Route the records of a standard logger to QGIS messages window. Calling \
+        it twice for the same logger doesn't duplicate records.
+
+        :param logger_name: name of the logger. Defaults to "models2plugin", \
+        parent of the loggers of the plugin modules.
+        :type logger_name: str, optional
+
+        :return: handler attached to the logger
+        :rtype: PlgLogger
+        """
+        logger = logging.getLogger(logger_name)
+        for handler in logger.handlers:
+            if isinstance(handler, cls):
+                return handler
+
+        handler = cls()
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+        return handler
+
+    @classmethod
+    def detach_from_logger(cls, logger_name: str = "models2plugin"):
+        """Stop routing the records of a standard logger to QGIS messages window.
+
+        :param logger_name: name of the logger. Defaults to "models2plugin".
+        :type logger_name: str, optional
+        """
+        logger = logging.getLogger(logger_name)
+        for handler in list(logger.handlers):
+            if isinstance(handler, cls):
+                logger.removeHandler(handler)
+
+
+# flushes requested from worker threads run in the main thread
+PlgLogger._dispatcher.flushRequested.connect(PlgLogger.flush_buffer)
@@ -5,7 +5,9 @@ Plugin settings.
 """
 
 # standard
-from dataclasses import asdict, dataclass, fields
+from dataclasses import asdict, dataclass, fields, replace
+from threading import Lock
+from typing import Optional
 
 # PyQGIS
 from qgis.core import QgsSettings
@@ -51,12 +53,67 @@ class PlgSettingsStructure:
     debug_mode: bool = False
     version: str = __version__
 
+    # models
+    models_folders: str = ""
+
+    @property
+    def models_folders_list(self) -> list[str]:
+        """Additional models folders, stored separated by semicolons."""
+        return [
+            folder.strip()
+            for folder in self.models_folders.split(";")
+            if folder.strip()
+        ]
+
+
 class PlgOptionsManager:
-    @staticmethod
-    def get_plg_settings() -> PlgSettingsStructure:
+    # settings are read once per process, then kept until they are modified
+    _settings_cache: Optional[PlgSettingsStructure] = None
+    _settings_cache_lock = Lock()
+
+    @classmethod
+    def get_plg_settings(cls) -> PlgSettingsStructure:
         """Load and return plugin settings as a dictionary. \
         Useful to get user preferences across plugin logic.
 
+        Settings are cached: they are only read again from QgsSettings and \
+        environment variables once modified through this class.
+
+        :return: plugin settings, as a copy which can be safely modified
+        :rtype: PlgSettingsStructure
+        """
+        return replace(cls._cached_settings())
+
+    @classmethod
+    def get_debug_mode(cls) -> bool:
+        """Tell if the debug mode is enabled, without copying cached settings.
+
+        :return: debug mode
+        :rtype: bool
+        """
+        return cls._cached_settings().debug_mode
+
+    @classmethod
+    def invalidate_cache(cls):
+        """Forget cached settings, so that they are read again on next access."""
+        with cls._settings_cache_lock:
+            cls._settings_cache = None
+
+    @classmethod
+    def _cached_settings(cls) -> PlgSettingsStructure:
+        """Get the cached settings, reading them if needed."""
+        settings = cls._settings_cache
+        if settings is None:
+            with cls._settings_cache_lock:
+                if cls._settings_cache is None:
+                    cls._settings_cache = cls._read_plg_settings()
+                settings = cls._settings_cache
+        return settings
+
+    @staticmethod
+    def _read_plg_settings() -> PlgSettingsStructure:
+        """Read plugin settings from QgsSettings and environment variables.
+
         :return: plugin settings
         :rtype: PlgSettingsStructure
         """
@@ -149,6 +206,7 @@ class PlgOptionsManager:
         try:
             settings.setValue(key, value)
             out_value = True
+            cls.invalidate_cache()
         except Exception as err:
             log_hdlr.PlgLogger.log(
                 message="Error occurred trying to set settings: {}.Trace: {}".format(
@@ -175,3 +233,4 @@ class PlgOptionsManager:
             cls.set_value_from_key(k, v)
 
         settings.endGroup()
+        cls.invalidate_cache()
@@ -0,0 +1,195 @@
+#! python3  # noqa: E265
+
+"""
+Lightweight profiler measuring the wall time and the bytes processed by the phases of
+a run, with a summary table and a trace viewable in chrome://tracing or Perfetto.
+"""
+
+# standard
+import json
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Union
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+@dataclass
+class PhaseStats:
+    """Cumulated measures of a phase."""
+
+    calls: int = 0
+    seconds: float = 0.0
+    bytes: int = 0
+
+
+class PhaseRecord:
+    """Measure of a running phase, to which processed bytes can be added."""
+
+    __slots__ = ("bytes",)
+
+    def __init__(self):
+        self.bytes = 0
+
+    def add_bytes(self, size: int):
+        """Count bytes processed by the phase.
+
+        :param size: number of bytes
+        :type size: int
+        """
+        self.bytes += size
+
+
+class _DisabledRecord(PhaseRecord):
+    """Record of a disabled profiler, ignoring everything."""
+
+    def add_bytes(self, size: int):
+        pass
+
+
+_DISABLED_RECORD = _DisabledRecord()
+
+
+class Profiler:
+    """Measure phases of a run. A disabled profiler costs a function call per \
+    phase.
+
+    :Example:
+
+    .. code-block:: python
+
+        profiler = Profiler()
+        with profiler.phase("render") as record:
+            content = render()
+            record.add_bytes(len(content))
+        print("\\n".join(profiler.summary()))
+    """
+
+    def __init__(self, enabled: bool = True):
+        """Constructor.
+
+        :param enabled: measure phases. Defaults to True.
+        :type enabled: bool, optional
+        """
+        self.enabled = enabled
+        self.phases: dict[str, PhaseStats] = {}
+        self._events: list[dict] = []
+        self._lock = threading.Lock()
+        self._origin = perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseRecord]:
+        """Measure a phase. Phases of the same name are cumulated; nested phases \
+        are each measured in full.
+
+        :param name: phase name
+        :type name: str
+
+        :return: record of the phase, counting processed bytes
+        :rtype: Iterator[PhaseRecord]
+        """
+        if not self.enabled:
+            yield _DISABLED_RECORD
+            return
+
+        record = PhaseRecord()
+        start = perf_counter()
+        try:
+            yield record
+        finally:
+            end = perf_counter()
+            with self._lock:
+                stats = self.phases.setdefault(name, PhaseStats())
+                stats.calls += 1
+                stats.seconds += end - start
+                stats.bytes += record.bytes
+                self._events.append(
+                    {
+                        "name": name,
+                        "start": start - self._origin,
+                        "duration": end - start,
+                        "bytes": record.bytes,
+                        "thread": threading.get_ident(),
+                    }
+                )
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the profiler was created."""
+        return perf_counter() - self._origin
+
+    def to_dict(self) -> dict:
+        """Cumulated measures by phase.
+
+        :return: total seconds and measures of each phase
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "seconds": self.elapsed,
+                "phases": {name: asdict(stats) for name, stats in self.phases.items()},
+            }
+
+    def summary(self) -> list[str]:
+        """Table of the cumulated measures, one line per phase, slowest first.
+
+        :return: table lines, header included
+        :rtype: list[str]
+        """
+        total = self.elapsed
+        header = (
+            f"{'phase':<16} {'calls':>7} {'time (ms)':>11} {'%':>6} "
+            f"{'bytes':>12} {'MB/s':>9}"
+        )
+        lines = [header]
+        with self._lock:
+            phases = sorted(
+                self.phases.items(), key=lambda item: item[1].seconds, reverse=True
+            )
+        for name, stats in phases:
+            throughput = (
+                f"{stats.bytes / stats.seconds / 1e6:9.1f}"
+                if stats.bytes and stats.seconds
+                else f"{'-':>9}"
+            )
+            lines.append(
+                f"{name:<16} {stats.calls:>7} {stats.seconds * 1000:>11.1f} "
+                f"{100 * stats.seconds / total if total else 0:>6.1f} "
+                f"{stats.bytes:>12} {throughput}"
+            )
+        lines.append(f"{'total':<16} {'':>7} {total * 1000:>11.1f}")
+        return lines
+
+    def dump_chrome_trace(self, path: Union[str, Path]):
+        """Write the measured phases in the Chrome trace event format.
+
+        :param path: trace file path
+        :type path: Union[str, Path]
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = [
+                {
+                    "name": event["name"],
+                    "cat": "phase",
+                    "ph": "X",
+                    "ts": event["start"] * 1e6,
+                    "dur": event["duration"] * 1e6,
+                    "pid": pid,
+                    "tid": event["thread"],
+                    "args": {"bytes": event["bytes"]},
+                }
+                for event in self._events
+            ]
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
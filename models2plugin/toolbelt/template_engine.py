@@ -0,0 +1,91 @@
+#! python3  # noqa: E265
+
+"""
+Minimal template engine used to render the plugin template files.
+
+Templates are tokenized once into literal and placeholder segments, so rendering is a
+single join whatever the number of variables in the context.
+"""
+
+# standard
+import re
+from functools import lru_cache
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+# matches {{ variable_name }}, spaces around the name being optional. Names are
+# identifiers, so that literal braces before a placeholder don't swallow it
+PLACEHOLDER_PATTERN = re.compile(r"{{\s*(\w+)\s*}}")
+
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class CompiledTemplate:
+    """Template tokenized into literal and placeholder segments."""
+
+    __slots__ = ("_parts", "_slots", "variables")
+
+    def __init__(self, source: str):
+        """Constructor.
+
+        :param source: template content
+        :type source: str
+        """
+        # literal parts, placeholders being kept as raw text until rendering
+        self._parts: list[str] = []
+        # (index in parts, variable name)
+        self._slots: list[tuple[int, str]] = []
+
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            if match.start() > position:
+                self._parts.append(source[position : match.start()])
+            self._slots.append((len(self._parts), match.group(1)))
+            self._parts.append(match.group(0))
+            position = match.end()
+        if position < len(source):
+            self._parts.append(source[position:])
+
+        self.variables: frozenset = frozenset(name for _, name in self._slots)
+
+    def render(self, context: dict) -> str:
+        """Render the template with the given context. Placeholders without any \
+        matching key in the context are left untouched.
+
+        :param context: variable names and their values
+        :type context: dict
+
+        :return: rendered content
+        :rtype: str
+        """
+        if not self._slots:
+            return "".join(self._parts)
+
+        parts = self._parts.copy()
+        for index, name in self._slots:
+            if name in context:
+                parts[index] = str(context[name])
+        return "".join(parts)
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str) -> CompiledTemplate:
+    """Tokenize a template content. Compiled templates are cached by content.
+
+    :param source: template content
+    :type source: str
+
+    :return: compiled template
+    :rtype: CompiledTemplate
+    """
+    return CompiledTemplate(source)
@@ -0,0 +1,110 @@
+#! python3  # noqa: E265
+
+"""Fixtures of the tests: processing models written from a few metadata, and a \
+plugin generated from the template."""
+
+# standard
+import importlib
+import sys
+from pathlib import Path
+from typing import Optional
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.core.template_bundle import get_template_bundle
+from models2plugin.generator import build_context, plugin_template_dir
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+MODEL_TEMPLATE: str = """<!DOCTYPE model>
+<Option type="Map">
+  <Option type="Map" name="children">{children}
+  </Option>
+  <Option value="{group}" type="QString" name="model_group"/>
+  <Option value="{name}" type="QString" name="model_name"/>
+</Option>
+"""
+
+CHILD_TEMPLATE: str = """
+    <Option type="Map" name="{child_id}">
+      <Option value="{alg_id}" type="QString" name="alg_id"/>
+    </Option>"""
+
+# ############################################################################
+# ########## Fixtures ##############
+# ##################################
+
+
+def model_content(
+    name: str, child_algorithms: tuple[str, ...] = (), group: str = "Tests"
+) -> bytes:
+    """Content of a .model3 file running the given algorithms.
+
+    :param name: model name
+    :type name: str
+    :param child_algorithms: ids of the child algorithms, e.g. model:Other
+    :type child_algorithms: tuple[str, ...]
+    :param group: model group
+    :type group: str
+
+    :return: file content
+    :rtype: bytes
+    """
+    children = "".join(
+        CHILD_TEMPLATE.format(child_id=f"child_{i}", alg_id=alg_id)
+        for i, alg_id in enumerate(child_algorithms)
+    )
+    return MODEL_TEMPLATE.format(children=children, group=group, name=name).encode(
+        "utf-8"
+    )
+
+
+@pytest.fixture
+def write_model(tmp_path):
+    """Factory writing a model file, by default into the temporary directory.
+
+    :return: function taking the file name, the model name, its child algorithms \
+    and the directory, returning the file path
+    """
+
+    def write(
+        file_name: str,
+        name: str,
+        child_algorithms: tuple[str, ...] = (),
+        directory: Optional[Path] = None,
+    ) -> Path:
+        model_path = Path(directory or tmp_path, file_name)
+        model_path.parent.mkdir(parents=True, exist_ok=True)
+        model_path.write_bytes(model_content(name, child_algorithms))
+        return model_path
+
+    return write
+
+
+@pytest.fixture(scope="session")
+def generated_plugin(tmp_path_factory):
+    """Python package of a plugin rendered from the template, with its result \
+    cache enabled, to test the modules of the generated plugins.
+
+    :return: plugin package, whose modules are imported from it
+    """
+    context = build_context("Generated plugin", result_cache_size_mb=10)
+    plugin_dir = tmp_path_factory.mktemp("plugins") / context["plugin_folder_name"]
+    for entry in get_template_bundle(plugin_template_dir):
+        if entry.relative_path.endswith(".py"):
+            path = plugin_dir / entry.relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(entry.template.render(context), "utf-8")
+
+    sys.path.insert(0, str(plugin_dir.parent))
+    try:
+        yield importlib.import_module(context["plugin_folder_name"])
+    finally:
+        sys.path.remove(str(plugin_dir.parent))
+        for name in list(sys.modules):
+            if name.split(".")[0] == context["plugin_folder_name"]:
+                del sys.modules[name]
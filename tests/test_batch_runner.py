@@ -0,0 +1,201 @@
+#! python3  # noqa: E265
+
+"""Tests of the scheduling of the batch runner of the generated plugins."""
+
+# standard
+import importlib
+import threading
+
+# 3rd party
+import pytest
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class Signal:
+    """Signal calling its slots directly."""
+
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def emit(self, *args):
+        for slot in self.slots:
+            slot(*args)
+
+
+class Algorithm:
+    """Algorithm returning its parameters, failing when asked to."""
+
+    def __init__(self, flags: int = 0):
+        self._flags = flags
+        self.threads = []
+
+    def create(self):
+        return self
+
+    def flags(self):
+        return self._flags
+
+    def run(self, parameters: dict, context, feedback):
+        self.threads.append(threading.get_ident())
+        if parameters.get("FAIL"):
+            feedback.reportError("Invalid input")
+            return {}, False
+        return dict(parameters), True
+
+
+class Task:
+    """Background task, executed when the test decides."""
+
+    def __init__(self, algorithm, parameters: dict, context, feedback):
+        self.algorithm = algorithm
+        self.parameters = parameters
+        self.feedback = feedback
+        self.executed = Signal()
+        self.canceled = False
+
+    def cancel(self):
+        self.canceled = True
+        self.feedback.cancel()
+
+    def execute(self):
+        if self.canceled:
+            self.executed.emit(False, {})
+        else:
+            results, ok = self.algorithm.run(self.parameters, None, self.feedback)
+            self.executed.emit(ok, results)
+
+
+class Scheduler:
+    """Task manager and event loop of the tests."""
+
+    def __init__(self, algorithm: Algorithm):
+        self.algorithm = algorithm
+        self.tasks = []
+        # calls queued for the event loop
+        self.queued = []
+
+    def processingRegistry(self):
+        return self
+
+    def algorithmById(self, algorithm_id: str):
+        return self.algorithm
+
+    def taskManager(self):
+        return self
+
+    def addTask(self, task: Task):
+        self.tasks.append(task)
+
+    def singleShot(self, interval: int, slot):
+        self.queued.append(slot)
+
+    def process_events(self):
+        while self.queued:
+            self.queued.pop(0)()
+
+
+# ############################################################################
+# ########## Fixtures ##############
+# ##################################
+
+
+@pytest.fixture
+def batch_runner(generated_plugin):
+    """batch_runner module of the generated plugin."""
+    return importlib.import_module(f"{generated_plugin.__name__}.batch_runner")
+
+
+def make_scheduler(batch_runner, monkeypatch, algorithm: Algorithm) -> Scheduler:
+    """Make the batch runner run its tasks through a test scheduler."""
+    scheduler = Scheduler(algorithm)
+    monkeypatch.setattr(batch_runner, "QgsApplication", scheduler)
+    monkeypatch.setattr(batch_runner, "QTimer", scheduler)
+    monkeypatch.setattr(batch_runner, "QgsProcessingAlgRunnerTask", Task)
+    return scheduler
+
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def test_runs_in_background_tasks(batch_runner, monkeypatch):
+    scheduler = make_scheduler(batch_runner, monkeypatch, Algorithm())
+    runner = batch_runner.BatchRunner(
+        "model", [{"INDEX": index, "FAIL": index == 1} for index in range(5)], 2
+    )
+    finished = []
+    runner.finished.connect(lambda: finished.append(True))
+
+    runner.start()
+    assert runner.algorithm_id.endswith(":model")
+    assert len(scheduler.tasks) == 2
+
+    scheduler.tasks[1].execute()
+    assert len(scheduler.tasks) == 3
+    # tasks started meanwhile are executed too
+    for task in scheduler.tasks:
+        if task is not scheduler.tasks[1]:
+            task.execute()
+
+    assert finished == [True]
+    assert runner.is_finished
+    assert len(scheduler.tasks) == 5
+    assert [run.ok for run in runner.runs] == [True, False, True, True, True]
+    assert runner.runs[1].error == "Invalid input"
+    assert runner.runs[4].results["INDEX"] == 4
+    assert runner.progress == 100
+
+
+def test_no_threading_runs_in_main_thread(batch_runner, monkeypatch):
+    algorithm = Algorithm(batch_runner.QgsProcessingAlgorithm.FlagNoThreading)
+    scheduler = make_scheduler(batch_runner, monkeypatch, algorithm)
+    runner = batch_runner.BatchRunner("model", [{"INDEX": i} for i in range(3)], 4)
+
+    runner.start()
+    # one run at a time, once the event loop runs
+    assert scheduler.tasks == []
+    assert len(scheduler.queued) == 1
+    assert algorithm.threads == []
+
+    scheduler.process_events()
+
+    assert runner.is_finished
+    assert scheduler.tasks == []
+    assert [run.results["INDEX"] for run in runner.runs] == [0, 1, 2]
+    assert algorithm.threads == [threading.get_ident()] * 3
+
+
+def test_cancel_in_main_thread(batch_runner, monkeypatch):
+    algorithm = Algorithm(batch_runner.QgsProcessingAlgorithm.FlagNoThreading)
+    scheduler = make_scheduler(batch_runner, monkeypatch, algorithm)
+    runner = batch_runner.BatchRunner("model", [{}, {}, {}])
+
+    runner.start()
+    runner.cancel()
+    scheduler.process_events()
+
+    assert runner.is_finished
+    assert algorithm.threads == []
+    assert [run.error for run in runner.runs] == ["Canceled"] * 3
+
+
+def test_cancel_tasks(batch_runner, monkeypatch):
+    scheduler = make_scheduler(batch_runner, monkeypatch, Algorithm())
+    runner = batch_runner.BatchRunner("model", [{}, {}, {}], 2)
+
+    runner.start()
+    scheduler.tasks[0].execute()
+    runner.cancel()
+    for task in scheduler.tasks[1:]:
+        task.execute()
+
+    assert runner.is_finished
+    assert len(scheduler.tasks) == 3
+    assert [run.error for run in runner.runs] == [None, "Canceled", "Canceled"]
@@ -0,0 +1,133 @@
+#! python3  # noqa: E265
+
+"""Tests of the file copy strategies and their fallbacks."""
+
+# standard
+import errno
+import os
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.core import file_copy
+from models2plugin.core.file_copy import COPY_STRATEGIES, copy_file
+
+# ############################################################################
+# ########## Fixtures ##############
+# ##################################
+
+
+@pytest.fixture(autouse=True)
+def forget_unsupported(monkeypatch):
+    """Methods found unsupported by a test don't leak into the next ones."""
+    monkeypatch.setattr(file_copy, "_unsupported", set())
+
+
+@pytest.fixture
+def source(tmp_path):
+    source = tmp_path / "source.model3"
+    source.write_bytes(os.urandom(300_000))
+    source.chmod(0o640)
+    return source
+
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+@pytest.mark.parametrize("strategy", COPY_STRATEGIES)
+def test_copy_file(tmp_path, source, strategy):
+    destination = tmp_path / "out" / "copy.model3"
+    destination.parent.mkdir()
+    destination.write_bytes(b"previous content")
+
+    method = copy_file(source, destination, strategy)
+
+    assert destination.read_bytes() == source.read_bytes()
+    assert destination.stat().st_mode & 0o777 == 0o640
+    if strategy == "buffered":
+        assert method == "buffered"
+    elif strategy == "hardlink":
+        assert method == "hardlink"
+        assert os.path.samefile(source, destination)
+    else:
+        assert not os.path.samefile(source, destination)
+
+
+def test_unknown_strategy(tmp_path, source):
+    with pytest.raises(ValueError):
+        copy_file(source, tmp_path / "copy.model3", "teleport")
+
+
+def test_hardlink_fallback(tmp_path, source, monkeypatch):
+    """Hardlinks unsupported between two devices: the file is cloned instead, and \
+    hardlinks are not tried again."""
+    calls = []
+
+    def link(src, dst):
+        calls.append(dst)
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "link", link)
+    for name in ("a.model3", "b.model3"):
+        method = copy_file(source, tmp_path / name, "hardlink")
+        assert method != "hardlink"
+        assert (tmp_path / name).read_bytes() == source.read_bytes()
+    assert len(calls) == 1
+
+
+def test_unsupported_clone_methods(tmp_path, source, monkeypatch):
+    """Kernel methods raising unsupported errors fall back to a buffered copy."""
+
+    def unsupported(src_fd, dst_fd, size):
+        os.write(dst_fd, b"partial")
+        raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+    monkeypatch.setattr(
+        file_copy,
+        "_CLONE_METHODS",
+        (("reflink", unsupported), ("copy_file_range", unsupported)),
+    )
+    destination = tmp_path / "copy.model3"
+
+    assert copy_file(source, destination) == "buffered"
+    assert destination.read_bytes() == source.read_bytes()
+    assert file_copy._is_unsupported("reflink", (source.stat().st_dev,) * 2)
+
+
+def test_other_errors_are_raised(tmp_path, source, monkeypatch):
+    def failing(src_fd, dst_fd, size):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(file_copy, "_CLONE_METHODS", (("reflink", failing),))
+    with pytest.raises(OSError) as exc_info:
+        copy_file(source, tmp_path / "copy.model3")
+    assert exc_info.value.errno == errno.ENOSPC
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "copy_file_range"), reason="copy_file_range not available"
+)
+def test_incomplete_kernel_copy(tmp_path, source, monkeypatch):
+    """A kernel copy stopping before the end of the file is not taken for a \
+    success: the next method copies the whole file."""
+
+    def copy_file_range(src_fd, dst_fd, count):
+        # copies a few bytes, then tells that the end of the file is reached
+        if os.lseek(src_fd, 0, os.SEEK_CUR) == 0:
+            os.write(dst_fd, os.read(src_fd, 1000))
+            return 1000
+        return 0
+
+    monkeypatch.setattr(os, "copy_file_range", copy_file_range)
+    monkeypatch.setattr(
+        file_copy,
+        "_CLONE_METHODS",
+        (("copy_file_range", file_copy._copy_file_range),),
+    )
+    destination = tmp_path / "copy.model3"
+
+    assert copy_file(source, destination) == "buffered"
+    assert destination.read_bytes() == source.read_bytes()
@@ -0,0 +1,101 @@
+#! python3  # noqa: E265
+
+"""Tests of the buffered mode of the logger."""
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.toolbelt.log_handler import LogBuffer, PlgLogger
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def record(message: str, log_level: int = 1, push: bool = False, **kwargs) -> dict:
+    """Record as queued by PlgLogger.log."""
+    return {
+        "message": message,
+        "application": "tests",
+        "log_level": log_level,
+        "push": push,
+        **kwargs,
+    }
+
+
+# ############################################################################
+# ########## Fixtures ##############
+# ##################################
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Messages sent by the logger, instead of QGIS.
+
+    :return: list of the keyword arguments of each sent message
+    """
+    messages = []
+    monkeypatch.setattr(
+        PlgLogger, "_send", staticmethod(lambda **kwargs: messages.append(kwargs))
+    )
+    yield messages
+    assert PlgLogger._buffer is None
+
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def test_drain_coalesces_repeated_messages():
+    buffer = LogBuffer()
+    for item in (
+        record("a"),
+        record("b"),
+        record("a"),
+        record("a", log_level=2),
+        record("a", push=True),
+        record("a"),
+    ):
+        buffer.append(item)
+
+    drained = buffer.drain()
+
+    assert [(item["message"], item["log_level"], item["push"]) for item in drained] == [
+        ("a (x3)", 1, False),
+        ("b", 1, False),
+        ("a", 2, False),
+        ("a", 1, True),
+    ]
+    assert len(buffer) == 0
+    assert buffer.drain() == []
+
+
+def test_drain_keeps_records_with_button():
+    buffer = LogBuffer()
+    buffer.append(record("a", button=True))
+    buffer.append(record("a", button=True))
+
+    assert [item["message"] for item in buffer.drain()] == ["a", "a"]
+
+
+def test_buffered_sends_on_exit(sent):
+    with PlgLogger.buffered():
+        PlgLogger.log("a", log_level=1)
+        PlgLogger.log("a", log_level=1)
+        assert sent == []
+
+    assert [message["message"] for message in sent] == ["a (x2)"]
+
+
+def test_nested_buffering_flushes_with_last_stop(sent):
+    with PlgLogger.buffered():
+        with PlgLogger.buffered():
+            PlgLogger.log("a", log_level=1)
+        assert sent == []
+        PlgLogger.log("b", log_level=2)
+
+    assert [message["message"] for message in sent] == ["a", "b"]
+    PlgLogger.log("c", log_level=1)
+    assert [message["message"] for message in sent] == ["a", "b", "c"]
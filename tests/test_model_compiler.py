@@ -0,0 +1,78 @@
+#! python3  # noqa: E265
+
+"""Tests of the compilation of the models to Python."""
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.core.model_compiler import (
+    COMPILED_CLASS_ALIAS,
+    ModelCompilationError,
+    compile_model,
+    compiled_module_name,
+    dump_compiled_registry,
+)
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def test_compiled_module_names_are_unique():
+    used = set()
+    names = [
+        compiled_module_name(file_name, used)
+        for file_name in (
+            "Flow.model3",
+            "flow.model3",
+            "my model (v2).model3",
+            "flow_2.model3",
+            "2 buffers.model3",
+        )
+    ]
+
+    assert names == [
+        "model_flow",
+        "model_flow_2",
+        "model_my_model_v2",
+        "model_flow_2_2",
+        "model_2_buffers",
+    ]
+    assert all(name.isidentifier() for name in names)
+    assert used == set(names)
+
+
+def test_registry_is_valid_python():
+    modules = {
+        "b.model3": ("model_b", "digest b"),
+        'it\'s "a".model3': ("model_it_s_a", "digest a"),
+    }
+    source = dump_compiled_registry(modules)
+
+    namespace = {}
+    exec(source, namespace)
+    assert namespace["MODULES"] == modules
+    assert list(namespace["MODULES"]) == sorted(modules)
+
+
+def test_empty_registry():
+    namespace = {}
+    exec(dump_compiled_registry({}), namespace)
+
+    assert namespace["MODULES"] == {}
+
+
+def test_compile_model(write_model):
+    source = compile_model(write_model("flow.model3", "Flow"))
+
+    compile(source, "model_flow.py", "exec")
+    assert f"\n{COMPILED_CLASS_ALIAS} = " in source
+
+
+def test_compile_invalid_model(tmp_path):
+    model_path = tmp_path / "invalid.model3"
+    model_path.write_text("not a model", "utf-8")
+
+    with pytest.raises(ModelCompilationError):
+        compile_model(model_path)
@@ -0,0 +1,147 @@
+#! python3  # noqa: E265
+
+"""Tests of the resolution of the models run by bundled models."""
+
+# standard
+import os
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.core.model_dependencies import (
+    ModelDependencyError,
+    ModelNameConflictError,
+    resolve_model_dependencies,
+    rewrite_model_references,
+)
+from models2plugin.core.model_discovery import ModelDiscoveryIndex
+from models2plugin.toolbelt.hashing import digest_bytes
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def test_child_model_edited_in_place(tmp_path, write_model):
+    """A model edited in place, its folder being unchanged, is bundled with its \
+    current digest."""
+    roots = [tmp_path / "models"]
+    parent = write_model("parent.model3", "Parent", ("model:Child",), tmp_path)
+    child = write_model("child.model3", "Child", ("native:buffer",), roots[0])
+    index = ModelDiscoveryIndex()
+    resolve_model_dependencies([parent], roots=roots, index=index)
+
+    directory_stat = os.stat(roots[0])
+    write_model("child.model3", "Child", ("native:clip", "native:buffer"), roots[0])
+    stat = os.stat(child)
+    os.utime(child, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    os.utime(roots[0], ns=(directory_stat.st_atime_ns, directory_stat.st_mtime_ns))
+
+    bundled = resolve_model_dependencies([parent], roots=roots, index=index)
+
+    assert bundled[1].source == child
+    assert bundled[1].sha256 == digest_bytes(child.read_bytes())
+    assert bundled[1].size == child.stat().st_size
+
+
+def test_transitive_dependencies(tmp_path, write_model):
+    roots = [tmp_path / "models"]
+    parent = write_model("parent.model3", "Parent", ("model:Child",), tmp_path)
+    write_model("child.model3", "Child", ("model:Grandchild",), roots[0])
+    write_model("grandchild.model3", "Grandchild", ("native:buffer",), roots[0])
+    write_model("unused.model3", "Unused", (), roots[0])
+
+    bundled = resolve_model_dependencies(
+        [parent], roots=roots, index=ModelDiscoveryIndex()
+    )
+
+    assert [model.name for model in bundled] == ["Parent", "Child", "Grandchild"]
+    assert bundled[0].dependencies == ("Child",)
+    assert bundled[2].dependencies == ()
+
+
+def test_given_models_are_preferred(tmp_path, write_model):
+    """A dependency among the given models is taken from them, not from the models \
+    folders."""
+    roots = [tmp_path / "models"]
+    parent = write_model("parent.model3", "Parent", ("model:Child",), tmp_path)
+    child = write_model("child.model3", "Child", ("native:clip",), tmp_path / "given")
+    write_model("child.model3", "Child", ("native:buffer",), roots[0])
+
+    bundled = resolve_model_dependencies(
+        [parent, child], roots=roots, index=ModelDiscoveryIndex()
+    )
+
+    assert [model.source for model in bundled] == [parent, child]
+
+
+def test_same_content_bundled_once(tmp_path, write_model):
+    roots = [tmp_path / "models"]
+    first = write_model("a.model3", "Shared", (), tmp_path / "first")
+    second = write_model("a.model3", "Shared", (), tmp_path / "second")
+    other = write_model("a.model3", "Other", (), tmp_path / "third")
+
+    bundled = resolve_model_dependencies(
+        [first, second, other], roots=roots, index=ModelDiscoveryIndex()
+    )
+
+    assert [model.source for model in bundled] == [first, other]
+    # homonym files get unique names in the plugin
+    assert bundled[0].file_name == "a.model3"
+    assert bundled[1].file_name == f"a-{bundled[1].sha256[:12]}.model3"
+
+
+def test_missing_dependencies(tmp_path, write_model):
+    parent = write_model("parent.model3", "Parent", ("model:Missing",), tmp_path)
+
+    with pytest.raises(ModelDependencyError) as exc_info:
+        resolve_model_dependencies(
+            [parent], roots=[tmp_path / "models"], index=ModelDiscoveryIndex()
+        )
+    assert exc_info.value.missing == {str(parent): ["Missing"]}
+
+
+def test_missing_model(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        resolve_model_dependencies(
+            [tmp_path / "nope.model3"], roots=[], index=ModelDiscoveryIndex()
+        )
+
+
+def test_rewrite_model_references(write_model):
+    content = write_model(
+        "parent.model3", "Parent", ("model:Child", "native:buffer")
+    ).read_bytes()
+    # a model parameter whose value starts like a reference is not rewritten
+    content += b'<Option value="model:Child" type="QString" name="description"/>'
+
+    rewritten = rewrite_model_references(content, "myplugin")
+
+    assert b'value="myplugin:Child" type="QString" name="alg_id"' in rewritten
+    assert b'value="native:buffer" type="QString" name="alg_id"' in rewritten
+    assert b'value="model:Child" type="QString" name="description"' in rewritten
+    assert rewrite_model_references(rewritten, "myplugin") == rewritten
+
+
+def test_homonyms_with_different_contents(tmp_path, write_model):
+    first = write_model("first.model3", "Model", ("native:buffer",))
+    second = write_model("second.model3", "Model", ("native:clip",))
+
+    with pytest.raises(ModelNameConflictError) as exc_info:
+        resolve_model_dependencies(
+            [first, second], roots=[], index=ModelDiscoveryIndex()
+        )
+
+    assert exc_info.value.conflicts == {"Model": [str(first), str(second)]}
+
+
+def test_homonyms_with_same_content(tmp_path, write_model):
+    first = write_model("first.model3", "Model")
+    second = write_model("copy/first.model3", "Model")
+
+    bundled = resolve_model_dependencies(
+        [first, second], roots=[], index=ModelDiscoveryIndex()
+    )
+
+    assert [model.source for model in bundled] == [first]
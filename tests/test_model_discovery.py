@@ -0,0 +1,57 @@
+#! python3  # noqa: E265
+
+"""Tests of the discovery of the models under root folders."""
+
+# project
+from models2plugin.core.model_discovery import ModelDiscoveryIndex
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def test_resolve_all(tmp_path, write_model, monkeypatch):
+    roots = [tmp_path / "first", tmp_path / "second"]
+    by_path = write_model("sub/by_path.model3", "By path", (), roots[0])
+    by_file_name = write_model("file.model3", "By file name", (), roots[1])
+    by_name = write_model("other.model3", "Model name", (), roots[1] / "deep")
+    index = ModelDiscoveryIndex()
+    scans = []
+    scan = index.scan
+    monkeypatch.setattr(index, "scan", lambda *args: scans.append(args) or scan(*args))
+
+    resolved = index.resolve_all(
+        ["sub/by_path.model3", "file.model3", "Model name", "missing"], roots
+    )
+
+    assert resolved == {
+        "sub/by_path.model3": by_path,
+        "file.model3": by_file_name,
+        "Model name": by_name,
+        "missing": None,
+    }
+    assert len(scans) == 1
+
+
+def test_resolve_priority(tmp_path, write_model):
+    """A relative path wins over a file name, which wins over a model name."""
+    root = tmp_path / "models"
+    by_path = write_model("a.model3", "b.model3", (), root)
+    write_model("sub/a.model3", "Other", (), root)
+    by_file_name = write_model("sub/b.model3", "B", (), root)
+    index = ModelDiscoveryIndex()
+
+    assert index.resolve("a.model3", [root]) == by_path
+    assert index.resolve("b.model3", [root]) == by_file_name
+
+
+def test_scan_forgets_removed_models(tmp_path, write_model):
+    root = tmp_path / "models"
+    kept = write_model("kept.model3", "Kept", (), root)
+    removed = write_model("removed.model3", "Removed", (), root)
+    index = ModelDiscoveryIndex()
+    assert set(index.scan([root])) == {str(kept), str(removed)}
+
+    removed.unlink()
+
+    assert set(index.scan([root])) == {str(kept)}
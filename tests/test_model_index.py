@@ -0,0 +1,46 @@
+#! python3  # noqa: E265
+
+"""Tests of the index of the models bundled into a plugin."""
+
+# standard
+import importlib
+
+# PyQGIS
+from qgis.core import QgsProcessingModelAlgorithm
+
+# project
+from models2plugin.core.model_index import INDEX_VERSION, build_model_index
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class UnloadableLibrary:
+    """Bundled models which must not be parsed."""
+
+    def model(self, entry: dict):
+        raise AssertionError(f"{entry['file']} should not be parsed")
+
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def test_index_stores_flags(write_model):
+    model_path = write_model("a.model3", "A")
+    index = build_model_index([("a.model3", model_path, "digest")])
+
+    model = QgsProcessingModelAlgorithm()
+    model.fromFile(str(model_path))
+    assert index["version"] == INDEX_VERSION
+    assert index["models"][0]["flags"] == int(model.flags())
+
+
+def test_proxy_flags_from_index(generated_plugin):
+    algorithms = importlib.import_module(f"{generated_plugin.__name__}.algorithms")
+    entry = {"file": "a.model3", "sha256": "digest", "name": "a", "flags": 4}
+    proxy = algorithms.ModelAlgorithmProxy(entry, UnloadableLibrary())
+
+    assert int(proxy.flags()) == 4
@@ -0,0 +1,77 @@
+#! python3  # noqa: E265
+
+"""Tests of the pack of the bundled models."""
+
+# standard
+import json
+import struct
+import zlib
+
+# project
+from models2plugin.core.model_pack import (
+    PACK_MAGIC,
+    PACK_VERSION,
+    build_model_pack,
+    pack_inputs_digest,
+)
+from models2plugin.toolbelt.hashing import digest_bytes
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def _read_pack(pack: bytes) -> dict:
+    """Read every model of a pack, as the generated plugin does.
+
+    :return: content by file name
+    """
+    assert pack.startswith(PACK_MAGIC)
+    offset = len(PACK_MAGIC)
+    (table_size,) = struct.unpack_from("<I", pack, offset)
+    offset += 4
+    table = json.loads(pack[offset : offset + table_size])
+    offset += table_size
+    assert table["version"] == PACK_VERSION
+
+    models = {}
+    for file_name, entry in table["models"].items():
+        start = offset + entry["offset"]
+        content = zlib.decompress(pack[start : start + entry["size"]])
+        assert len(content) == entry["raw_size"]
+        assert digest_bytes(content) == entry["sha256"]
+        models[file_name] = content
+    return models
+
+
+def test_roundtrip():
+    models = {
+        "b.model3": b"<Option>" + b"b" * 10_000 + b"</Option>",
+        "a.model3": b"<Option/>",
+        "empty.model3": b"",
+    }
+    pack = build_model_pack(
+        [(name, content, digest_bytes(content)) for name, content in models.items()]
+    )
+
+    assert _read_pack(pack) == models
+    # compressed
+    assert len(pack) < sum(len(content) for content in models.values())
+
+
+def test_empty_pack():
+    assert _read_pack(build_model_pack([])) == {}
+
+
+def test_deterministic():
+    models = [
+        ("a.model3", b"a", digest_bytes(b"a")),
+        ("b.model3", b"b", digest_bytes(b"b")),
+    ]
+    assert build_model_pack(models) == build_model_pack(models[::-1])
+
+
+def test_inputs_digest():
+    digest = pack_inputs_digest([("a.model3", "1"), ("b.model3", "2")])
+    assert digest == pack_inputs_digest([("b.model3", "2"), ("a.model3", "1")])
+    assert digest != pack_inputs_digest([("a.model3", "1"), ("b.model3", "3")])
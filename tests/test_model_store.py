@@ -0,0 +1,66 @@
+#! python3  # noqa: E265
+
+"""Tests of the content-addressed model store."""
+
+# standard
+import json
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.core.model_store import ModelStore, dump_store_manifest
+from models2plugin.toolbelt.hashing import digest_bytes
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+@pytest.mark.parametrize("copy_strategy", ("hardlink", "clone", "buffered"))
+def test_add_file(tmp_path, write_model, copy_strategy):
+    source = write_model("a.model3", "A")
+    sha256 = digest_bytes(source.read_bytes())
+    store = ModelStore(tmp_path / "store", copy_strategy)
+
+    assert store.add_file(source, sha256)
+    assert not store.add_file(source, sha256)
+
+    blob = tmp_path / "store" / sha256[:2] / f"{sha256}.model3"
+    assert store.blob_path(sha256) == blob
+    assert blob.read_bytes() == source.read_bytes()
+    # editing the source in place must not change the stored content
+    assert blob.stat().st_nlink == 1
+    assert source.stat().st_nlink == 1
+
+
+def test_add_bytes(tmp_path):
+    store = ModelStore(tmp_path / "store")
+    content = b"<model/>"
+    sha256 = digest_bytes(content)
+
+    assert store.add_bytes(content, sha256)
+    assert not store.add_bytes(content, sha256)
+    assert store.blob_path(sha256).read_bytes() == content
+
+
+def test_damaged_blob_is_replaced(tmp_path):
+    store = ModelStore(tmp_path / "store")
+    content = b"<model/>"
+    sha256 = digest_bytes(content)
+    store.add_bytes(content, sha256)
+    store.blob_path(sha256).write_bytes(content[:3])
+
+    assert store.add_bytes(content, sha256)
+    assert store.blob_path(sha256).read_bytes() == content
+
+
+def test_manifest(tmp_path):
+    store = ModelStore(tmp_path / "store")
+    models_dir = tmp_path / "plugins" / "my_plugin" / "models"
+    location = store.relative_location(models_dir)
+
+    manifest = json.loads(dump_store_manifest(location, {"b.model3": "2", "a": "1"}))
+
+    assert manifest["store"] == "../../../store"
+    assert list(manifest["models"]) == ["a", "b.model3"]
@@ -0,0 +1,110 @@
+#! python3  # noqa: E265
+
+"""Tests of the validation report of the bundled models."""
+
+# standard
+import threading
+import time
+from pathlib import Path
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.core import model_validation
+from models2plugin.core.model_dependencies import BundledModel
+from models2plugin.core.model_validation import (
+    ERROR,
+    WARNING,
+    ModelIssue,
+    ModelValidation,
+    ModelValidationError,
+    ValidationReport,
+    validate_models,
+)
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+REPORT = ValidationReport(
+    models=[
+        ModelValidation("a.model3", "A"),
+        ModelValidation(
+            "b.model3",
+            "B",
+            [
+                ModelIssue(WARNING, "Provider grass is not available", "child_1"),
+                ModelIssue(ERROR, "Unknown algorithm native:nope", "child_2"),
+            ],
+        ),
+        ModelValidation("c.model3", "C", [ModelIssue(WARNING, "Deprecated")]),
+    ]
+)
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def bundled_model(name: str) -> BundledModel:
+    return BundledModel(
+        file_name=f"{name}.model3",
+        source=Path(f"{name}.model3"),
+        sha256=name,
+        name=name,
+    )
+
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def test_report():
+    assert REPORT.models[0].ok
+    assert not REPORT.models[1].ok
+    assert REPORT.models[2].ok
+    assert not REPORT.ok
+    assert REPORT.issues_count == 3
+    assert REPORT.summary() == [
+        "WARNING b.model3[child_1]: Provider grass is not available",
+        "ERROR b.model3[child_2]: Unknown algorithm native:nope",
+        "WARNING c.model3: Deprecated",
+    ]
+    assert str(ModelValidationError(REPORT)) == "Invalid models: b.model3"
+
+
+def test_report_to_dict():
+    report = REPORT.to_dict()
+
+    assert report["ok"] is False
+    assert [model["file_name"] for model in report["models"]] == [
+        "a.model3",
+        "b.model3",
+        "c.model3",
+    ]
+    assert report["models"][2]["issues"] == [
+        {"severity": WARNING, "message": "Deprecated", "child_id": None}
+    ]
+
+
+@pytest.mark.parametrize("max_workers", (1, 4))
+def test_validate_models_keeps_order(monkeypatch, max_workers):
+    models = [bundled_model(name) for name in ("a", "b", "c", "d")]
+    threads = set()
+
+    def validate_model(model, bundled_names):
+        threads.add(threading.get_ident())
+        assert bundled_names == {"a", "b", "c", "d"}
+        # the first models end last
+        time.sleep(0.01 * (4 - "abcd".index(model.name)))
+        return ModelValidation(model.file_name, model.name)
+
+    monkeypatch.setattr(model_validation, "validate_model", validate_model)
+    report = validate_models(models, max_workers=max_workers)
+
+    assert [model.name for model in report.models] == ["a", "b", "c", "d"]
+    assert report.ok
+    if max_workers == 1:
+        assert threads == {threading.get_ident()}
@@ -0,0 +1,100 @@
+#! python3  # noqa: E265
+
+"""Tests of the incremental plugin output: manifest, kept, stale and aborted files."""
+
+# standard
+import json
+
+# project
+from models2plugin.core.output_manifest import MANIFEST_FILE_NAME, OutputManifest
+from models2plugin.core.plugin_output import DirectoryOutput
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def _generate(directory, files: dict):
+    """Write files into an output directory, only the changed ones.
+
+    :param files: (content, inputs digest) by relative path
+    :return: output, closed, and the removed files
+    """
+    output = DirectoryOutput(directory)
+    for relative_path, (content, digest) in files.items():
+        if output.is_up_to_date(relative_path, digest):
+            output.keep(relative_path, digest)
+        else:
+            output.write_bytes(relative_path, content, digest)
+    return output, output.close()
+
+
+def test_manifest_saved(tmp_path):
+    _generate(tmp_path, {"a.py": (b"a", "1"), "sub/b.py": (b"bb", "2")})
+
+    manifest = json.loads((tmp_path / MANIFEST_FILE_NAME).read_text("utf-8"))
+    assert manifest["files"] == {
+        "a.py": {"inputs": "1", "size": 1},
+        "sub/b.py": {"inputs": "2", "size": 2},
+    }
+
+
+def test_up_to_date(tmp_path):
+    _generate(tmp_path, {"a.py": (b"a", "1")})
+    manifest = OutputManifest(tmp_path)
+
+    assert manifest.is_up_to_date("a.py", "1")
+    assert not manifest.is_up_to_date("a.py", "2")
+    assert not manifest.is_up_to_date("b.py", "1")
+
+    # edited since the previous generation
+    (tmp_path / "a.py").write_bytes(b"edited")
+    assert not OutputManifest(tmp_path).is_up_to_date("a.py", "1")
+
+    (tmp_path / "a.py").unlink()
+    assert not OutputManifest(tmp_path).is_up_to_date("a.py", "1")
+
+
+def test_only_changed_files_are_written(tmp_path):
+    _generate(tmp_path, {"a.py": (b"a", "1"), "b.py": (b"b", "1")})
+    mtime_ns = (tmp_path / "b.py").stat().st_mtime_ns
+
+    output, _ = _generate(tmp_path, {"a.py": (b"new a", "2"), "b.py": (b"b", "1")})
+
+    assert (tmp_path / "a.py").read_bytes() == b"new a"
+    assert (tmp_path / "b.py").stat().st_mtime_ns == mtime_ns
+    assert output.manifest.files["b.py"] == {"inputs": "1", "size": 1}
+
+
+def test_stale_files_are_removed(tmp_path):
+    _generate(
+        tmp_path,
+        {"a.py": (b"a", "1"), "old/deep/b.py": (b"b", "2"), "old/c.py": (b"c", "3")},
+    )
+    (tmp_path / "user_file.txt").write_bytes(b"not generated")
+
+    _, removed = _generate(tmp_path, {"a.py": (b"a", "1"), "old/c.py": (b"c", "3")})
+
+    assert removed == ["old/deep/b.py"]
+    assert not (tmp_path / "old" / "deep").exists()
+    assert (tmp_path / "old" / "c.py").exists()
+    assert (tmp_path / "user_file.txt").exists()
+    assert set(OutputManifest(tmp_path).previous_files) == {"a.py", "old/c.py"}
+
+
+def test_abort_keeps_unvisited_files(tmp_path):
+    _generate(tmp_path, {"a.py": (b"a", "1"), "b.py": (b"b", "2")})
+
+    output = DirectoryOutput(tmp_path)
+    output.write_bytes("a.py", b"new a", "3")
+    output.abort()
+
+    assert (tmp_path / "b.py").read_bytes() == b"b"
+    files = OutputManifest(tmp_path).previous_files
+    assert files["a.py"] == {"inputs": "3", "size": 5}
+    assert files["b.py"] == {"inputs": "2", "size": 1}
+
+
+def test_corrupted_manifest(tmp_path):
+    (tmp_path / MANIFEST_FILE_NAME).write_text("{not json", "utf-8")
+    assert OutputManifest(tmp_path).previous_files == {}
@@ -0,0 +1,55 @@
+#! python3  # noqa: E265
+
+"""Tests of the plugin outputs: directory and zip archive."""
+
+# standard
+import json
+import zipfile
+
+# project
+from models2plugin.core.output_manifest import MANIFEST_FILE_NAME
+from models2plugin.core.plugin_output import DirectoryOutput, ZipOutput
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def test_directory_records_inputs(tmp_path):
+    output = DirectoryOutput(tmp_path)
+    output.record_inputs("template digest", "context digest")
+    output.write_bytes("a.py", b"a", "1")
+    output.close()
+
+    manifest = json.loads((tmp_path / MANIFEST_FILE_NAME).read_text("utf-8"))
+    assert manifest["template"] == "template digest"
+    assert manifest["context"] == "context digest"
+
+
+def test_zip_output(tmp_path):
+    zip_path = tmp_path / "dist" / "my_plugin.zip"
+    output = ZipOutput(zip_path, "my_plugin")
+    output.write_bytes("metadata.txt", b"[general]", "1")
+    output.make_dir("models")
+    assert not zip_path.exists()
+    output.close()
+
+    assert sorted(path.name for path in zip_path.parent.iterdir()) == ["my_plugin.zip"]
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.namelist() == ["my_plugin/metadata.txt", "my_plugin/models/"]
+        assert archive.read("my_plugin/metadata.txt") == b"[general]"
+
+
+def test_zip_output_abort_keeps_previous_archive(tmp_path):
+    zip_path = tmp_path / "my_plugin.zip"
+    output = ZipOutput(zip_path, "my_plugin")
+    output.write_bytes("metadata.txt", b"previous", "1")
+    output.close()
+
+    output = ZipOutput(zip_path, "my_plugin")
+    output.write_bytes("metadata.txt", b"partial", "2")
+    output.abort()
+
+    assert list(tmp_path.iterdir()) == [zip_path]
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.read("my_plugin/metadata.txt") == b"previous"
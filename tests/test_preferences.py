@@ -0,0 +1,103 @@
+#! python3  # noqa: E265
+
+"""Tests of the cache of the plugin settings."""
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.toolbelt import preferences
+from models2plugin.toolbelt.preferences import PlgOptionsManager
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class MemorySettings:
+    """QgsSettings kept in memory, so that the tests don't touch the QGIS profile."""
+
+    values: dict = {}
+
+    def beginGroup(self, prefix: str):
+        pass
+
+    def endGroup(self):
+        pass
+
+    def value(self, key: str, defaultValue=None, type=None):
+        return self.values.get(key, defaultValue)
+
+    def setValue(self, key: str, value):
+        self.values[key] = value
+
+
+# ############################################################################
+# ########## Fixtures ##############
+# ##################################
+
+
+@pytest.fixture
+def settings_reads(monkeypatch):
+    """Settings in memory, counting how many times they are read.
+
+    :return: list of the settings read, one item per read
+    """
+    monkeypatch.setattr(MemorySettings, "values", {})
+    monkeypatch.setattr(preferences, "QgsSettings", MemorySettings)
+    monkeypatch.delenv("QGIS_MODELS2PLUGIN_DEBUG_MODE", raising=False)
+    monkeypatch.delenv("QGIS_MODELS2PLUGIN_MODELS_FOLDERS", raising=False)
+
+    reads = []
+    read_settings = PlgOptionsManager._read_plg_settings
+
+    def counting_read():
+        reads.append(read_settings())
+        return reads[-1]
+
+    monkeypatch.setattr(PlgOptionsManager, "_read_plg_settings", counting_read)
+    PlgOptionsManager.invalidate_cache()
+    yield reads
+    PlgOptionsManager.invalidate_cache()
+
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def test_settings_read_once(settings_reads):
+    settings = PlgOptionsManager.get_plg_settings()
+    settings.models_folders = "modified copy"
+
+    assert PlgOptionsManager.get_plg_settings().models_folders == ""
+    assert PlgOptionsManager.get_debug_mode() is False
+    assert len(settings_reads) == 1
+
+
+def test_set_value_invalidates_cache(settings_reads):
+    assert PlgOptionsManager.get_debug_mode() is False
+    assert PlgOptionsManager.set_value_from_key("debug_mode", True)
+
+    assert PlgOptionsManager.get_debug_mode() is True
+    assert len(settings_reads) == 2
+
+
+def test_save_from_object_invalidates_cache(settings_reads):
+    settings = PlgOptionsManager.get_plg_settings()
+    settings.models_folders = "/models;/shared/models"
+    PlgOptionsManager.save_from_object(settings)
+
+    assert PlgOptionsManager.get_plg_settings().models_folders_list == [
+        "/models",
+        "/shared/models",
+    ]
+
+
+def test_invalidate_cache_reads_environment_again(settings_reads, monkeypatch):
+    assert PlgOptionsManager.get_debug_mode() is False
+
+    monkeypatch.setenv("QGIS_MODELS2PLUGIN_DEBUG_MODE", "1")
+    assert PlgOptionsManager.get_debug_mode() is False
+    PlgOptionsManager.invalidate_cache()
+    assert PlgOptionsManager.get_debug_mode() is True
@@ -0,0 +1,97 @@
+#! python3  # noqa: E265
+
+"""Tests of the profiler of the generation phases."""
+
+# standard
+import json
+import threading
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.toolbelt.profiler import Profiler
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def test_phases_are_cumulated():
+    profiler = Profiler()
+    for size in (10, 20):
+        with profiler.phase("render") as record:
+            record.add_bytes(size)
+    with profiler.phase("write"):
+        with profiler.phase("copy") as record:
+            record.add_bytes(5)
+
+    phases = profiler.to_dict()["phases"]
+    assert phases["render"]["calls"] == 2
+    assert phases["render"]["bytes"] == 30
+    assert phases["copy"]["bytes"] == 5
+    assert phases["write"]["bytes"] == 0
+    # nested phases are measured in full
+    assert phases["write"]["seconds"] >= phases["copy"]["seconds"]
+
+
+def test_failed_phase_is_measured():
+    profiler = Profiler()
+    with pytest.raises(ValueError):
+        with profiler.phase("validation"):
+            raise ValueError
+
+    assert profiler.phases["validation"].calls == 1
+
+
+def test_disabled_profiler():
+    profiler = Profiler(enabled=False)
+    with profiler.phase("render") as record:
+        record.add_bytes(10)
+
+    assert profiler.phases == {}
+    assert profiler.summary()[1].startswith("total")
+
+
+def test_summary():
+    profiler = Profiler()
+    with profiler.phase("index"):
+        pass
+    with profiler.phase("render") as record:
+        record.add_bytes(1000)
+        threading.Event().wait(0.01)
+
+    lines = profiler.summary()
+    assert lines[0].split() == ["phase", "calls", "time", "(ms)", "%", "bytes", "MB/s"]
+    # slowest first
+    assert [line.split()[0] for line in lines[1:]] == ["render", "index", "total"]
+    assert lines[1].split()[1] == "1"
+    assert lines[1].split()[4] == "1000"
+    assert lines[2].split()[-1] == "-"
+
+
+def test_chrome_trace(tmp_path):
+    profiler = Profiler()
+    with profiler.phase("render") as record:
+        record.add_bytes(10)
+
+    def copy():
+        with profiler.phase("copy"):
+            pass
+
+    thread = threading.Thread(target=copy)
+    thread.start()
+    thread.join()
+
+    trace_path = tmp_path / "traces" / "plugin.trace.json"
+    profiler.dump_chrome_trace(trace_path)
+
+    trace = json.loads(trace_path.read_text("utf-8"))
+    events = trace["traceEvents"]
+    assert [event["name"] for event in events] == ["render", "copy"]
+    assert {event["ph"] for event in events} == {"X"}
+    assert events[0]["args"] == {"bytes": 10}
+    assert events[0]["tid"] == threading.get_ident()
+    assert events[1]["tid"] == thread.ident
+    assert 0 <= events[0]["ts"] <= events[1]["ts"]
+    assert trace["displayTimeUnit"] == "ms"
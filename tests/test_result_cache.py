@@ -0,0 +1,148 @@
+#! python3  # noqa: E265
+
+"""Tests of the cache of the model results of the generated plugins."""
+
+# standard
+import importlib
+import os
+
+# 3rd party
+import pytest
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class Definition:
+    """Parameter definition which is neither a layer nor a file."""
+
+    def __init__(self, name: str, destination: bool = False):
+        self._name = name
+        self._destination = destination
+
+    def name(self) -> str:
+        return self._name
+
+    def isDestination(self) -> bool:
+        return self._destination
+
+
+class Algorithm:
+    """Algorithm with a number input and a file output."""
+
+    def parameterDefinitions(self) -> list:
+        return [Definition("DISTANCE"), Definition("OUTPUT", destination=True)]
+
+
+# ############################################################################
+# ########## Fixtures ##############
+# ##################################
+
+
+@pytest.fixture
+def result_cache(generated_plugin):
+    """result_cache module of the generated plugin."""
+    return importlib.import_module(f"{generated_plugin.__name__}.result_cache")
+
+
+@pytest.fixture
+def cache(result_cache, tmp_path):
+    directory = tmp_path / "cache"
+    directory.mkdir()
+    return result_cache.ResultCache(directory, max_size=1000)
+
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def test_key(cache):
+    def key(parameters: dict, model_digest: str = "model") -> str:
+        return cache.key(model_digest, Algorithm(), parameters, None)
+
+    reference = key({"DISTANCE": 10, "OUTPUT": "a.gpkg"})
+
+    assert key({"DISTANCE": 10, "OUTPUT": "b.gpkg"}) == reference
+    assert key({"DISTANCE": 20, "OUTPUT": "a.gpkg"}) != reference
+    assert key({"DISTANCE": 10, "OUTPUT": "a.gpkg"}, "other model") != reference
+
+
+def test_folder_fingerprint(result_cache, tmp_path):
+    folder = tmp_path / "inputs"
+    (folder / "sub").mkdir(parents=True)
+    data = folder / "sub" / "data.csv"
+    data.write_text("a,b\n", "utf-8")
+    reference = result_cache.file_fingerprint(str(folder))
+
+    folder_stat = os.stat(folder)
+    data.write_text("c,d\n", "utf-8")
+    stat = os.stat(data)
+    os.utime(data, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    os.utime(folder, ns=(folder_stat.st_atime_ns, folder_stat.st_mtime_ns))
+
+    assert result_cache.file_fingerprint(str(folder)) != reference
+    with pytest.raises(result_cache.NotCacheable):
+        result_cache.file_fingerprint(str(tmp_path / "missing"))
+
+
+def test_store_only_side_files(cache, tmp_path):
+    outputs = tmp_path / "outputs"
+    outputs.mkdir()
+    for file_name in ("roads.shp", "roads.shx", "roads.dbf", "roads.txt", "roads.gpkg"):
+        (outputs / file_name).write_bytes(file_name.encode("utf-8"))
+
+    cache.store("key", {"OUTPUT": str(outputs / "roads.shp"), "COUNT": 3}, None)
+
+    assert sorted(path.name for path in (cache.directory / "key").iterdir()) == [
+        "results.json",
+        "roads.dbf",
+        "roads.shp",
+        "roads.shx",
+    ]
+
+    destination = tmp_path / "restored" / "streets.shp"
+    results = cache.restore("key", None, {"OUTPUT": str(destination)}, None)
+
+    assert results == {"OUTPUT": str(destination), "COUNT": 3}
+    assert sorted(path.name for path in destination.parent.iterdir()) == [
+        "streets.dbf",
+        "streets.shp",
+        "streets.shx",
+    ]
+    assert (destination.parent / "streets.dbf").read_bytes() == b"roads.dbf"
+
+
+def test_store_single_file(cache, tmp_path):
+    output = tmp_path / "roads.gpkg"
+    output.write_bytes(b"gpkg")
+    (tmp_path / "roads.gpkg-wal").write_bytes(b"wal")
+    (tmp_path / "roads.csv").write_bytes(b"csv")
+
+    cache.store("key", {"OUTPUT": f"{output}|layername=roads"}, None)
+
+    assert sorted(path.name for path in (cache.directory / "key").iterdir()) == [
+        "results.json",
+        "roads.gpkg",
+    ]
+    assert cache.restore("missing", None, {}, None) is None
+
+
+def test_evict_least_recently_used(cache):
+    for age, name in enumerate(("recent", "old", "oldest")):
+        entry_dir = cache.directory / name
+        entry_dir.mkdir()
+        (entry_dir / "output.bin").write_bytes(b"x" * 400)
+        os.utime(entry_dir, (1000 - age, 1000 - age))
+    # temporary folders of entries being stored are not evicted
+    (cache.directory / ".tmp-entry").mkdir()
+    (cache.directory / ".tmp-entry" / "output.bin").write_bytes(b"x" * 400)
+
+    cache.evict()
+
+    assert sorted(path.name for path in cache.directory.iterdir()) == [
+        ".tmp-entry",
+        "old",
+        "recent",
+    ]
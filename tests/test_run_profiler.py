@@ -0,0 +1,127 @@
+#! python3  # noqa: E265
+
+"""Tests of the profiler of the model runs of the generated plugins."""
+
+# standard
+import importlib
+import json
+
+# 3rd party
+import pytest
+
+# PyQGIS
+from qgis.core import QgsProcessingFeedback
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class Child:
+    def __init__(self, description: str):
+        self._description = description
+
+    def description(self) -> str:
+        return self._description
+
+
+class Model:
+    """Model with child algorithms, one id ending another one."""
+
+    def childAlgorithms(self) -> dict:
+        return {
+            "buffer": Child("Buffer roads"),
+            "clip_buffer": Child("Clip the buffer"),
+            "native_dissolve_1": Child(""),
+        }
+
+
+# ############################################################################
+# ########## Fixtures ##############
+# ##################################
+
+
+@pytest.fixture
+def run_profiler(generated_plugin):
+    """run_profiler module of the generated plugin."""
+    return importlib.import_module(f"{generated_plugin.__name__}.run_profiler")
+
+
+@pytest.fixture
+def feedback(run_profiler):
+    profiling_feedback = run_profiler.ProfilingFeedback(
+        Model(), QgsProcessingFeedback()
+    )
+    yield profiling_feedback
+    profiling_feedback.finish()
+
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def test_child_detection(feedback):
+    assert feedback.children["native_dissolve_1"] == "native_dissolve_1"
+    assert feedback._child_of("Prepare algorithm: clip_buffer") == "clip_buffer"
+    assert feedback._child_of("Running buffer  ") == "buffer"
+    assert feedback._child_of("Prepare algorithm:buffer") == "buffer"
+    # an id must be a whole word
+    assert feedback._child_of("Running mybuffer") is None
+    assert feedback._child_of("buffer done") is None
+
+
+def test_profiles(feedback):
+    feedback.setProgressText("Prepare algorithm: buffer")
+    feedback.pushInfo("Running buffer")
+    feedback.pushInfo("Input layer has 10 features")
+    feedback.pushDebugInfo("Prepare algorithm: clip_buffer")
+    feedback.pushInfo("Prepare algorithm: buffer")
+    feedback.finish()
+
+    assert [profile.child_id for profile in feedback.profiles] == [
+        "buffer",
+        "clip_buffer",
+        "buffer",
+    ]
+    assert [profile.description for profile in feedback.profiles][:2] == [
+        "Buffer roads",
+        "Clip the buffer",
+    ]
+    starts = [profile.start for profile in feedback.profiles]
+    assert starts == sorted(starts)
+    assert all(profile.seconds >= 0 for profile in feedback.profiles)
+    assert feedback.profiles[0].start + feedback.profiles[0].seconds == pytest.approx(
+        starts[1]
+    )
+
+
+def test_summary(run_profiler):
+    fast = run_profiler.ChildProfile("buffer", "Buffer roads", 0.0)
+    fast.seconds = 0.1
+    slow = run_profiler.ChildProfile("clip", "Clip", 0.1)
+    slow.seconds, slow.peak_rss, slow.features = 0.3, 2_500_000, 42
+
+    lines = run_profiler.summary([fast, slow], 0.5)
+
+    assert lines[0].split()[:2] == ["child", "algorithm"]
+    assert lines[1].split() == ["Clip", "300.0", "60.0", "2.5", "42"]
+    assert lines[2].split() == ["Buffer", "roads", "100.0", "20.0", "-", "-"]
+    assert lines[3].split() == ["total", "500.0"]
+
+
+def test_write_trace(run_profiler, monkeypatch, tmp_path):
+    monkeypatch.setattr(run_profiler, "profiles_dir", lambda: tmp_path / "profiles")
+    profile = run_profiler.ChildProfile("buffer", "Buffer roads", 10.5)
+    profile.seconds = 0.25
+
+    trace_path = run_profiler.write_trace("My model/v2", [profile], 10.0, 1.0)
+
+    assert trace_path.parent == tmp_path / "profiles"
+    assert trace_path.name.startswith("My_model_v2-")
+    events = json.loads(trace_path.read_text("utf-8"))["traceEvents"]
+    assert [event["name"] for event in events] == ["My model/v2", "Buffer roads"]
+    assert events[0]["dur"] == 1e6
+    assert events[1]["ts"] == 0.5e6
+    assert events[1]["dur"] == 0.25e6
+    assert events[1]["args"]["child_id"] == "buffer"
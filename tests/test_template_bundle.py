@@ -0,0 +1,104 @@
+#! python3  # noqa: E265
+
+"""Tests of the plugin template loaders and bundles."""
+
+# standard
+import zipfile
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.core.template_bundle import (
+    DirectoryTemplateLoader,
+    TemplateLoader,
+    ZipTemplateLoader,
+    clear_template_bundles,
+    get_template_bundle,
+    template_loader_for,
+)
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+TEMPLATE_FILES: dict = {
+    "metadata.txt": b"name={{ plugin_name }}\n",
+    "plugin/__init__.py": b"",
+    "icon.png": b"\x89PNG\r\n\x1a\n",
+}
+
+# ############################################################################
+# ########## Fixtures ##############
+# ##################################
+
+
+@pytest.fixture(autouse=True)
+def fresh_bundles():
+    clear_template_bundles()
+    yield
+    clear_template_bundles()
+
+
+def _write_zip(zip_path, files: dict, prefix: str = ""):
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        for relative_path, content in files.items():
+            archive.writestr(prefix + relative_path, content)
+    return zip_path
+
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+
+def test_incomplete_loader_fails_when_created():
+    class NoLoad(TemplateLoader):
+        key = ("test",)
+
+    with pytest.raises(TypeError):
+        NoLoad()
+
+
+def test_directory_loader(tmp_path):
+    for relative_path, content in TEMPLATE_FILES.items():
+        (tmp_path / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relative_path).write_bytes(content)
+    (tmp_path / "plugin" / "__pycache__").mkdir()
+    (tmp_path / "plugin" / "__pycache__" / "x.pyc").write_bytes(b"")
+
+    assert DirectoryTemplateLoader(tmp_path).load() == TEMPLATE_FILES
+
+
+@pytest.mark.parametrize("prefix", ("", "template/"))
+def test_zip_loader(tmp_path, prefix):
+    """Files are found at the archive root or in its single top-level folder."""
+    zip_path = _write_zip(
+        tmp_path / "template.zip",
+        {**TEMPLATE_FILES, "plugin/__pycache__/x.pyc": b""},
+        prefix,
+    )
+
+    assert ZipTemplateLoader(zip_path).load() == TEMPLATE_FILES
+
+
+def test_zip_loader_root(tmp_path):
+    zip_path = _write_zip(tmp_path / "template.zip", TEMPLATE_FILES, "a/b/")
+    _write_zip(tmp_path / "other.zip", {"README.md": b""})
+
+    assert ZipTemplateLoader(zip_path, root="a/b").load() == TEMPLATE_FILES
+    assert isinstance(template_loader_for(zip_path), ZipTemplateLoader)
+    assert isinstance(template_loader_for(tmp_path), DirectoryTemplateLoader)
+
+
+def test_bundle(tmp_path):
+    zip_path = _write_zip(tmp_path / "template.zip", TEMPLATE_FILES)
+    bundle = get_template_bundle(zip_path)
+
+    entries = {entry.relative_path: entry for entry in bundle}
+    assert list(entries) == sorted(TEMPLATE_FILES)
+    assert entries["icon.png"].is_binary
+    assert entries["metadata.txt"].template.variables == {"plugin_name"}
+    # loaded once per process
+    zip_path.unlink()
+    assert get_template_bundle(zip_path) is bundle
@@ -0,0 +1,51 @@
+#! python3  # noqa: E265
+
+"""Tests of the rendering of the plugin template files."""
+
+# 3rd party
+import pytest
+
+# project
+from models2plugin.generator import render_template
+from models2plugin.toolbelt.template_engine import compile_template
+
+# ############################################################################
+# ########## Tests #################
+# ##################################
+
+CONTEXT: dict = {"plugin_name": "My plugin", "x": 1}
+
+
+@pytest.mark.parametrize(
+    ("template", "expected"),
+    (
+        ("{{ plugin_name }}", "My plugin"),
+        ("{{plugin_name}}", "My plugin"),
+        ("{{  plugin_name }} {{ x }}", "My plugin 1"),
+        ("no placeholder", "no placeholder"),
+        ("", ""),
+        # literal braces before a placeholder
+        ("{{{ plugin_name }}}", "{My plugin}"),
+        ("a {{ b {{ plugin_name }}", "a {{ b My plugin"),
+        ("d = {{'k': {{ x }}}}", "d = {{'k': 1}}"),
+        # not placeholders
+        ("{{ plugin.name }}", "{{ plugin.name }}"),
+        ("{{ }}", "{{ }}"),
+        ("{ plugin_name }", "{ plugin_name }"),
+    ),
+)
+def test_render(template, expected):
+    assert render_template(template, CONTEXT) == expected
+
+
+def test_missing_variable_left_untouched():
+    assert render_template("{{ missing }} {{ x }}", CONTEXT) == "{{ missing }} 1"
+
+
+def test_values_are_not_rendered_again():
+    assert render_template("{{ x }}", {"x": "{{ y }}", "y": 2}) == "{{ y }}"
+
+
+def test_variables():
+    template = compile_template("{{ plugin_name }} {{x}} {{ plugin_name }} {{ a.b }}")
+    assert template.variables == {"plugin_name", "x"}